@@ -26,7 +26,7 @@ class AccountAdmin(admin.ModelAdmin):
             'fields': ('user', 'name', 'bank_name', 'account_type')
         }),
         ('Saldo', {
-            'fields': ('balance',)
+            'fields': ('balance', 'opening_balance')
         }),
         ('Status', {
             'fields': ('is_active',)
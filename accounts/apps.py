@@ -6,3 +6,9 @@ class AccountsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        """
+        Import signals when Django starts.
+        """
+        import accounts.signals  # noqa: F401
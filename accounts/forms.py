@@ -1,5 +1,8 @@
 # Django
 from django import forms
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
 # Local imports
 from .models import Account
@@ -74,6 +77,33 @@ class AccountForm(forms.ModelForm):
             )
         return name
 
+    def save(self, commit=True):
+        """
+        Reflete ajustes manuais do saldo no saldo de abertura.
+
+        O saldo é mantido pelas transações a partir do saldo de abertura;
+        editar o saldo pelo formulário desloca a abertura (e os saldos
+        diários já registrados) na mesma diferença, para que
+        `recompute_balances` preserve o ajuste.
+        """
+        account = super().save(commit=False)
+        adjustment = 0
+
+        if account.pk and 'balance' in self.changed_data:
+            previous_balance = self.initial.get('balance') or 0
+            adjustment = account.balance - previous_balance
+            account.opening_balance += adjustment
+
+        if commit:
+            with transaction.atomic():
+                account.save()
+                if adjustment:
+                    account.daily_balances.update(
+                        closing_balance=F('closing_balance') + adjustment,
+                        updated_at=timezone.now(),
+                    )
+        return account
+
     def clean_balance(self):
         """Validate that balance is not negative."""
         balance = self.cleaned_data['balance']
@@ -0,0 +1,85 @@
+"""
+Consultas de saldo histórico a partir dos resumos diários das contas.
+
+`AccountDailyBalance` guarda o saldo de fechamento de cada conta nos dias
+com transações, então o saldo em uma data nunca exige somar o histórico:
+basta a linha mais recente até a data (ou o saldo de abertura).
+"""
+# Standard library
+from datetime import timedelta
+from decimal import Decimal
+
+# Django imports
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Local imports
+from .models import AccountDailyBalance
+
+
+def balance_on(account, on_date):
+    """
+    Retorna o saldo de uma conta ao fim do dia `on_date`.
+
+    Uma única query indexada por (conta, data).
+    """
+    closing_balance = AccountDailyBalance.objects.filter(
+        account=account,
+        date__lte=on_date,
+    ).order_by('-date').values_list('closing_balance', flat=True).first()
+
+    if closing_balance is None:
+        return account.opening_balance
+    return closing_balance
+
+
+def balance_history(accounts, start, end):
+    """
+    Soma o saldo das contas dia a dia, de `start` até `end` (inclusive).
+
+    Faz duas queries: o saldo de cada conta na véspera de `start` e uma
+    leitura por intervalo dos resumos diários no período. Dias sem linha
+    repetem o último saldo conhecido da conta.
+
+    Args:
+        accounts: QuerySet de contas
+        start: Primeiro dia da série
+        end: Último dia da série
+
+    Returns:
+        list[tuple[date, Decimal]]: Pares (dia, saldo total)
+    """
+    previous_closing = AccountDailyBalance.objects.filter(
+        account=OuterRef('pk'),
+        date__lt=start,
+    ).order_by('-date').values('closing_balance')[:1]
+
+    balances = dict(
+        accounts.annotate(
+            start_balance=Coalesce(
+                Subquery(previous_closing),
+                F('opening_balance'),
+            ),
+        ).values_list('pk', 'start_balance')
+    )
+
+    changes = {}
+    rows = AccountDailyBalance.objects.filter(
+        account_id__in=list(balances),
+        date__gte=start,
+        date__lte=end,
+    ).values_list('account_id', 'date', 'closing_balance')
+    for account_id, day, closing_balance in rows:
+        changes.setdefault(day, []).append((account_id, closing_balance))
+
+    history = []
+    total = sum(balances.values(), Decimal('0'))
+    day = start
+    while day <= end:
+        for account_id, closing_balance in changes.get(day, ()):
+            total += closing_balance - balances[account_id]
+            balances[account_id] = closing_balance
+        history.append((day, total))
+        day += timedelta(days=1)
+
+    return history
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:51
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+BATCH_SIZE = 1000
+
+
+def backfill_opening_balance(apps, schema_editor):
+    """
+    Deriva o saldo de abertura do saldo atual menos o efeito do ledger.
+    """
+    Account = apps.get_model('accounts', 'Account')
+    Transaction = apps.get_model('transactions', 'Transaction')
+    db_alias = schema_editor.connection.alias
+
+    ledger = {
+        row['account_id']: (
+            (row['income'] or Decimal('0'))
+            - (row['expense'] or Decimal('0'))
+        )
+        for row in Transaction.objects.using(db_alias).values(
+            'account_id',
+        ).annotate(
+            income=Sum('amount', filter=Q(transaction_type='income')),
+            expense=Sum('amount', filter=Q(transaction_type='expense')),
+        ).order_by()
+    }
+
+    batch = []
+    accounts = Account.objects.using(db_alias).only('pk', 'balance')
+    for account in accounts.iterator(chunk_size=BATCH_SIZE):
+        account.opening_balance = (
+            account.balance - ledger.get(account.pk, Decimal('0'))
+        )
+        batch.append(account)
+        if len(batch) >= BATCH_SIZE:
+            Account.objects.using(db_alias).bulk_update(
+                batch,
+                ['opening_balance'],
+            )
+            batch = []
+
+    if batch:
+        Account.objects.using(db_alias).bulk_update(
+            batch,
+            ['opening_balance'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_account_balance'),
+        ('transactions', '0003_transaction_transaction_account_984d8b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='opening_balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Saldo de Abertura'),
+        ),
+        migrations.RunPython(
+            backfill_opening_balance,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:56
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+BATCH_SIZE = 1000
+
+
+def backfill_daily_balances(apps, schema_editor):
+    """
+    Gera um resumo diário por conta e dia a partir das transações.
+    """
+    Account = apps.get_model('accounts', 'Account')
+    AccountDailyBalance = apps.get_model('accounts', 'AccountDailyBalance')
+    Transaction = apps.get_model('transactions', 'Transaction')
+    db_alias = schema_editor.connection.alias
+
+    opening_balances = dict(
+        Account.objects.using(db_alias).values_list('pk', 'opening_balance')
+    )
+    days = Transaction.objects.using(db_alias).values(
+        'account_id',
+        'transaction_date',
+    ).annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+    ).order_by('account_id', 'transaction_date')
+
+    batch = []
+    closing = {}
+    for day in days.iterator(chunk_size=BATCH_SIZE):
+        account_id = day['account_id']
+        income = day['income'] or Decimal('0')
+        expense = day['expense'] or Decimal('0')
+        closing[account_id] = (
+            closing.get(account_id, opening_balances[account_id])
+            + income
+            - expense
+        )
+        batch.append(AccountDailyBalance(
+            account_id=account_id,
+            date=day['transaction_date'],
+            closing_balance=closing[account_id],
+            income=income,
+            expense=expense,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            AccountDailyBalance.objects.using(db_alias).bulk_create(batch)
+            batch = []
+
+    if batch:
+        AccountDailyBalance.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_account_opening_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('closing_balance', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Saldo de Fechamento')),
+                ('income', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Entradas')),
+                ('expense', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Saídas')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to='accounts.account', verbose_name='Conta')),
+            ],
+            options={
+                'verbose_name': 'Saldo Diário',
+                'verbose_name_plural': 'Saldos Diários',
+                'ordering': ['account', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('account', 'date'), name='unique_account_daily_balance')],
+            },
+        ),
+        migrations.RunPython(
+            backfill_daily_balances,
+            migrations.RunPython.noop,
+        ),
+    ]
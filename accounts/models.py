@@ -49,6 +49,14 @@ class Account(models.Model):
         validators=[MinValueValidator(Decimal('0'))]
     )
 
+    # Balance before any transaction; balance = opening + ledger
+    opening_balance = models.DecimalField(
+        'Saldo de Abertura',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+
     # Status
     is_active = models.BooleanField('Ativo', default=True)
 
@@ -68,3 +76,70 @@ class Account(models.Model):
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """
+        Na criação, usa o saldo informado como saldo de abertura.
+        """
+        if self._state.adding and not self.opening_balance:
+            self.opening_balance = self.balance
+        super().save(*args, **kwargs)
+
+
+class AccountDailyBalance(models.Model):
+    """
+    Resumo diário de uma conta: entradas, saídas e saldo ao fim do dia.
+
+    Existe uma linha por conta e por dia com transações. O saldo em uma
+    data qualquer é o `closing_balance` da linha mais recente até essa
+    data ou, se não houver nenhuma, o saldo de abertura da conta.
+    """
+
+    # Foreign Keys
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name='daily_balances',
+        verbose_name='Conta'
+    )
+
+    # Main fields
+    date = models.DateField('Data')
+    closing_balance = models.DecimalField(
+        'Saldo de Fechamento',
+        max_digits=12,
+        decimal_places=2,
+    )
+    income = models.DecimalField(
+        'Entradas',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+    expense = models.DecimalField(
+        'Saídas',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+
+    # Timestamps
+    created_at = models.DateTimeField('Criado em', auto_now_add=True)
+    updated_at = models.DateTimeField('Atualizado em', auto_now=True)
+
+    class Meta:
+        """Define ordenação e unicidade por conta e dia."""
+
+        ordering = ['account', 'date']
+        verbose_name = 'Saldo Diário'
+        verbose_name_plural = 'Saldos Diários'
+        constraints = [
+            # Also serves the (account, date) range scans
+            models.UniqueConstraint(
+                fields=['account', 'date'],
+                name='unique_account_daily_balance',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.account_id} - {self.date} - {self.closing_balance}'
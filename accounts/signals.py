@@ -0,0 +1,17 @@
+# Django imports
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Local imports
+from core.cache import bump_data_version
+
+from .models import Account
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def bump_user_data_version(sender, instance, using, **kwargs):
+    """
+    Invalida o cache versionado do usuário quando uma conta muda.
+    """
+    bump_data_version(user_ids=[instance.user_id], using=using)
@@ -0,0 +1,9 @@
+"""
+Micro-benchmarks de trechos quentes do Finanpy.
+
+Execute a partir da raiz do projeto, por exemplo:
+
+    python -m benchmarks.currency_filter
+    python -m benchmarks.views --datasets small medium
+    python -m benchmarks.sqlite_concurrency --readers 4 --writers 2
+"""
@@ -0,0 +1,109 @@
+"""
+Custo por chamada do filtro `currency`.
+
+Compara o formatador atual (sem locale, com cache) com o caminho antigo,
+que chamava `locale.setlocale(LC_ALL, ...)` a cada valor. Os valores
+simulam uma página: poucos totais repetidos e muitos valores distintos.
+
+    python -m benchmarks.currency_filter [--number N] [--repeat R]
+"""
+# Standard library
+import argparse
+import locale
+import random
+import timeit
+from decimal import Decimal, InvalidOperation
+
+# Local imports
+from users.templatetags.currency_filters import currency, format_brl
+
+
+def legacy_currency(value):
+    """Implementação anterior do filtro (locale do processo)."""
+    if value is None or value == '':
+        return 'R$ 0,00'
+
+    try:
+        if isinstance(value, str):
+            value = value.replace('R$', '').replace(' ', '').strip()
+            value = value.replace(',', '.')
+        decimal_value = Decimal(str(value))
+    except (ValueError, InvalidOperation, TypeError):
+        return 'R$ 0,00'
+
+    try:
+        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_ALL, 'pt_BR')
+        except locale.Error:
+            locale.setlocale(locale.LC_ALL, 'C')
+
+    try:
+        formatted = locale.currency(decimal_value, grouping=True, symbol=False)
+        return f'R$ {formatted}'
+    except (ValueError, locale.Error):
+        float_value = float(decimal_value)
+        integer_part = int(float_value)
+        decimal_part = int(
+            round((abs(float_value) - abs(integer_part)) * 100)
+        )
+        integer_str = f'{abs(integer_part):,}'.replace(',', '.')
+        if float_value < 0:
+            integer_str = f'-{integer_str}'
+        return f'R$ {integer_str},{decimal_part:02d}'
+
+
+def page_values(count=200, seed=42):
+    """Valores de uma página: 20% totais repetidos, 80% distintos."""
+    rng = random.Random(seed)
+    totals = [Decimal('15230.45'), Decimal('-820.10'), Decimal('0')]
+    return [
+        rng.choice(totals) if rng.random() < 0.2
+        else Decimal(rng.randint(1, 10_000_000)) / 100
+        for _ in range(count)
+    ]
+
+
+def measure(function, values, number, repeat):
+    """Menor tempo por chamada (em microssegundos) entre as repetições."""
+    timings = timeit.repeat(
+        lambda: [function(value) for value in values],
+        number=number,
+        repeat=repeat,
+    )
+    return min(timings) / (number * len(values)) * 1_000_000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    values = page_values()
+    results = [
+        ('legado (setlocale)', measure(
+            legacy_currency, values, args.number, args.repeat,
+        )),
+        ('atual, sem cache', measure(
+            lambda value: format_brl.__wrapped__(value),
+            values,
+            args.number,
+            args.repeat,
+        )),
+        ('atual (filtro)', measure(
+            currency, values, args.number, args.repeat,
+        )),
+    ]
+
+    baseline = results[0][1]
+    for name, per_call in results:
+        print(
+            f'{name:<22} {per_call:8.3f} µs/chamada '
+            f'({baseline / per_call:5.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+Vazão de leitura e escrita no SQLite com vários workers simultâneos.
+
+Simula workers do gunicorn num mesmo arquivo: leitores fazem as
+consultas da listagem (agregado + página) e escritores lançam transações
+como a view de criação (lê o saldo, insere, atualiza a conta). Compara o
+SQLite padrão (journal DELETE, BEGIN adiado) com o perfil configurado em
+`SQLITE_PRAGMAS` e `transaction_mode`; cada perfil usa um arquivo novo.
+
+    python -m benchmarks.sqlite_concurrency [--readers N] [--writers N]
+        [--duration S] [--output resultados.json]
+"""
+# Standard library
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+# Django imports
+from django.conf import settings  # noqa: E402
+
+# Local imports
+from benchmarks.views import percentile  # noqa: E402
+from core.db import apply_pragmas  # noqa: E402
+
+ACCOUNTS = 50
+SEED_ROWS = 50_000
+FIRST_DATE = date(2015, 1, 1)
+
+
+def configured_profile():
+    """Pragmas e modo de transação dos settings atuais."""
+    options = settings.DATABASES['default'].get('OPTIONS', {})
+    return {
+        'pragmas': dict(settings.SQLITE_PRAGMAS),
+        'transaction_mode': options.get('transaction_mode'),
+    }
+
+
+PROFILES = {
+    'padrão': {'pragmas': {}, 'transaction_mode': None},
+    'configurado': configured_profile(),
+}
+
+
+def connect(path, profile, timeout):
+    """Conexão em autocommit, com BEGIN explícito como o Django."""
+    connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    apply_pragmas(connection, profile['pragmas'])
+    return connection
+
+
+def create_database(path, profile):
+    """Cria as tabelas e a massa inicial."""
+    rng = random.Random(42)
+    connection = connect(path, profile, timeout=5)
+    connection.executescript('''
+        CREATE TABLE account (id INTEGER PRIMARY KEY, balance NUMERIC);
+        CREATE TABLE entry (
+            id INTEGER PRIMARY KEY,
+            account_id INTEGER REFERENCES account (id),
+            amount NUMERIC,
+            entry_date TEXT,
+            description TEXT
+        );
+        CREATE INDEX entry_account_date ON entry (account_id, entry_date);
+    ''')
+    connection.execute('BEGIN')
+    connection.executemany(
+        'INSERT INTO account (id, balance) VALUES (?, 0)',
+        [(pk,) for pk in range(1, ACCOUNTS + 1)],
+    )
+    connection.executemany(
+        'INSERT INTO entry (account_id, amount, entry_date, description) '
+        'VALUES (?, ?, ?, ?)',
+        [
+            (
+                rng.randint(1, ACCOUNTS),
+                round(rng.uniform(1, 500), 2),
+                str(FIRST_DATE + timedelta(days=rng.randint(0, 3650))),
+                f'Lançamento {index}',
+            )
+            for index in range(SEED_ROWS)
+        ],
+    )
+    connection.execute(
+        'UPDATE account SET balance = ('
+        'SELECT COALESCE(SUM(amount), 0) FROM entry '
+        'WHERE entry.account_id = account.id)'
+    )
+    connection.execute('COMMIT')
+    connection.close()
+
+
+def read(connection, rng):
+    """Agregado do período e primeira página, como a listagem."""
+    account_id = rng.randint(1, ACCOUNTS)
+    start = FIRST_DATE + timedelta(days=rng.randint(0, 3300))
+    connection.execute('BEGIN')
+    try:
+        connection.execute(
+            'SELECT COUNT(*), SUM(amount) FROM entry '
+            'WHERE account_id = ? AND entry_date >= ?',
+            (account_id, start.isoformat()),
+        ).fetchone()
+        connection.execute(
+            'SELECT id, amount, entry_date, description FROM entry '
+            'WHERE account_id = ? ORDER BY entry_date DESC LIMIT 20',
+            (account_id,),
+        ).fetchall()
+    finally:
+        if connection.in_transaction:
+            connection.execute('COMMIT')
+
+
+def write(connection, rng, transaction_mode):
+    """Lê o saldo, insere o lançamento e atualiza a conta."""
+    account_id = rng.randint(1, ACCOUNTS)
+    amount = round(rng.uniform(1, 500), 2)
+    connection.execute(f'BEGIN {transaction_mode or ""}')
+    try:
+        balance = connection.execute(
+            'SELECT balance FROM account WHERE id = ?',
+            (account_id,),
+        ).fetchone()[0]
+        connection.execute(
+            'INSERT INTO entry (account_id, amount, entry_date, description) '
+            'VALUES (?, ?, ?, ?)',
+            (account_id, amount, '2025-01-01', 'Benchmark'),
+        )
+        connection.execute(
+            'UPDATE account SET balance = ? WHERE id = ?',
+            (balance + amount, account_id),
+        )
+        connection.execute('COMMIT')
+    except sqlite3.Error:
+        if connection.in_transaction:
+            connection.execute('ROLLBACK')
+        raise
+
+
+def worker(path, profile, role, seed, window, timeout, results):
+    """Executa operações na janela e devolve contagens e latências."""
+    rng = random.Random(seed)
+    connection = connect(path, profile, timeout)
+    start_at, deadline = window
+    # All workers start together, once every process is up
+    time.sleep(max(start_at - time.time(), 0))
+    latencies = []
+    errors = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            if role == 'read':
+                read(connection, rng)
+            else:
+                write(connection, rng, profile['transaction_mode'])
+        except sqlite3.OperationalError:
+            # "database is locked" / busy
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    results.put((role, latencies, errors))
+
+
+def run_profile(name, profile, args):
+    """Mede um perfil num banco novo."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / f'{name}.sqlite3')
+        create_database(path, profile)
+
+        results = multiprocessing.Queue()
+        start_at = time.time() + 1
+        window = (start_at, start_at + args.duration)
+        roles = ['read'] * args.readers + ['write'] * args.writers
+        processes = [
+            multiprocessing.Process(
+                target=worker,
+                args=(
+                    path,
+                    profile,
+                    role,
+                    index,
+                    window,
+                    args.timeout,
+                    results,
+                ),
+            )
+            for index, role in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    summary = {}
+    for role in ('read', 'write'):
+        latencies = [
+            latency
+            for worker_role, worker_latencies, _ in collected
+            if worker_role == role
+            for latency in worker_latencies
+        ]
+        summary[role] = {
+            'ops_per_second': round(len(latencies) / args.duration, 1),
+            'errors': sum(
+                errors for worker_role, _, errors in collected
+                if worker_role == role
+            ),
+            'p95_ms': round(percentile(latencies, 0.95), 2)
+            if latencies else None,
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=5.0,
+        help='Timeout de lock do sqlite3, como no Django (s).',
+    )
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args(argv)
+
+    results = {
+        name: run_profile(name, profile, args)
+        for name, profile in PROFILES.items()
+    }
+
+    print(
+        f'{args.readers} leitores, {args.writers} escritores, '
+        f'{args.duration:.0f}s por perfil'
+    )
+    header = (
+        f'{"perfil":<12} {"leituras/s":>11} {"p95 ms":>8} {"erros":>6} '
+        f'{"escritas/s":>11} {"p95 ms":>8} {"erros":>6}'
+    )
+    print(header)
+    print('-' * len(header))
+    for name, summary in results.items():
+        reads, writes = summary['read'], summary['write']
+        print(
+            f'{name:<12} {reads["ops_per_second"]:>11.1f} '
+            f'{reads["p95_ms"] or 0:>8.2f} {reads["errors"]:>6} '
+            f'{writes["ops_per_second"]:>11.1f} '
+            f'{writes["p95_ms"] or 0:>8.2f} {writes["errors"]:>6}'
+        )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + '\n',
+            encoding='utf-8',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,461 @@
+"""
+Latência, queries e memória das principais views por tamanho de massa.
+
+Para cada massa (`small`, `medium`, `large`) um banco de teste novo é
+criado e populado com `seed_benchmark_data`; os cenários rodam no test
+client autenticado como o primeiro usuário gerado. Cada cenário registra
+p50/p95 da latência, o número de queries (o maior entre as iterações) e
+o pico de memória de uma iteração extra medida com `tracemalloc`, à
+parte para não distorcer os tempos.
+
+As leituras medem o cache frio: antes de cada iteração a versão dos
+dados do usuário é incrementada, como depois de qualquer lançamento. Os
+cenários marcados "(cache)" medem as mesmas páginas com o cache quente.
+
+    python -m benchmarks.views [--datasets small medium] [--iterations N]
+        [--output resultados.json] [--baseline arquivo.json]
+        [--update-baseline]
+
+Havendo baseline, o comando termina com código 1 quando algum cenário
+regride: p95 ou pico de memória acima da tolerância, ou mais queries.
+Os tempos dependem da máquina; gere a baseline (`--update-baseline`) no
+mesmo ambiente em que as comparações vão rodar.
+"""
+# Standard library
+import argparse
+import io
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+# Django imports
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+# Local imports
+from categories.models import Category  # noqa: E402
+from core.cache import bump_data_version  # noqa: E402
+from core.middleware import QueryTimer  # noqa: E402
+from transactions.models import Transaction  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'views.json'
+
+# Fixed so that every run seeds exactly the same history
+END_DATE = date(2024, 12, 31)
+EMAIL_DOMAIN = 'benchmark.finanpy'
+
+DATASETS = {
+    'small': {'users': 3, 'transactions': 500, 'years': 1},
+    'medium': {'users': 10, 'transactions': 5000, 'years': 5},
+    'large': {'users': 20, 'transactions': 20000, 'years': 10},
+}
+
+DEFAULT_ITERATIONS = 30
+DEFAULT_WARMUP = 3
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.25
+# Smaller p95 differences are noise, whatever the percentage
+MIN_TIME_DELTA_MS = 2.0
+
+
+class BenchmarkState:
+    """Usuário autenticado e registros usados pelos cenários."""
+
+    def __init__(self, user):
+        self.user = user
+        self.client = Client()
+        self.client.force_login(user)
+        self.account = user.accounts.filter(
+            is_active=True,
+        ).order_by('pk').first()
+        self.income_category = user.categories.filter(
+            category_type=Category.INCOME,
+        ).order_by('pk').first()
+        # Income keeps updates and deletes clear of the balance check
+        self.transaction = user.transactions.filter(
+            transaction_type=Transaction.INCOME,
+        ).order_by('-transaction_date', '-pk').first()
+        self.counter = 0
+
+    def income_data(self, amount='12.34'):
+        """Dados de formulário de uma entrada na conta principal."""
+        self.counter += 1
+        return {
+            'account': self.account.pk,
+            'category': self.income_category.pk,
+            'transaction_type': 'income',
+            'amount': amount,
+            'transaction_date': END_DATE.isoformat(),
+            'description': f'Benchmark {self.counter}',
+        }
+
+
+class Scenario:
+    """
+    Uma requisição medida.
+
+    Args:
+        name: Nome do cenário nos resultados
+        request: Função (state) que faz a requisição
+        expected_status: Status esperado; outro status aborta a medição
+        before_each: Função (state) executada antes de cada iteração,
+            fora da medição
+    """
+
+    def __init__(self, name, request, expected_status=200, before_each=None):
+        self.name = name
+        self.request = request
+        self.expected_status = expected_status
+        self.before_each = before_each
+
+    def prepare(self, state):
+        """Prepara a próxima iteração (fora da medição)."""
+        if self.before_each is not None:
+            self.before_each(state)
+
+    def run(self, state):
+        """Faz a requisição e devolve a resposta."""
+        response = self.request(state)
+        if response.status_code != self.expected_status:
+            raise RuntimeError(
+                f'{self.name}: status {response.status_code}, esperado '
+                f'{self.expected_status}.'
+            )
+        return response
+
+
+def _get(url_name, params=None):
+    def request(state):
+        return state.client.get(reverse(url_name), params or {})
+    return request
+
+
+def _invalidate_cache(state):
+    bump_data_version(user_ids=[state.user.pk])
+
+
+def _cold(name, request):
+    return Scenario(name, request, before_each=_invalidate_cache)
+
+
+def _create(state):
+    return state.client.post(
+        reverse('transactions:create'),
+        state.income_data(),
+    )
+
+
+def _update(state):
+    transaction = state.transaction
+    data = state.income_data(amount=str(transaction.amount))
+    data['category'] = transaction.category_id
+    data['transaction_date'] = transaction.transaction_date.isoformat()
+    return state.client.post(
+        reverse('transactions:update', args=[transaction.pk]),
+        data,
+    )
+
+
+def _prepare_delete(state):
+    state.pending_delete = Transaction.objects.create(
+        account=state.account,
+        category=state.income_category,
+        transaction_type=Transaction.INCOME,
+        amount=Decimal('1.00'),
+        transaction_date=END_DATE,
+        description='Benchmark (exclusão)',
+    )
+
+
+def _delete(state):
+    return state.client.post(
+        reverse('transactions:delete', args=[state.pending_delete.pk]),
+    )
+
+
+# Reads first: the write flows add rows to the dataset
+SCENARIOS = [
+    _cold('dashboard', _get('dashboard')),
+    Scenario('dashboard (cache)', _get('dashboard')),
+    _cold('transactions:list', _get('transactions:list')),
+    Scenario('transactions:list (cache)', _get('transactions:list')),
+    _cold(
+        'transactions:list (busca)',
+        _get('transactions:list', {'q': 'mercado', 'sort': 'amount'}),
+    ),
+    _cold('accounts:list', _get('accounts:list')),
+    _cold('categories:list', _get('categories:category_list')),
+    Scenario('transactions:create', _create, expected_status=302),
+    Scenario('transactions:update', _update, expected_status=302),
+    Scenario(
+        'transactions:delete',
+        _delete,
+        expected_status=302,
+        before_each=_prepare_delete,
+    ),
+]
+
+
+def percentile(values, fraction):
+    """Percentil com interpolação linear (`fraction` entre 0 e 1)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (
+        (ordered[upper] - ordered[lower]) * (position - lower)
+    )
+
+
+def measure(scenario, state, iterations, warmup):
+    """
+    Mede um cenário.
+
+    Returns:
+        dict: p50/p95/média em ms, queries e pico de memória em KiB
+    """
+    for _ in range(warmup):
+        scenario.prepare(state)
+        scenario.run(state)
+
+    durations = []
+    queries = 0
+    for _ in range(iterations):
+        scenario.prepare(state)
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(timer),
+                )
+            start = time.perf_counter()
+            scenario.run(state)
+            durations.append((time.perf_counter() - start) * 1000)
+        queries = max(queries, timer.count)
+
+    scenario.prepare(state)
+    tracemalloc.start()
+    try:
+        scenario.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(durations, 0.5), 2),
+        'p95_ms': round(percentile(durations, 0.95), 2),
+        'mean_ms': round(sum(durations) / len(durations), 2),
+        'queries': queries,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_dataset(name, config, args):
+    """Cria um banco de teste, popula a massa e mede todos os cenários."""
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=0,
+        autoclobber=True,
+        serialize=False,
+    )
+    try:
+        cache.clear()
+        started = time.perf_counter()
+        call_command(
+            'seed_benchmark_data',
+            seed=args.seed,
+            end_date=END_DATE,
+            email_domain=EMAIL_DOMAIN,
+            stdout=io.StringIO(),
+            **config,
+        )
+        print(
+            f'[{name}] massa gerada em '
+            f'{time.perf_counter() - started:.1f}s',
+            file=sys.stderr,
+        )
+
+        user = get_user_model().objects.get(
+            email=f'bench00000@{EMAIL_DOMAIN}',
+        )
+        state = BenchmarkState(user)
+        return {
+            scenario.name: measure(
+                scenario,
+                state,
+                args.iterations,
+                args.warmup,
+            )
+            for scenario in SCENARIOS
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def compare_results(
+    current,
+    baseline,
+    time_tolerance=DEFAULT_TIME_TOLERANCE,
+    memory_tolerance=DEFAULT_MEMORY_TOLERANCE,
+):
+    """
+    Lista as regressões de `current` em relação à baseline.
+
+    Cenários ausentes em uma das execuções são ignorados.
+
+    Returns:
+        list: Uma mensagem por métrica que regrediu
+    """
+    regressions = []
+    for dataset, scenarios in current['datasets'].items():
+        previous_scenarios = baseline.get('datasets', {}).get(dataset, {})
+        for name, metrics in scenarios.items():
+            previous = previous_scenarios.get(name)
+            if previous is None:
+                continue
+
+            label = f'{dataset} / {name}'
+            if metrics['queries'] > previous['queries']:
+                regressions.append(
+                    f'{label}: queries {previous["queries"]} -> '
+                    f'{metrics["queries"]}'
+                )
+            p95_limit = max(
+                previous['p95_ms'] * (1 + time_tolerance),
+                previous['p95_ms'] + MIN_TIME_DELTA_MS,
+            )
+            if metrics['p95_ms'] > p95_limit:
+                regressions.append(
+                    f'{label}: p95 {previous["p95_ms"]:.2f} -> '
+                    f'{metrics["p95_ms"]:.2f} ms'
+                )
+            if metrics['peak_kib'] > previous['peak_kib'] * (
+                1 + memory_tolerance
+            ):
+                regressions.append(
+                    f'{label}: memória {previous["peak_kib"]:.1f} -> '
+                    f'{metrics["peak_kib"]:.1f} KiB'
+                )
+    return regressions
+
+
+def print_report(results):
+    """Tabela com as métricas de cada massa e cenário."""
+    header = (
+        f'{"massa":<8} {"cenário":<28} {"p50 ms":>9} {"p95 ms":>9} '
+        f'{"queries":>8} {"pico KiB":>10}'
+    )
+    print(header)
+    print('-' * len(header))
+    for dataset, scenarios in results['datasets'].items():
+        for name, metrics in scenarios.items():
+            print(
+                f'{dataset:<8} {name:<28} {metrics["p50_ms"]:>9.2f} '
+                f'{metrics["p95_ms"]:>9.2f} {metrics["queries"]:>8} '
+                f'{metrics["peak_kib"]:>10.1f}'
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--datasets',
+        nargs='+',
+        choices=list(DATASETS),
+        default=list(DATASETS),
+    )
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='Grava os resultados como nova baseline.',
+    )
+    parser.add_argument(
+        '--time-tolerance',
+        type=float,
+        default=DEFAULT_TIME_TOLERANCE,
+    )
+    parser.add_argument(
+        '--memory-tolerance',
+        type=float,
+        default=DEFAULT_MEMORY_TOLERANCE,
+    )
+    args = parser.parse_args(argv)
+
+    setup_test_environment()
+    # Budget warnings for every request would drown the report
+    logging.getLogger('core.performance').setLevel(logging.ERROR)
+
+    results = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'machine': platform.machine(),
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'datasets': {},
+    }
+    for name in args.datasets:
+        results['datasets'][name] = run_dataset(name, DATASETS[name], args)
+
+    print_report(results)
+    content = json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+    if args.output:
+        args.output.write_text(content, encoding='utf-8')
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(content, encoding='utf-8')
+        print(f'\nBaseline gravada em {args.baseline}.')
+        return 0
+
+    if not args.baseline.exists():
+        print(f'\nSem baseline em {args.baseline}; nada a comparar.')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    regressions = compare_results(
+        results,
+        baseline,
+        args.time_tolerance,
+        args.memory_tolerance,
+    )
+    if regressions:
+        print('\nRegressões em relação à baseline:')
+        for regression in regressions:
+            print(f'  - {regression}')
+        return 1
+
+    print('\nNenhuma regressão em relação à baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Categorias padrão criadas para cada novo usuário.
+
+O conjunto vem de `settings.DEFAULT_CATEGORIES`, quando definido, ou da
+tabela `DEFAULT_CATEGORIES_BY_LANGUAGE` conforme o `LANGUAGE_CODE`
+(`pt-br` quando o idioma não tem tabela própria). Cada item é um
+dicionário com `name`, `category_type` e `color`.
+"""
+# Django imports
+from django.conf import settings
+
+# Local imports
+from .models import Category
+
+FALLBACK_LANGUAGE = 'pt-br'
+
+DEFAULT_CATEGORIES_BY_LANGUAGE = {
+    'pt-br': [
+        # Categorias de INCOME (Entrada)
+        {'name': 'Salário', 'category_type': Category.INCOME,
+         'color': '#10b981'},
+        {'name': 'Freelance', 'category_type': Category.INCOME,
+         'color': '#059669'},
+        {'name': 'Investimentos', 'category_type': Category.INCOME,
+         'color': '#34d399'},
+        {'name': 'Outros Ganhos', 'category_type': Category.INCOME,
+         'color': '#6ee7b7'},
+        # Categorias de EXPENSE (Saída)
+        {'name': 'Alimentação', 'category_type': Category.EXPENSE,
+         'color': '#ef4444'},
+        {'name': 'Transporte', 'category_type': Category.EXPENSE,
+         'color': '#f59e0b'},
+        {'name': 'Moradia', 'category_type': Category.EXPENSE,
+         'color': '#8b5cf6'},
+        {'name': 'Saúde', 'category_type': Category.EXPENSE,
+         'color': '#ec4899'},
+        {'name': 'Educação', 'category_type': Category.EXPENSE,
+         'color': '#3b82f6'},
+        {'name': 'Lazer', 'category_type': Category.EXPENSE,
+         'color': '#14b8a6'},
+        {'name': 'Compras', 'category_type': Category.EXPENSE,
+         'color': '#f97316'},
+        {'name': 'Contas', 'category_type': Category.EXPENSE,
+         'color': '#6366f1'},
+        {'name': 'Outros Gastos', 'category_type': Category.EXPENSE,
+         'color': '#64748b'},
+    ],
+    'en': [
+        {'name': 'Salary', 'category_type': Category.INCOME,
+         'color': '#10b981'},
+        {'name': 'Freelance', 'category_type': Category.INCOME,
+         'color': '#059669'},
+        {'name': 'Investments', 'category_type': Category.INCOME,
+         'color': '#34d399'},
+        {'name': 'Other Income', 'category_type': Category.INCOME,
+         'color': '#6ee7b7'},
+        {'name': 'Food', 'category_type': Category.EXPENSE,
+         'color': '#ef4444'},
+        {'name': 'Transportation', 'category_type': Category.EXPENSE,
+         'color': '#f59e0b'},
+        {'name': 'Housing', 'category_type': Category.EXPENSE,
+         'color': '#8b5cf6'},
+        {'name': 'Health', 'category_type': Category.EXPENSE,
+         'color': '#ec4899'},
+        {'name': 'Education', 'category_type': Category.EXPENSE,
+         'color': '#3b82f6'},
+        {'name': 'Leisure', 'category_type': Category.EXPENSE,
+         'color': '#14b8a6'},
+        {'name': 'Shopping', 'category_type': Category.EXPENSE,
+         'color': '#f97316'},
+        {'name': 'Bills', 'category_type': Category.EXPENSE,
+         'color': '#6366f1'},
+        {'name': 'Other Expenses', 'category_type': Category.EXPENSE,
+         'color': '#64748b'},
+    ],
+}
+
+
+def get_default_categories():
+    """
+    Retorna a lista de categorias padrão em uso.
+
+    Returns:
+        list: Dicionários com `name`, `category_type` e `color`
+    """
+    configured = getattr(settings, 'DEFAULT_CATEGORIES', None)
+    if configured is not None:
+        return configured
+
+    language = settings.LANGUAGE_CODE.lower()
+    return DEFAULT_CATEGORIES_BY_LANGUAGE.get(
+        language,
+        DEFAULT_CATEGORIES_BY_LANGUAGE.get(
+            language.split('-')[0],
+            DEFAULT_CATEGORIES_BY_LANGUAGE[FALLBACK_LANGUAGE],
+        ),
+    )
+
+
+def create_default_categories_for(user, using=None):
+    """
+    Cria as categorias padrão de um usuário com um único INSERT.
+
+    `bulk_create` não dispara os signals de `Category`; o usuário acabou
+    de ser criado, então não há cache para invalidar.
+
+    Args:
+        user: Usuário dono das categorias
+        using: Banco em que gravar (opcional)
+
+    Returns:
+        list: Categorias criadas
+    """
+    return Category.objects.using(using).bulk_create([
+        Category(
+            user=user,
+            name=category['name'],
+            category_type=category['category_type'],
+            color=category['color'],
+        )
+        for category in get_default_categories()
+    ])
@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from categories.defaults import (
+    DEFAULT_CATEGORIES_BY_LANGUAGE,
+    get_default_categories,
+)
 from categories.models import Category
 
 
@@ -40,3 +44,59 @@ class TestCategoryModel(TestCase):
         )
 
         self.assertEqual(category.color, '#667eea')
+
+
+class TestDefaultCategories(TestCase):
+    """Tests for the categories created at signup."""
+
+    def test_signup_inserts_default_categories_in_one_query(self):
+        """User, profile and all default categories: three INSERTs."""
+        with self.assertNumQueries(3):
+            user = get_user_model().objects.create_user(
+                email='signup@example.com',
+                password='safe-pass'
+            )
+
+        expected = get_default_categories()
+        self.assertEqual(
+            sorted(user.categories.values_list(
+                'name',
+                'category_type',
+                'color',
+            )),
+            sorted(
+                (item['name'], item['category_type'], item['color'])
+                for item in expected
+            ),
+        )
+        self.assertEqual(len(expected), 13)
+
+    @override_settings(DEFAULT_CATEGORIES=[
+        {'name': 'Vendas', 'category_type': Category.INCOME,
+         'color': '#000000'},
+    ])
+    def test_default_categories_can_be_overridden_in_settings(self):
+        """DEFAULT_CATEGORIES replaces the built-in table."""
+        user = get_user_model().objects.create_user(
+            email='override@example.com',
+            password='safe-pass'
+        )
+
+        self.assertEqual(
+            list(user.categories.values_list('name', flat=True)),
+            ['Vendas'],
+        )
+
+    @override_settings(LANGUAGE_CODE='en-us')
+    def test_default_categories_follow_language_code(self):
+        """The table is picked by LANGUAGE_CODE, then by its prefix."""
+        self.assertEqual(
+            get_default_categories(),
+            DEFAULT_CATEGORIES_BY_LANGUAGE['en'],
+        )
+
+        with override_settings(LANGUAGE_CODE='de'):
+            self.assertEqual(
+                get_default_categories(),
+                DEFAULT_CATEGORIES_BY_LANGUAGE['pt-br'],
+            )
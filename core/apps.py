@@ -0,0 +1,26 @@
+from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    """Configurações do núcleo do projeto."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        """
+        Liga os ajustes de conexão: pragmas do SQLite a cada conexão nova
+        e métricas do pool do PostgreSQL ao fim das requisições.
+        """
+        from core.db import configure_sqlite, report_pool_stats
+
+        connection_created.connect(
+            configure_sqlite,
+            dispatch_uid='core.db.configure_sqlite',
+        )
+        request_finished.connect(
+            report_pool_stats,
+            dispatch_uid='core.db.report_pool_stats',
+        )
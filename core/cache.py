@@ -0,0 +1,160 @@
+"""
+Cache versionado pelos dados financeiros de cada usuário.
+
+Cada usuário tem um contador `data_version`, incrementado sempre que uma
+transação, conta ou categoria dele muda. As chaves de cache incluem a
+versão atual, então um payload calculado nunca precisa ser invalidado:
+depois de qualquer mudança, a próxima leitura usa uma chave nova e as
+antigas expiram sozinhas.
+
+Como `request.user` já é carregado a cada requisição, ler a versão não
+custa nenhuma query.
+
+Em templates, `{% usercache "nome" ... %}` (`core.templatetags.user_cache`)
+guarda um fragmento renderizado com a mesma chave versionada. Acertos e
+falhas de `get_or_set_for_user` são contados por namespace em cada
+processo (`get_cache_stats`).
+"""
+# Standard library
+import threading
+from collections import Counter
+
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, Q
+
+# Default lifetime of versioned entries (stale versions just expire)
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def bump_data_version(user_ids=(), account_ids=(), using=DEFAULT_DB_ALIAS):
+    """
+    Incrementa a versão dos dados dos usuários com um único UPDATE.
+
+    Args:
+        user_ids: Usuários afetados
+        account_ids: Contas afetadas cujo dono ainda não é conhecido
+        using: Alias do banco
+    """
+    condition = Q()
+    if user_ids:
+        condition |= Q(pk__in=set(user_ids))
+    if account_ids:
+        condition |= Q(accounts__pk__in=set(account_ids))
+    if not condition:
+        return
+
+    get_user_model().objects.using(using).filter(condition).update(
+        data_version=F('data_version') + 1,
+    )
+
+
+def user_cache_key(user, namespace, *parts):
+    """
+    Monta a chave de cache `namespace:user_id:versão:partes`.
+    """
+    return ':'.join(
+        str(part)
+        for part in (namespace, user.pk, user.data_version, *parts)
+    )
+
+
+def get_or_set_for_user(user, namespace, parts, compute, timeout=None):
+    """
+    Retorna o valor em cache para o usuário ou o calcula e guarda.
+
+    Args:
+        user: Usuário autenticado (com `data_version` carregado)
+        namespace: Prefixo da chave, um por tipo de payload
+        parts: Demais componentes da chave (ex.: mês, filtros)
+        compute: Função sem argumentos que calcula o valor
+        timeout: Validade em segundos (padrão: DATA_CACHE_TIMEOUT)
+
+    Returns:
+        Valor em cache ou recém-calculado
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'DATA_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+    key = user_cache_key(user, namespace, *parts)
+    value = cache.get(key)
+    _record_lookup(namespace, value)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def aget_or_set_for_user(
+    user,
+    namespace,
+    parts,
+    compute,
+    timeout=None,
+):
+    """
+    Versão assíncrona de `get_or_set_for_user`.
+
+    Args:
+        compute: Função sem argumentos que retorna uma corrotina com o
+            valor a guardar
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'DATA_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+    key = user_cache_key(user, namespace, *parts)
+    value = await cache.aget(key)
+    _record_lookup(namespace, value)
+    if value is None:
+        value = await compute()
+        await cache.aset(key, value, timeout)
+    return value
+
+
+def _record_lookup(namespace, value):
+    """Conta um acerto (valor encontrado) ou uma falha no namespace."""
+    with _stats_lock:
+        if value is None:
+            _misses[namespace] += 1
+        else:
+            _hits[namespace] += 1
+
+
+def get_cache_stats():
+    """
+    Acertos e falhas de `get_or_set_for_user` por namespace neste processo.
+
+    Returns:
+        dict: namespace -> {'hits', 'misses', 'hit_rate'}
+    """
+    with _stats_lock:
+        hits = dict(_hits)
+        misses = dict(_misses)
+
+    stats = {}
+    for namespace in sorted(hits.keys() | misses.keys()):
+        namespace_hits = hits.get(namespace, 0)
+        namespace_misses = misses.get(namespace, 0)
+        stats[namespace] = {
+            'hits': namespace_hits,
+            'misses': namespace_misses,
+            'hit_rate': round(
+                namespace_hits / (namespace_hits + namespace_misses),
+                3,
+            ),
+        }
+    return stats
+
+
+def reset_cache_stats():
+    """Zera os contadores de acertos e falhas."""
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
@@ -0,0 +1,171 @@
+"""
+Ajustes de conexão do SQLite para implantações com vários workers.
+
+Com o journal padrão (`DELETE`), uma escrita bloqueia todas as leituras e
+workers concorrentes recebem "database is locked". Em modo WAL leitores
+não esperam escritores, e `busy_timeout` faz quem precisa escrever
+aguardar a vez em vez de falhar.
+
+`configure_sqlite` é ligado ao sinal `connection_created` em
+`CoreConfig.ready` e aplica `settings.SQLITE_PRAGMAS` a cada conexão
+nova. Conexões de outros bancos são ignoradas.
+
+Em views assíncronas, `run_queries_concurrently` executa consultas
+independentes ao mesmo tempo, cada uma numa thread com conexão própria.
+
+No PostgreSQL com pool (`OPTIONS['pool']`), `report_pool_stats` registra
+no logger `core.db.pool`, a cada `DB_POOL_STATS_INTERVAL` segundos, as
+conexões em uso, as requisições à espera e a latência de aquisição.
+"""
+# Standard library
+import asyncio
+import logging
+import threading
+import time
+
+# Django imports
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connections
+
+pool_logger = logging.getLogger('core.db.pool')
+
+_report_lock = threading.Lock()
+_last_report = None
+
+
+def pragma_statements(pragmas):
+    """
+    Monta os comandos `PRAGMA` a partir de um dicionário nome -> valor.
+
+    Valores None ou vazios são ignorados. Como os comandos não aceitam
+    parâmetros, nomes e valores precisam ser identificadores ou números.
+
+    Raises:
+        ImproperlyConfigured: Nome ou valor inválido
+    """
+    statements = []
+    for name, value in pragmas.items():
+        if value is None or value == '':
+            continue
+        if not name.isidentifier() or not (
+            isinstance(value, int) or str(value).isidentifier()
+        ):
+            raise ImproperlyConfigured(
+                f'Pragma SQLite inválido: {name}={value!r}',
+            )
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """
+    Aplica os pragmas numa conexão `sqlite3`.
+
+    Usa a conexão DB-API diretamente, então os comandos não passam pelos
+    `execute_wrapper` do Django (nem entram na contagem de queries).
+    """
+    for statement in pragma_statements(pragmas):
+        dbapi_connection.execute(statement)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Receptor de `connection_created` para conexões SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    apply_pragmas(
+        connection.connection,
+        getattr(settings, 'SQLITE_PRAGMAS', {}),
+    )
+
+
+def collect_pool_stats(connection):
+    """
+    Métricas do pool da conexão desde a última coleta (None sem pool).
+
+    Os contadores do psycopg_pool são zerados a cada coleta
+    (`pop_stats`); tamanho, disponíveis e espera são instantâneos.
+    """
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+
+    stats = pool.pop_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    requests = stats.get('requests_num', 0)
+    wait_ms = stats.get('requests_wait_ms', 0)
+    return {
+        'alias': connection.alias,
+        'size': size,
+        'in_use': size - available,
+        'available': available,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': requests,
+        'queued': stats.get('requests_queued', 0),
+        'errors': stats.get('requests_errors', 0),
+        'acquire_avg_ms': round(wait_ms / requests, 2) if requests else 0.0,
+    }
+
+
+def report_pool_stats(sender=None, **kwargs):
+    """
+    Receptor de `request_finished`: registra as métricas dos pools.
+
+    Só registra uma vez por intervalo em cada processo; conexões ainda
+    não abertas na thread atual não são criadas.
+    """
+    global _last_report
+
+    interval = getattr(settings, 'DB_POOL_STATS_INTERVAL', 60)
+    if not interval:
+        return
+    now = time.monotonic()
+    with _report_lock:
+        if _last_report is not None and now - _last_report < interval:
+            return
+        _last_report = now
+
+    for connection in connections.all(initialized_only=True):
+        stats = collect_pool_stats(connection)
+        if stats is None:
+            continue
+        level = (
+            logging.WARNING
+            if stats['waiting'] or stats['errors']
+            else logging.INFO
+        )
+        pool_logger.log(
+            level,
+            'alias=%(alias)s size=%(size)s in_use=%(in_use)s '
+            'available=%(available)s waiting=%(waiting)s '
+            'requests=%(requests)s queued=%(queued)s errors=%(errors)s '
+            'acquire_avg_ms=%(acquire_avg_ms)s',
+            stats,
+            extra={'pool': stats},
+        )
+
+
+async def run_queries_concurrently(*functions):
+    """
+    Executa funções síncronas de ORM ao mesmo tempo e devolve os
+    resultados na mesma ordem.
+
+    Os métodos assíncronos do ORM (`aaggregate`, `async for`) passam
+    todos pela mesma thread e rodam em sequência; aqui cada função roda
+    numa thread do executor, com a conexão daquela thread. Ao terminar,
+    a conexão é liberada conforme `CONN_MAX_AGE` (ou devolvida ao pool).
+    Use apenas para leituras independentes, fora de transações.
+    """
+    def in_own_connection(function):
+        def run():
+            try:
+                return function()
+            finally:
+                close_old_connections()
+        return sync_to_async(run, thread_sensitive=False)
+
+    return list(await asyncio.gather(
+        *(in_own_connection(function)() for function in functions)
+    ))
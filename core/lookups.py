@@ -0,0 +1,128 @@
+"""
+Contas e categorias do usuário carregadas uma única vez por requisição.
+
+Formulários, filtros da listagem e validações de posse consultavam os
+mesmos conjuntos várias vezes na mesma requisição. `UserLookups` carrega
+tudo de uma vez em dicionários indexados por id e guarda o resultado no
+cache versionado (`core.cache`), então requisições seguintes não tocam no
+banco até que uma conta, categoria ou transação do usuário mude.
+
+Nas views, use `get_user_lookups(request)`, que memoriza a instância no
+próprio request.
+"""
+# Django imports
+from django.utils.functional import cached_property
+
+# Local imports
+from accounts.models import Account
+from categories.models import Category
+
+from .cache import get_or_set_for_user
+
+LOOKUPS_NAMESPACE = 'lookups'
+
+
+class UserLookups:
+    """
+    Contas e categorias de um usuário indexadas por id (ordem por nome).
+
+    Args:
+        user: Usuário dono dos registros
+        use_cache: Usa o cache versionado entre requisições. Desative
+            para usuários que não vieram da requisição atual, cujo
+            `data_version` em memória pode estar desatualizado.
+        using: Alias do banco (opcional)
+    """
+
+    def __init__(self, user, use_cache=True, using=None):
+        self.user = user
+        self.use_cache = use_cache
+        self.using = using
+
+    def _load(self):
+        """Busca contas e categorias do usuário (duas queries)."""
+        return {
+            'accounts': list(
+                Account.objects.using(self.using).filter(
+                    user=self.user,
+                ).order_by('name')
+            ),
+            'categories': list(
+                Category.objects.using(self.using).filter(
+                    user=self.user,
+                ).order_by('name')
+            ),
+        }
+
+    @cached_property
+    def _data(self):
+        if not self.use_cache:
+            return self._load()
+        return get_or_set_for_user(
+            self.user,
+            LOOKUPS_NAMESPACE,
+            (),
+            self._load,
+        )
+
+    @cached_property
+    def accounts(self):
+        """Todas as contas do usuário, incluindo as inativas."""
+        return {account.pk: account for account in self._data['accounts']}
+
+    @cached_property
+    def active_accounts(self):
+        """Contas ativas, as únicas disponíveis para novos lançamentos."""
+        return {
+            pk: account
+            for pk, account in self.accounts.items()
+            if account.is_active
+        }
+
+    @cached_property
+    def categories(self):
+        """Todas as categorias do usuário."""
+        return {
+            category.pk: category
+            for category in self._data['categories']
+        }
+
+    def categories_of_type(self, category_type):
+        """Categorias de receita ou de despesa."""
+        return {
+            pk: category
+            for pk, category in self.categories.items()
+            if category.category_type == category_type
+        }
+
+    def get_account(self, pk, active_only=True):
+        """
+        Retorna a conta se ela pertence ao usuário (senão None).
+        """
+        accounts = self.active_accounts if active_only else self.accounts
+        return accounts.get(_to_pk(pk))
+
+    def get_category(self, pk):
+        """
+        Retorna a categoria se ela pertence ao usuário (senão None).
+        """
+        return self.categories.get(_to_pk(pk))
+
+
+def _to_pk(value):
+    """Converte ids vindos de GET/POST; valores inválidos viram None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_user_lookups(request):
+    """
+    Retorna o `UserLookups` do usuário da requisição, criado uma vez.
+    """
+    lookups = getattr(request, '_user_lookups', None)
+    if lookups is None:
+        lookups = UserLookups(request.user)
+        request._user_lookups = lookups
+    return lookups
@@ -0,0 +1,209 @@
+"""
+Medição de custo por requisição: queries, SQL, renderização e view.
+
+`RequestTimingMiddleware` instala um `execute_wrapper` em cada conexão
+durante a requisição e mede o tempo de renderização dos
+`TemplateResponse`. O resultado vai para o cabeçalho `Server-Timing`
+(visível no DevTools do navegador) e para uma linha de log
+(`core.performance`) com os mesmos valores em `extra['performance']`.
+
+Apenas uma fração das requisições é medida (`PERFORMANCE_SAMPLE_RATE`);
+nas demais o middleware não instala nada. Quando uma view medida passa
+do orçamento de queries (`QUERY_BUDGETS`, ou `QUERY_BUDGET_DEFAULT`), um
+aviso é registrado.
+
+Respostas em streaming (ex.: exportação) são medidas só até o início do
+envio.
+
+O middleware funciona em cadeias síncronas e assíncronas. Na assíncrona,
+as queries do ORM rodam numa thread de `sync_to_async` (a mesma durante
+toda a requisição), e o `execute_wrapper` é instalado e removido nessa
+thread. Consultas em threads próprias (`core.db.run_queries_concurrently`)
+não entram na contagem.
+"""
+# Standard library
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+# Django imports
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('core.performance')
+
+
+class QueryTimer:
+    """
+    `execute_wrapper` que conta as queries e soma o tempo gasto nelas.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestTimingMiddleware:
+    """
+    Mede queries, tempo de SQL, de renderização e da view por requisição.
+
+    Configuração (settings):
+        PERFORMANCE_SAMPLE_RATE: Fração das requisições medidas (0 a 1)
+        QUERY_BUDGETS: Máximo de queries por view, pelo nome da URL
+            (ex.: `{'transactions:list': 8}`)
+        QUERY_BUDGET_DEFAULT: Orçamento das views sem entrada própria
+            (None ou 0 desativa)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not is_sampled():
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        request._render_duration = 0.0
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            install_query_timer(stack, timer)
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        self.report(request, response, timer, total)
+        return response
+
+    async def __acall__(self, request):
+        """
+        Variante assíncrona de `__call__`.
+        """
+        if not is_sampled():
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        request._render_duration = 0.0
+        start = time.perf_counter()
+        stack = ExitStack()
+        # Connections are per thread: wrap the ones of the thread that
+        # runs the request's sync_to_async (thread_sensitive) ORM calls
+        await sync_to_async(install_query_timer)(stack, timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        total = time.perf_counter() - start
+
+        self.report(request, response, timer, total)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Mede a renderização, que acontece logo após este hook.
+        """
+        if not hasattr(request, '_render_duration'):
+            return response
+
+        render_start = time.perf_counter()
+
+        def record_render(rendered_response):
+            request._render_duration += time.perf_counter() - render_start
+
+        response.add_post_render_callback(record_render)
+        return response
+
+    def report(self, request, response, timer, total):
+        """Escreve o `Server-Timing`, a linha de log e o aviso de orçamento."""
+        render = request._render_duration
+        metrics = {
+            'db': timer.duration * 1000,
+            'render': render * 1000,
+            'view': max(total - render, 0) * 1000,
+            'total': total * 1000,
+        }
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics["db"]:.1f};desc="{timer.count} queries"',
+            f'render;dur={metrics["render"]:.1f}',
+            f'view;dur={metrics["view"]:.1f}',
+            f'total;dur={metrics["total"]:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        performance = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': timer.count,
+            'db_ms': round(metrics['db'], 1),
+            'render_ms': round(metrics['render'], 1),
+            'view_ms': round(metrics['view'], 1),
+            'total_ms': round(metrics['total'], 1),
+        }
+        logger.info(
+            'method=%(method)s path=%(path)s view=%(view)s '
+            'status=%(status)s queries=%(queries)s db_ms=%(db_ms)s '
+            'render_ms=%(render_ms)s view_ms=%(view_ms)s '
+            'total_ms=%(total_ms)s',
+            performance,
+            extra={'performance': performance},
+        )
+
+        budget = get_query_budget(view_name)
+        if budget is not None and timer.count > budget:
+            logger.warning(
+                'Query budget exceeded: view=%s queries=%s budget=%s',
+                view_name,
+                timer.count,
+                budget,
+                extra={'performance': {**performance, 'budget': budget}},
+            )
+
+
+def is_sampled():
+    """Sorteia se a requisição atual será medida."""
+    sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 1.0)
+    return sample_rate >= 1 or (
+        sample_rate > 0 and random.random() < sample_rate
+    )
+
+
+def install_query_timer(stack, timer):
+    """
+    Instala `timer` em todas as conexões da thread atual; `stack` remove
+    os wrappers ao fechar.
+    """
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(timer))
+
+
+def get_query_budget(view_name):
+    """
+    Orçamento de queries da view (None quando não há limite).
+    """
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return getattr(settings, 'QUERY_BUDGET_DEFAULT', None) or None
@@ -1,6 +1,9 @@
+import importlib.util
+import tempfile
 from pathlib import Path
 
 from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -30,9 +33,12 @@ INSTALLED_APPS = [
     'profiles.apps.ProfilesConfig',
     'transactions',
     'users',
+    'core.apps.CoreConfig',
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its timings cover the whole request
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -66,9 +72,40 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Writers take the lock at BEGIN, where busy_timeout applies,
+            # instead of failing when a read transaction turns into a write
+            'transaction_mode': config(
+                'SQLITE_TRANSACTION_MODE',
+                default='IMMEDIATE',
+                cast=lambda value: value.upper() or None,
+            ),
+        },
     },
 }
 
+# Applied to every new SQLite connection (core.db); empty values are
+# skipped. WAL lets readers proceed while a worker writes, and
+# busy_timeout (ms) makes writers wait for the lock instead of failing
+# with "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),
+    # Negative values are KiB: 64 MiB of page cache per connection
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-65536, cast=int),
+    'temp_store': config('SQLITE_TEMP_STORE', default='MEMORY'),
+}
+
+# Seconds between pool metric lines (core.db.pool) when the PostgreSQL
+# connection pool is enabled in production; 0 disables them
+DB_POOL_STATS_INTERVAL = config(
+    'DB_POOL_STATS_INTERVAL',
+    default=60,
+    cast=float,
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': (
@@ -117,6 +154,119 @@ LOGOUT_REDIRECT_URL = '/'
 
 TAILWIND_APP_NAME = 'theme'
 
+# Cache backend: locmem (per process, development default), file or db
+# (shared by the workers of a single box; db needs `createcachetable`)
+# or redis (any Redis-compatible server; `redis` is in the production
+# requirements).
+# Without CACHE_BACKEND, REDIS_URL selects redis and production uses file.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config('CACHE_BACKEND', default='').lower()
+if not CACHE_BACKEND:
+    CACHE_BACKEND = (
+        'redis' if REDIS_URL else 'file' if IS_PRODUCTION else 'locmem'
+    )
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'finanpy'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        str(Path(tempfile.gettempdir()) / 'finanpy-cache'),
+    ),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'finanpy_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', REDIS_URL),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f'CACHE_BACKEND must be one of: {", ".join(CACHE_BACKENDS)}.',
+    )
+if CACHE_BACKEND == 'redis' and importlib.util.find_spec('redis') is None:
+    raise ImproperlyConfigured(
+        'The redis cache backend needs the `redis` package '
+        '(see requirements/production.txt).',
+    )
+
+CACHE_LOCATION = (
+    config('CACHE_LOCATION', default='')
+    or CACHE_BACKENDS[CACHE_BACKEND][1]
+)
+if not CACHE_LOCATION:
+    raise ImproperlyConfigured(
+        'REDIS_URL or CACHE_LOCATION must point to the cache.',
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': CACHE_LOCATION,
+        'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='finanpy'),
+    },
+}
+
+# Lifetime (seconds) of per-user versioned cache entries (core.cache)
+DATA_CACHE_TIMEOUT = config(
+    'DATA_CACHE_TIMEOUT',
+    default=60 * 60 * 24,
+    cast=int,
+)
+
+# Request timing (core.middleware): fraction of requests measured, with
+# Server-Timing headers and log lines; 0 disables it
+PERFORMANCE_SAMPLE_RATE = config(
+    'PERFORMANCE_SAMPLE_RATE',
+    default=1.0,
+    cast=float,
+)
+
+# Maximum queries per view (URL name, any method: create/update budgets
+# cover the POST that saves) before a warning is logged;
+# QUERY_BUDGET_DEFAULT applies to views not listed (0 disables)
+QUERY_BUDGETS = {
+    'dashboard': 8,
+    'dashboard_async': 8,
+    'dashboard_charts': 8,
+    'transactions:list': 9,
+    'transactions:create': 12,
+    'transactions:update': 13,
+}
+QUERY_BUDGET_DEFAULT = config(
+    'QUERY_BUDGET_DEFAULT',
+    default=20,
+    cast=int,
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.performance': {
+            'handlers': ['console'],
+            # Per-request lines (INFO) by default only in production;
+            # budget warnings always
+            'level': config(
+                'PERFORMANCE_LOG_LEVEL',
+                default='INFO' if IS_PRODUCTION else 'WARNING',
+            ),
+            'propagate': False,
+        },
+        'core.db.pool': {
+            'handlers': ['console'],
+            # Periodic metrics (INFO); waits and timeouts are WARNING
+            'level': config('DB_POOL_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Default categories created at signup; when unset, the table for
+# LANGUAGE_CODE in categories.defaults is used. Example:
+# DEFAULT_CATEGORIES = [
+#     {'name': 'Salário', 'category_type': 'income', 'color': '#10b981'},
+# ]
+
 SECURE_SSL_REDIRECT = config(
     'SECURE_SSL_REDIRECT',
     default=False,
@@ -25,9 +25,36 @@ if database_url:
     DATABASES['default'] = dj_database_url.parse(
         database_url,
         conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        # Check reused connections (or pooled ones) before handing them out
+        conn_health_checks=config(
+            'DB_CONN_HEALTH_CHECKS',
+            default=True,
+            cast=bool,
+        ),
         ssl_require=config('DB_SSL_REQUIRE', default=True, cast=bool),
     )
 
+    # Native psycopg 3 pool: each worker keeps warm connections instead of
+    # paying TLS and authentication on every new one
+    if (
+        DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+        and config('DB_POOL', default=True, cast=bool)
+    ):
+        # The pool replaces persistent connections (Django requires 0)
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Seconds a request waits for a free connection before failing
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=600, cast=float),
+            'max_lifetime': config(
+                'DB_POOL_MAX_LIFETIME',
+                default=3600,
+                cast=float,
+            ),
+        }
+
 STORAGES = {
     'default': {
         'BACKEND': 'django.core.files.storage.FileSystemStorage',
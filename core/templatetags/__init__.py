@@ -0,0 +1 @@
+# Template tags package for core app
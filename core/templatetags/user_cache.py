@@ -0,0 +1,59 @@
+"""
+Cache de fragmentos de template por usuário e versão dos dados.
+
+    {% load user_cache %}
+    {% usercache "resumo-contas" periodo %}
+        ... trecho caro ...
+    {% endusercache %}
+
+A chave segue `core.cache.user_cache_key` (namespace `fragment:<nome>`,
+id e `data_version` do usuário, demais argumentos), então o fragmento é
+recalculado sozinho quando os dados do usuário mudam. Não guarde trechos
+com token CSRF ou mensagens, que variam a cada requisição. Para usuários
+anônimos o bloco é apenas renderizado.
+"""
+from django import template
+from django.utils.safestring import mark_safe
+
+from core.cache import get_or_set_for_user
+
+register = template.Library()
+
+
+class UserCacheNode(template.Node):
+    """Renderiza o bloco uma vez por usuário, versão e argumentos."""
+
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        request = context.get('request')
+        user = getattr(request, 'user', None) or context.get('user')
+        if user is None or not user.is_authenticated:
+            return self.nodelist.render(context)
+
+        return mark_safe(get_or_set_for_user(
+            user,
+            f'fragment:{self.name.resolve(context)}',
+            [value.resolve(context) for value in self.vary_on],
+            lambda: self.nodelist.render(context),
+        ))
+
+
+@register.tag('usercache')
+def do_usercache(parser, token):
+    """`{% usercache nome [argumentos...] %}...{% endusercache %}`"""
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name.",
+        )
+    nodelist = parser.parse(('endusercache',))
+    parser.delete_first_token()
+    return UserCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
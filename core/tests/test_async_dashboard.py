@@ -0,0 +1,122 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Account
+from categories.models import Category
+from core.db import run_queries_concurrently
+from transactions.models import Transaction
+
+
+class RunQueriesConcurrentlyTests(SimpleTestCase):
+    """Garante que as consultas rodam ao mesmo tempo, em threads próprias."""
+
+    async def test_runs_in_parallel_and_keeps_order(self):
+        threads = []
+
+        def slow(value):
+            def run():
+                threads.append(threading.get_ident())
+                time.sleep(0.2)
+                return value
+            return run
+
+        start = time.perf_counter()
+        results = await run_queries_concurrently(
+            slow(1),
+            slow(2),
+            slow(3),
+        )
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, [1, 2, 3])
+        self.assertEqual(len(set(threads)), 3)
+        self.assertLess(elapsed, 0.5)
+
+
+class AsyncDashboardViewTests(TransactionTestCase):
+    """
+    Garante que a variante assíncrona entregue o mesmo dashboard.
+
+    TransactionTestCase: as consultas rodam em outras threads, com
+    conexões que só enxergam dados já gravados.
+    """
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='async_dashboard_user',
+            email='async_dashboard@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Principal',
+            bank_name='Banco Central',
+            balance=Decimal('0'),
+        )
+        Account.objects.create(
+            user=self.user,
+            name='Conta Inativa',
+            bank_name='Banco Antigo',
+            balance=Decimal('50'),
+            is_active=False,
+        )
+        for category_type, amount, description in (
+            (Category.INCOME, '1000.00', 'Salário mensal'),
+            (Category.EXPENSE, '400.00', 'Aluguel do mês'),
+        ):
+            Transaction.objects.create(
+                account=self.account,
+                category=Category.objects.filter(
+                    user=self.user,
+                    category_type=category_type,
+                ).first(),
+                transaction_type=category_type,
+                amount=Decimal(amount),
+                transaction_date=timezone.localdate(),
+                description=description,
+            )
+
+    async def test_matches_the_sync_dashboard(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('dashboard_async'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'dashboard.html')
+        context = response.context
+        self.assertEqual(context['total_balance'], Decimal('650.00'))
+        self.assertEqual(context['total_income_month'], Decimal('1000.00'))
+        self.assertEqual(context['total_expenses_month'], Decimal('400.00'))
+        self.assertEqual(context['month_balance'], Decimal('600.00'))
+        self.assertEqual(context['active_accounts_count'], 1)
+        self.assertEqual(
+            [tx.description for tx in context['recent_transactions']],
+            ['Aluguel do mês', 'Salário mensal'],
+        )
+        self.assertEqual(len(context['expenses_by_category']), 1)
+
+        # Computed again by the sync view, the payload is the same
+        cache.clear()
+        sync_response = await self.async_client.get(reverse('dashboard'))
+        for key in (
+            'total_balance',
+            'month_balance',
+            'income_by_category',
+            'expenses_by_category',
+        ):
+            self.assertEqual(sync_response.context[key], context[key])
+
+    async def test_anonymous_users_are_redirected_to_login(self):
+        response = await self.async_client.get(reverse('dashboard_async'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith('/auth/login/'))
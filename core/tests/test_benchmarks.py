@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import Account
+from benchmarks.views import (
+    SCENARIOS,
+    BenchmarkState,
+    compare_results,
+    measure,
+    percentile,
+)
+
+
+def _results(**metrics):
+    scenario = {
+        'p50_ms': 10.0,
+        'p95_ms': 20.0,
+        'mean_ms': 12.0,
+        'queries': 5,
+        'peak_kib': 300.0,
+    }
+    scenario.update(metrics)
+    return {'datasets': {'small': {'dashboard': scenario}}}
+
+
+class CompareResultsTests(SimpleTestCase):
+    """Garante a detecção de regressões contra a baseline."""
+
+    def test_percentile_interpolates(self):
+        values = [5, 1, 4, 2, 3]
+
+        self.assertEqual(percentile(values, 0.5), 3)
+        self.assertEqual(percentile(values, 0.95), 4.8)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_flags_each_regressed_metric(self):
+        regressions = compare_results(
+            _results(p95_ms=30.0, queries=6, peak_kib=400.0),
+            _results(),
+        )
+
+        self.assertEqual(len(regressions), 3)
+        self.assertIn('small / dashboard: queries 5 -> 6', regressions)
+
+    def test_tolerates_noise_and_new_scenarios(self):
+        current = _results(p95_ms=24.0, queries=4, peak_kib=370.0)
+        current['datasets']['large'] = _results()['datasets']['small']
+
+        self.assertEqual(compare_results(current, _results()), [])
+        self.assertEqual(
+            compare_results(_results(p95_ms=1.5), _results(p95_ms=1.0)),
+            [],
+        )
+
+
+class MeasureTests(TestCase):
+    """Garante que os cenários rodam e medem a requisição isolada."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='bench_user',
+            email='bench@example.com',
+            password='strong-pass-123',
+        )
+        Account.objects.create(
+            user=self.user,
+            name='Conta Benchmark',
+            bank_name='Banco',
+            balance=Decimal('100.00'),
+        )
+
+    def test_all_scenarios_run(self):
+        # The update flow needs an existing income to edit
+        create = next(
+            scenario for scenario in SCENARIOS
+            if scenario.name == 'transactions:create'
+        )
+        create.run(BenchmarkState(self.user))
+        state = BenchmarkState(self.user)
+
+        for scenario in SCENARIOS:
+            metrics = measure(scenario, state, iterations=2, warmup=0)
+            self.assertGreater(metrics['queries'], 0, scenario.name)
+            self.assertGreater(metrics['peak_kib'], 0, scenario.name)
+            self.assertLessEqual(metrics['p50_ms'], metrics['p95_ms'])
+
+    def test_cold_reads_skip_the_cache(self):
+        state = BenchmarkState(self.user)
+        scenarios = {scenario.name: scenario for scenario in SCENARIOS}
+
+        cold = measure(scenarios['dashboard'], state, iterations=2, warmup=0)
+        warm = measure(
+            scenarios['dashboard (cache)'],
+            state,
+            iterations=2,
+            warmup=1,
+        )
+
+        self.assertLess(warm['queries'], cold['queries'])
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase
+
+from core.cache import (
+    bump_data_version,
+    get_cache_stats,
+    get_or_set_for_user,
+    reset_cache_stats,
+)
+
+FRAGMENT = Template(
+    '{% load user_cache %}'
+    '{% usercache "saldo" period %}{{ counter.next }}{% endusercache %}'
+)
+
+
+class RenderCounter:
+    """Conta quantas vezes o fragmento foi de fato renderizado."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def next(self):
+        self.calls += 1
+        return self.calls
+
+
+class UserCacheTests(TestCase):
+    """Garante o cache versionado por usuário e seus contadores."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        reset_cache_stats()
+        self.addCleanup(reset_cache_stats)
+        self.user = get_user_model().objects.create_user(
+            username='cache_user',
+            email='cache@example.com',
+            password='strong-pass-123',
+        )
+        self.user.refresh_from_db()
+
+    def _render(self, user, period='2024-03', counter=None):
+        return FRAGMENT.render(Context({
+            'user': user,
+            'period': period,
+            'counter': counter or RenderCounter(),
+        }))
+
+    def test_counts_hits_and_misses_per_namespace(self):
+        for _ in range(3):
+            get_or_set_for_user(self.user, 'totals', ('2024',), lambda: 1)
+        get_or_set_for_user(self.user, 'other', (), lambda: 2)
+
+        self.assertEqual(get_cache_stats(), {
+            'other': {'hits': 0, 'misses': 1, 'hit_rate': 0.0},
+            'totals': {'hits': 2, 'misses': 1, 'hit_rate': 0.667},
+        })
+
+        reset_cache_stats()
+        self.assertEqual(get_cache_stats(), {})
+
+    def test_fragment_is_cached_per_version_and_arguments(self):
+        counter = RenderCounter()
+
+        self.assertEqual(self._render(self.user, counter=counter), '1')
+        self.assertEqual(self._render(self.user, counter=counter), '1')
+        self.assertEqual(
+            self._render(self.user, period='2024-04', counter=counter),
+            '2',
+        )
+
+        bump_data_version(user_ids=[self.user.pk])
+        self.user.refresh_from_db()
+        self.assertEqual(self._render(self.user, counter=counter), '3')
+        self.assertEqual(
+            get_cache_stats()['fragment:saldo'],
+            {'hits': 1, 'misses': 3, 'hit_rate': 0.25},
+        )
+
+    def test_anonymous_users_are_not_cached(self):
+        counter = RenderCounter()
+
+        self._render(AnonymousUser(), counter=counter)
+        self._render(AnonymousUser(), counter=counter)
+
+        self.assertEqual(counter.calls, 2)
+        self.assertEqual(get_cache_stats(), {})
+
+    def test_fragment_name_is_required(self):
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                '{% load user_cache %}{% usercache %}x{% endusercache %}'
+            )
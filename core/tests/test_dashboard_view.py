@@ -1,13 +1,20 @@
-from datetime import timedelta
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from accounts.models import Account
 from categories.models import Category
+from core.cache import get_cache_stats, reset_cache_stats
+from core.views import MONTH_NAMES_PT
 from transactions.models import Transaction
 
 
@@ -15,6 +22,8 @@ class DashboardViewTests(TestCase):
     """Garante que o dashboard entregue os resumos financeiros corretos."""
 
     def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username='dashboard_user',
             email='dashboard@example.com',
@@ -100,6 +109,27 @@ class DashboardViewTests(TestCase):
             + self.inactive_account.balance
         )
 
+    def test_month_follows_the_local_date(self):
+        Transaction.objects.create(
+            account=self.account,
+            category=self.income_category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('70.00'),
+            transaction_date=date(2024, 5, 31),
+            description='Fim de maio',
+        )
+        # 22:00 on May 31 in São Paulo, already June 1 in UTC
+        utc_now = datetime(2024, 6, 1, 1, 0, tzinfo=dt_timezone.utc)
+
+        with mock.patch('django.utils.timezone.now', return_value=utc_now):
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.context['current_month'], 'May 2024')
+        self.assertEqual(
+            response.context['total_income_month'],
+            Decimal('70.00'),
+        )
+
     def test_dashboard_context_includes_financial_summary(self):
         response = self.client.get(reverse('dashboard'))
 
@@ -138,11 +168,234 @@ class DashboardViewTests(TestCase):
             Decimal('400.00'),
         )
 
-        chart_data = response.context['chart_categories_data']
+    def test_charts_endpoint_returns_chart_data(self):
+        response = self.client.get(reverse('dashboard_charts'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        chart_data = response.json()['categories']
         self.assertEqual(chart_data['labels'], [self.expense_category.name])
         self.assertEqual(chart_data['values'], [400.0])
         self.assertEqual(chart_data['colors'], [self.expense_category.color])
 
+    def test_dashboard_balance_chart_reads_daily_snapshots(self):
+        response = self.client.get(reverse('dashboard_charts'))
+
+        balance_data = response.json()['balance']
+        self.assertEqual(len(balance_data['labels']), 30)
+        self.assertEqual(
+            balance_data['labels'][-1],
+            timezone.localdate().strftime('%d/%m'),
+        )
+        self.assertEqual(
+            balance_data['values'][0],
+            float(self.total_balance - Decimal('600.00')),
+        )
+        self.assertEqual(
+            balance_data['values'][-1],
+            float(self.total_balance),
+        )
+
+    def test_dashboard_query_count_does_not_grow_with_history(self):
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(reverse('dashboard'))
+
+        today = timezone.localdate()
+        for months_ago in range(1, 13):
+            Transaction.objects.create(
+                account=self.account,
+                category=self.expense_category,
+                transaction_type=Transaction.EXPENSE,
+                amount=Decimal('1.00'),
+                transaction_date=today - timedelta(days=30 * months_ago),
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(len(queries), len(baseline))
+        self.assertLessEqual(len(queries), 10)
+        self.assertEqual(
+            response.context['total_expenses_month'],
+            Decimal('400.00'),
+        )
+
+    def test_monthly_chart_period_is_selectable(self):
+        today = timezone.localdate()
+        Transaction.objects.create(
+            account=self.account,
+            category=self.income_category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('50.00'),
+            transaction_date=today.replace(day=1) - timedelta(days=400),
+        )
+
+        response = self.client.get(reverse('dashboard_charts'))
+        monthly_data = response.json()['monthly']
+        self.assertEqual(response.json()['months'], 6)
+        self.assertEqual(len(monthly_data['labels']), 6)
+        self.assertEqual(monthly_data['income'][-1], 1000.0)
+        self.assertEqual(monthly_data['expenses'][-1], 400.0)
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as six_months:
+            self.client.get(reverse('dashboard_charts'))
+        with CaptureQueriesContext(connection) as five_years:
+            response = self.client.get(
+                reverse('dashboard_charts'),
+                {'months': 60},
+            )
+
+        self.assertEqual(len(five_years), len(six_months))
+        monthly_data = response.json()['monthly']
+        self.assertEqual(len(monthly_data['labels']), 60)
+        self.assertEqual(
+            monthly_data['labels'][-1],
+            MONTH_NAMES_PT[today.month] + today.strftime('/%y'),
+        )
+        self.assertEqual(sum(monthly_data['income']), 1050.0)
+        self.assertEqual(sum(monthly_data['expenses']), 500.0)
+
+        response = self.client.get(reverse('dashboard_charts'), {'months': 7})
+        self.assertEqual(response.json()['months'], 6)
+
+        response = self.client.get(reverse('dashboard'), {'months': 24})
+        self.assertEqual(response.context['chart_months'], 24)
+        self.assertContains(
+            response,
+            reverse('dashboard_charts') + '?months=24',
+        )
+
+    def test_charts_endpoint_revalidates_with_etag(self):
+        response = self.client.get(reverse('dashboard_charts'))
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('dashboard_charts'),
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'transactions_' in query['sql']
+            or 'accounts_' in query['sql']
+        ])
+
+        Transaction.objects.create(
+            account=self.account,
+            category=self.expense_category,
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal('25.00'),
+            transaction_date=timezone.localdate(),
+        )
+
+        response = self.client.get(
+            reverse('dashboard_charts'),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['categories']['values'], [425.0])
+
+    def test_dashboard_page_does_not_embed_chart_data(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertNotContains(response, 'chart-monthly-data')
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'accounts_accountdailybalance' in query['sql']
+        ])
+
+    def test_dashboard_is_served_from_cache_until_data_changes(self):
+        self.client.get(reverse('dashboard'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'transactions_' in query['sql']
+            or 'accounts_' in query['sql']
+        ])
+        self.assertEqual(
+            response.context['total_expenses_month'],
+            Decimal('400.00'),
+        )
+
+        Transaction.objects.create(
+            account=self.account,
+            category=self.expense_category,
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal('25.00'),
+            transaction_date=timezone.localdate(),
+        )
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(
+            response.context['total_expenses_month'],
+            Decimal('425.00'),
+        )
+
+    def test_dashboard_lists_fragment_is_cached(self):
+        reset_cache_stats()
+        self.addCleanup(reset_cache_stats)
+
+        self.client.get(reverse('dashboard'))
+        response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(
+            get_cache_stats()['fragment:dashboard-lists'],
+            {'hits': 1, 'misses': 1, 'hit_rate': 0.5},
+        )
+        self.assertContains(response, 'Aluguel do mês')
+
+    def test_account_and_category_changes_bump_data_version(self):
+        version = self._data_version()
+
+        self.extra_account.name = 'Conta Reserva Renomeada'
+        self.extra_account.save()
+        self.assertEqual(self._data_version(), version + 1)
+
+        self.expense_category.color = '#000000'
+        self.expense_category.save()
+        self.assertEqual(self._data_version(), version + 2)
+
+        self.inactive_account.delete()
+        self.assertEqual(self._data_version(), version + 3)
+
+    def test_description_change_bumps_data_version(self):
+        transaction = Transaction.objects.filter(
+            account=self.account,
+        ).first()
+        version = self._data_version()
+
+        transaction.description = 'Nova descrição'
+        transaction.save()
+
+        self.assertEqual(self._data_version(), version + 1)
+
+    def test_user_save_does_not_overwrite_data_version(self):
+        stale_user = get_user_model().objects.get(pk=self.user.pk)
+        version = self._data_version()
+
+        self.account.name = 'Conta Principal Renomeada'
+        self.account.save()
+        stale_user.first_name = 'Nome'
+        stale_user.save()
+
+        self.assertEqual(self._data_version(), version + 1)
+
+    def _data_version(self):
+        return get_user_model().objects.values_list(
+            'data_version',
+            flat=True,
+        ).get(pk=self.user.pk)
+
 
 class LoginRequiredViewTests(TestCase):
     """Garante que páginas sensíveis exigem autenticação."""
@@ -153,6 +406,11 @@ class LoginRequiredViewTests(TestCase):
         self.assertTrue(response.url.startswith('/auth/login/'))
         self.assertIn('next=/dashboard/', response.url)
 
+    def test_dashboard_charts_requires_authentication(self):
+        response = self.client.get(reverse('dashboard_charts'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith('/auth/login/'))
+
     def test_accounts_list_requires_authentication(self):
         response = self.client.get(reverse('accounts:list'))
         self.assertEqual(response.status_code, 302)
@@ -0,0 +1,136 @@
+import sqlite3
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import db
+from core.db import (
+    apply_pragmas,
+    collect_pool_stats,
+    configure_sqlite,
+    pragma_statements,
+    report_pool_stats,
+)
+
+
+class SqlitePragmaTests(SimpleTestCase):
+    """Garante a montagem e a aplicação dos pragmas do SQLite."""
+
+    def test_builds_statements_and_skips_empty_values(self):
+        statements = pragma_statements({
+            'journal_mode': 'WAL',
+            'busy_timeout': 5000,
+            'cache_size': -65536,
+            'mmap_size': '',
+            'temp_store': None,
+        })
+
+        self.assertEqual(statements, [
+            'PRAGMA journal_mode = WAL',
+            'PRAGMA busy_timeout = 5000',
+            'PRAGMA cache_size = -65536',
+        ])
+
+    def test_rejects_unsafe_values(self):
+        for pragmas in (
+            {'journal_mode': 'WAL; DROP TABLE x'},
+            {'busy timeout': 5000},
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                pragma_statements(pragmas)
+
+    def test_applies_to_a_dbapi_connection(self):
+        dbapi_connection = sqlite3.connect(':memory:')
+        self.addCleanup(dbapi_connection.close)
+
+        apply_pragmas(dbapi_connection, {
+            'busy_timeout': 1234,
+            'temp_store': 'MEMORY',
+        })
+
+        self.assertEqual(
+            dbapi_connection.execute('PRAGMA busy_timeout').fetchone(),
+            (1234,),
+        )
+        self.assertEqual(
+            dbapi_connection.execute('PRAGMA temp_store').fetchone(),
+            (2,),
+        )
+
+    def test_ignores_other_databases(self):
+        other = mock.Mock(vendor='postgresql')
+
+        configure_sqlite(sender=None, connection=other)
+
+        other.connection.execute.assert_not_called()
+
+
+class SqliteConnectionTests(TestCase):
+    """Garante que as conexões do Django recebem os pragmas."""
+
+    def test_connection_created_applies_settings(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone(), (5000,))
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL
+            self.assertEqual(cursor.fetchone(), (1,))
+
+
+def _pooled_connection(**stats):
+    pooled = mock.Mock(alias='default')
+    pooled.pool.pop_stats.return_value = {
+        'pool_size': 5,
+        'pool_available': 2,
+        'requests_waiting': 0,
+        'requests_num': 4,
+        'requests_wait_ms': 10,
+        **stats,
+    }
+    return pooled
+
+
+class PoolStatsTests(SimpleTestCase):
+    """Garante as métricas do pool de conexões do PostgreSQL."""
+
+    def setUp(self):
+        db._last_report = None
+        self.addCleanup(setattr, db, '_last_report', None)
+
+    def test_collects_usage_and_acquisition_latency(self):
+        self.assertEqual(collect_pool_stats(_pooled_connection()), {
+            'alias': 'default',
+            'size': 5,
+            'in_use': 3,
+            'available': 2,
+            'waiting': 0,
+            'requests': 4,
+            'queued': 0,
+            'errors': 0,
+            'acquire_avg_ms': 2.5,
+        })
+        self.assertIsNone(collect_pool_stats(mock.Mock(pool=None)))
+
+    def test_logs_once_per_interval(self):
+        pooled = _pooled_connection(requests_waiting=3)
+
+        with mock.patch.object(db, 'connections') as handler:
+            handler.all.return_value = [pooled]
+            with self.assertLogs('core.db.pool', 'INFO') as logs:
+                report_pool_stats()
+                report_pool_stats()
+
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.levelname, 'WARNING')
+        self.assertEqual(record.pool['in_use'], 3)
+        handler.all.assert_called_once_with(initialized_only=True)
+
+    @override_settings(DB_POOL_STATS_INTERVAL=0)
+    def test_interval_zero_disables_reports(self):
+        with mock.patch.object(db, 'connections') as handler:
+            report_pool_stats()
+
+        handler.all.assert_not_called()
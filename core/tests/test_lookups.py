@@ -0,0 +1,152 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Account
+from categories.models import Category
+from core.lookups import UserLookups
+from transactions.forms import TransactionForm
+
+
+class UserLookupsTests(TestCase):
+    """Garante o carregamento único de contas e categorias do usuário."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='lookups_user',
+            email='lookups@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Ativa',
+            bank_name='Banco',
+            balance=Decimal('100.00'),
+        )
+        self.inactive_account = Account.objects.create(
+            user=self.user,
+            name='Conta Inativa',
+            bank_name='Banco',
+            balance=Decimal('0'),
+            is_active=False,
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username='lookups_other',
+            email='lookups_other@example.com',
+            password='strong-pass-123',
+        )
+        self.other_account = Account.objects.create(
+            user=self.other_user,
+            name='Conta Alheia',
+            bank_name='Banco',
+            balance=Decimal('0'),
+        )
+        self.user.refresh_from_db()
+
+    def test_loads_once_and_reuses_the_versioned_cache(self):
+        lookups = UserLookups(self.user)
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                list(lookups.active_accounts),
+                [self.account.pk],
+            )
+            lookups.categories
+            lookups.get_account(self.account.pk)
+
+        with self.assertNumQueries(0):
+            UserLookups(self.user).categories
+
+        Category.objects.create(
+            user=self.user,
+            name='Nova Categoria',
+            category_type=Category.EXPENSE,
+        )
+        self.user.refresh_from_db()
+        names = [
+            category.name
+            for category in UserLookups(self.user).categories.values()
+        ]
+        self.assertIn('Nova Categoria', names)
+        self.assertEqual(names, sorted(names))
+
+    def test_ownership_checks(self):
+        lookups = UserLookups(self.user)
+
+        self.assertEqual(lookups.get_account(self.account.pk), self.account)
+        self.assertEqual(lookups.get_account(str(self.account.pk)),
+                         self.account)
+        self.assertIsNone(lookups.get_account(self.other_account.pk))
+        self.assertIsNone(lookups.get_account('abc'))
+        self.assertIsNone(lookups.get_account(self.inactive_account.pk))
+        self.assertEqual(
+            lookups.get_account(self.inactive_account.pk, active_only=False),
+            self.inactive_account,
+        )
+        other_category = self.other_user.categories.first()
+        self.assertIsNone(lookups.get_category(other_category.pk))
+
+    def test_form_validates_choices_from_memory(self):
+        lookups = UserLookups(self.user)
+        category = self.user.categories.filter(
+            category_type=Category.EXPENSE,
+        ).first()
+        data = {
+            'account': self.other_account.pk,
+            'category': category.pk,
+            'transaction_type': 'expense',
+            'amount': '10.00',
+            'transaction_date': '2024-01-10',
+        }
+        lookups.categories
+
+        with self.assertNumQueries(0):
+            form = TransactionForm(data=data, lookups=lookups)
+            self.assertFalse(form.is_valid())
+            self.assertIn('account', form.errors)
+
+        data['account'] = self.account.pk
+        form = TransactionForm(data=data, lookups=lookups)
+        # Only the balance check of the expense reads the database
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid(), form.errors)
+        with self.assertNumQueries(0):
+            self.assertEqual(form.cleaned_data['account'], self.account)
+            form.as_p()
+
+    def test_views_stop_querying_accounts_and_categories(self):
+        self.client.force_login(self.user)
+        for url in (
+            reverse('transactions:create'),
+            reverse('transactions:list'),
+        ):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse([
+                query['sql'] for query in queries.captured_queries
+                if 'FROM "accounts_account"' in query['sql']
+                or 'FROM "categories_category"' in query['sql']
+            ])
+
+    def test_form_only_lists_the_users_categories(self):
+        Category.objects.create(
+            user=self.other_user,
+            name='Categoria Alheia',
+            category_type=Category.EXPENSE,
+        )
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('transactions:create'))
+
+        self.assertContains(response, 'Alimentação')
+        self.assertNotContains(response, 'Categoria Alheia')
+        self.assertNotContains(response, 'Conta Alheia')
@@ -0,0 +1,119 @@
+from decimal import Decimal
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Account
+from core.middleware import RequestTimingMiddleware
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    """Garante as métricas de custo por requisição."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='timing_user',
+            email='timing@example.com',
+            password='strong-pass-123',
+        )
+        Account.objects.create(
+            user=self.user,
+            name='Conta Timing',
+            bank_name='Banco',
+            balance=Decimal('0'),
+        )
+        self.client.force_login(self.user)
+
+    def _metrics(self, response):
+        metrics = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+    def test_emits_server_timing_and_log_line(self):
+        with self.assertLogs('core.performance', 'INFO') as logs:
+            response = self.client.get(reverse('transactions:list'))
+
+        metrics = self._metrics(response)
+        self.assertEqual(
+            set(metrics),
+            {'db', 'render', 'view', 'total'},
+        )
+        self.assertGreater(float(metrics['render']['dur']), 0)
+
+        performance = logs.records[0].performance
+        self.assertEqual(performance['view'], 'transactions:list')
+        self.assertEqual(performance['status'], 200)
+        self.assertGreater(performance['queries'], 0)
+        self.assertEqual(
+            metrics['db']['desc'],
+            f'"{performance["queries"]} queries"',
+        )
+        self.assertIn('queries=', logs.output[0])
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        with self.assertNoLogs('core.performance'):
+            response = self.client.get(reverse('transactions:list'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(
+        PERFORMANCE_SAMPLE_RATE=1.0,
+        QUERY_BUDGETS={'transactions:list': 1},
+    )
+    def test_warns_when_query_budget_is_exceeded(self):
+        with self.assertLogs('core.performance', 'WARNING') as logs:
+            self.client.get(reverse('transactions:list'))
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('view=transactions:list', logs.output[0])
+        self.assertEqual(logs.records[0].performance['budget'], 1)
+
+    @override_settings(
+        PERFORMANCE_SAMPLE_RATE=1.0,
+        QUERY_BUDGETS={},
+        QUERY_BUDGET_DEFAULT=None,
+    )
+    def test_no_warning_without_budget(self):
+        with self.assertLogs('core.performance', 'INFO') as logs:
+            self.client.get(reverse('transactions:list'))
+
+        self.assertEqual(
+            [record.levelname for record in logs.records],
+            ['INFO'],
+        )
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+    async def test_async_chain_counts_orm_queries(self):
+        async def get_response(request):
+            await Account.objects.filter(user=self.user).acount()
+            await sync_to_async(Account.objects.exists)()
+            return HttpResponse('ok')
+
+        middleware = RequestTimingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        with self.assertLogs('core.performance', 'INFO') as logs:
+            response = await middleware(RequestFactory().get('/'))
+
+        self.assertEqual(logs.records[0].performance['queries'], 2)
+        self.assertEqual(
+            self._metrics(response)['db']['desc'],
+            '"2 queries"',
+        )
+
+        # The wrappers are removed once the request ends
+        wrappers = await sync_to_async(
+            lambda: connection.execute_wrappers,
+        )()
+        self.assertEqual(wrappers, [])
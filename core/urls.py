@@ -18,7 +18,11 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-from core.views import DashboardView
+from core.views import (
+    AsyncDashboardView,
+    DashboardChartsView,
+    DashboardView,
+)
 from users.views import HomeView
 
 urlpatterns = [
@@ -26,6 +30,17 @@ urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     # Dashboard URL
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    # Async variant (ASGI): runs the dashboard queries concurrently
+    path(
+        'dashboard/async/',
+        AsyncDashboardView.as_view(),
+        name='dashboard_async',
+    ),
+    path(
+        'dashboard/api/charts/',
+        DashboardChartsView.as_view(),
+        name='dashboard_charts',
+    ),
     # Authentication URLs
     path('auth/', include('users.urls')),
     # Profile URLs
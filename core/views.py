@@ -3,19 +3,214 @@ from datetime import timedelta
 
 # Django
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Sum
+from django.contrib.auth.views import redirect_to_login
+from django.db.models import Count, Q, Sum
+from django.http import JsonResponse
 from django.utils import timezone
-from django.views.generic import TemplateView
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.generic import TemplateView, View
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
 
 # Local imports
+from accounts.history import balance_history
 from accounts.models import Account
-from transactions.models import Transaction
+from core.cache import (
+    aget_or_set_for_user,
+    get_or_set_for_user,
+    user_cache_key,
+)
+from core.db import run_queries_concurrently
+from transactions.models import MonthlySummary, Transaction
+
+# Days shown in the balance history chart
+BALANCE_HISTORY_DAYS = 30
+
+# Periods (in months) offered by the income vs expenses chart
+CHART_MONTH_OPTIONS = (6, 12, 24, 60)
+DEFAULT_CHART_MONTHS = 6
+
+# Portuguese month abbreviations mapping
+MONTH_NAMES_PT = {
+    1: 'Jan',
+    2: 'Fev',
+    3: 'Mar',
+    4: 'Abr',
+    5: 'Mai',
+    6: 'Jun',
+    7: 'Jul',
+    8: 'Ago',
+    9: 'Set',
+    10: 'Out',
+    11: 'Nov',
+    12: 'Dez',
+}
+
+
+def add_months(month_start, months):
+    """
+    Desloca o primeiro dia de um mês em `months` meses (pode ser negativo).
+    """
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return month_start.replace(
+        year=month_index // 12,
+        month=month_index % 12 + 1,
+    )
+
+
+def get_month_start(today):
+    """
+    Retorna a data do primeiro dia do mês de `today` (data local, ver
+    `timezone.localdate()`).
+    """
+    return today.replace(day=1)
+
+
+def get_chart_months(request):
+    """
+    Retorna o período do gráfico mensal informado em ?months=.
+
+    Valores fora de CHART_MONTH_OPTIONS usam o padrão (6 meses).
+    """
+    try:
+        months = int(request.GET.get('months', ''))
+    except ValueError:
+        return DEFAULT_CHART_MONTHS
+
+    if months in CHART_MONTH_OPTIONS:
+        return months
+    return DEFAULT_CHART_MONTHS
+
+
+def month_categories_queryset(user, month_start):
+    """
+    Totais do mês por categoria (rollup), em ordem decrescente de total.
+    """
+    return MonthlySummary.objects.filter(
+        user=user,
+        year_month=month_start,
+    ).values(
+        'transaction_type',
+        'total',
+        'category__name',
+        'category__color',
+    ).order_by('-total')
+
+
+def split_month_categories(month_summaries):
+    """
+    Separa os totais por categoria em entradas e saídas.
+
+    Returns:
+        tuple: (entradas, saídas), listas de dicionários com
+        `transaction_type`, `total`, `category__name` e `category__color`
+        em ordem decrescente de total
+    """
+    income_by_category = []
+    expenses_by_category = []
+    for summary in month_summaries:
+        if summary['transaction_type'] == Transaction.INCOME:
+            income_by_category.append(summary)
+        else:
+            expenses_by_category.append(summary)
+    return income_by_category, expenses_by_category
+
+
+def get_month_categories(user, month_start):
+    """
+    Totais do mês por categoria, separados em entradas e saídas.
+
+    Returns:
+        tuple: (entradas, saídas), ver `split_month_categories`
+    """
+    return split_month_categories(
+        month_categories_queryset(user, month_start),
+    )
+
+
+def get_account_totals(user):
+    """Saldo total e quantidade de contas ativas num único agregado."""
+    return Account.objects.filter(user=user).aggregate(
+        total=Sum('balance'),
+        active=Count('pk', filter=Q(is_active=True)),
+    )
+
+
+def get_recent_transactions(user, limit=10):
+    """Últimas transações do usuário, com conta e categoria."""
+    return list(Transaction.objects.filter(
+        user=user
+    ).select_related(
+        'account',
+        'category'
+    ).order_by(
+        '-transaction_date',
+        '-created_at'
+    )[:limit])
+
+
+def build_dashboard_data(account_totals, month_summaries, recent_transactions):
+    """
+    Monta o payload do dashboard a partir dos resultados das consultas.
+
+    Returns:
+        dict: Valores do contexto, apenas tipos serializáveis (as
+        transações recentes já materializadas em lista)
+    """
+    income_by_category, expenses_by_category = split_month_categories(
+        month_summaries,
+    )
+
+    total_income_month = sum(
+        summary['total'] for summary in income_by_category
+    )
+    total_expenses_month = sum(
+        summary['total'] for summary in expenses_by_category
+    )
+
+    return {
+        'total_balance': account_totals['total'] or 0,
+        'total_income_month': total_income_month,
+        'total_expenses_month': total_expenses_month,
+        # Month balance (income - expenses)
+        'month_balance': total_income_month - total_expenses_month,
+        'recent_transactions': recent_transactions,
+        'income_by_category': income_by_category,
+        'expenses_by_category': expenses_by_category,
+        'active_accounts_count': account_totals['active'],
+    }
+
+
+def get_dashboard_page_context(request, now):
+    """Valores do dashboard que não vêm do cache (mês e período)."""
+    return {
+        'current_month': now.strftime('%B %Y'),
+        'chart_months': get_chart_months(request),
+        'chart_month_options': CHART_MONTH_OPTIONS,
+    }
+
+
+def charts_etag(request, *args, **kwargs):
+    """
+    ETag dos gráficos: muda com a versão dos dados, o dia e o período.
+    """
+    return user_cache_key(
+        request.user,
+        'dashboard-charts',
+        timezone.localdate().isoformat(),
+        get_chart_months(request),
+    )
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
     """
     Dashboard principal do usuário com resumo financeiro.
     Exibe saldos, transações recentes e estatísticas do mês.
+
+    A página traz apenas os cards e listas, lidos de `MonthlySummary` e
+    de um agregado das contas; os gráficos são buscados depois da
+    primeira renderização em `DashboardChartsView`.
     """
     template_name = 'dashboard.html'
     login_url = '/auth/login/'
@@ -23,96 +218,140 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         """
         Adiciona dados financeiros do usuário ao contexto do template.
+
+        O payload é guardado no cache por usuário, versão dos dados e mês
+        (ver `core.cache`); qualquer mudança em transações, contas ou
+        categorias gera uma chave nova.
         """
         context = super().get_context_data(**kwargs)
 
-        # Get current user
         user = self.request.user
+        # Local time: near midnight the UTC date is already the next day
+        now = timezone.localtime()
+        current_month_start = get_month_start(now.date())
 
-        # Get current month start and end dates
-        now = timezone.now()
-        current_month_start = now.replace(
-            day=1,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0,
+        context.update(get_or_set_for_user(
+            user,
+            'dashboard',
+            (current_month_start.isoformat(),),
+            lambda: self.get_dashboard_data(user, current_month_start),
+        ))
+        context.update(get_dashboard_page_context(self.request, now))
+
+        return context
+
+    def get_dashboard_data(self, user, current_month_start):
+        """
+        Calcula os totais do mês, saldos e transações recentes.
+
+        Returns:
+            dict: Ver `build_dashboard_data`
+        """
+        return build_dashboard_data(
+            get_account_totals(user),
+            list(month_categories_queryset(user, current_month_start)),
+            get_recent_transactions(user),
+        )
+
+
+class AsyncDashboardView(TemplateResponseMixin, ContextMixin, View):
+    """
+    Variante assíncrona de `DashboardView`, para servidores ASGI.
+
+    Mesmo template e mesmo payload em cache; numa falha de cache, o
+    agregado das contas, os totais do mês por categoria e as transações
+    recentes são consultados ao mesmo tempo (`run_queries_concurrently`),
+    então a latência fica perto da consulta mais lenta, não da soma.
+    Sob WSGI a view funciona, mas sem esse ganho.
+    """
+    template_name = 'dashboard.html'
+    login_url = '/auth/login/'
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Renderiza o dashboard do usuário autenticado.
+        """
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path(), self.login_url)
+
+        now = timezone.localtime()
+        current_month_start = get_month_start(now.date())
+
+        context = self.get_context_data(**kwargs)
+        context.update(await aget_or_set_for_user(
+            user,
+            'dashboard',
+            (current_month_start.isoformat(),),
+            lambda: self.get_dashboard_data(user, current_month_start),
+        ))
+        context.update(get_dashboard_page_context(request, now))
+        return self.render_to_response(context)
+
+    async def get_dashboard_data(self, user, current_month_start):
+        """
+        Executa as três consultas do dashboard em paralelo.
+
+        Returns:
+            dict: Ver `build_dashboard_data`
+        """
+        account_totals, month_summaries, recent_transactions = (
+            await run_queries_concurrently(
+                lambda: get_account_totals(user),
+                lambda: list(
+                    month_categories_queryset(user, current_month_start),
+                ),
+                lambda: get_recent_transactions(user),
+            )
+        )
+        return build_dashboard_data(
+            account_totals,
+            month_summaries,
+            recent_transactions,
         )
 
-        # Calculate total balance from all user accounts
-        total_balance = Account.objects.filter(
-            user=user
-        ).aggregate(
-            total=Sum('balance')
-        )['total'] or 0
-
-        # Calculate total income for current month
-        total_income_month = Transaction.objects.filter(
-            account__user=user,
-            transaction_type=Transaction.INCOME,
-            transaction_date__gte=current_month_start.date()
-        ).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-
-        # Calculate total expenses for current month
-        total_expenses_month = Transaction.objects.filter(
-            account__user=user,
-            transaction_type=Transaction.EXPENSE,
-            transaction_date__gte=current_month_start.date()
-        ).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-
-        # Calculate month balance (income - expenses)
-        month_balance = total_income_month - total_expenses_month
-
-        # Get last 10 transactions ordered by date
-        recent_transactions = Transaction.objects.filter(
-            account__user=user
-        ).select_related(
-            'account',
-            'category'
-        ).order_by(
-            '-transaction_date',
-            '-created_at'
-        )[:10]
-
-        # Calculate totals by category for current month
-        # Income categories
-        income_by_category = Transaction.objects.filter(
-            account__user=user,
-            transaction_type=Transaction.INCOME,
-            transaction_date__gte=current_month_start.date()
-        ).values(
-            'category__name',
-            'category__color'
-        ).annotate(
-            total=Sum('amount')
-        ).order_by('-total')
-
-        # Expense categories
-        expenses_by_category = Transaction.objects.filter(
-            account__user=user,
-            transaction_type=Transaction.EXPENSE,
-            transaction_date__gte=current_month_start.date()
-        ).values(
-            'category__name',
-            'category__color'
-        ).annotate(
-            total=Sum('amount')
-        ).order_by('-total')
-
-        # Count active accounts
-        active_accounts_count = Account.objects.filter(
-            user=user,
-            is_active=True
-        ).count()
-
-        # ========================================
-        # Chart.js Data Preparation
-        # ========================================
 
+@method_decorator(cache_control(private=True, no_cache=True), name='get')
+class DashboardChartsView(LoginRequiredMixin, View):
+    """
+    Dados dos gráficos do dashboard em JSON.
+
+    Buscado pela página depois da primeira renderização. A resposta tem
+    um ETag derivado da versão dos dados do usuário (ver `core.cache`),
+    então revalidações sem mudanças retornam 304 sem nenhuma query.
+    """
+    login_url = '/auth/login/'
+
+    @method_decorator(condition(etag_func=charts_etag))
+    def get(self, request, *args, **kwargs):
+        """
+        Retorna os dados de pizza, evolução mensal e saldo em JSON.
+        """
+        user = request.user
+        today = timezone.localdate()
+        chart_months = get_chart_months(request)
+
+        data = get_or_set_for_user(
+            user,
+            'dashboard-charts',
+            (today.isoformat(), chart_months),
+            lambda: self.get_chart_data(
+                user,
+                get_month_start(today),
+                today,
+                chart_months,
+            ),
+        )
+        return JsonResponse(data)
+
+    def get_chart_data(self, user, current_month_start, today, chart_months):
+        """
+        Monta os dados dos três gráficos do dashboard.
+
+        Returns:
+            dict: `categories`, `monthly` e `balance` no formato esperado
+            pelo Chart.js, mais o período `months`
+        """
         # 1. Pie Chart: Expenses by category for current month
         # Prepare data for Chart.js pie chart (categories, values, colors)
         chart_categories_data = {
@@ -121,6 +360,10 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             'colors': [],
         }
 
+        _, expenses_by_category = get_month_categories(
+            user,
+            current_month_start,
+        )
         for category_data in expenses_by_category:
             chart_categories_data['labels'].append(
                 category_data['category__name']
@@ -132,16 +375,31 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 category_data['category__color']
             )
 
-        # 2. Line Chart: Income vs Expenses for last 6 months
-        # Calculate start date for 6 months ago
-        six_months_ago = now - timedelta(days=180)
-        first_day_six_months_ago = six_months_ago.replace(
-            day=1,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0,
+        # 2. Line Chart: Income vs Expenses for the last N months
+        # (current month included), selectable through ?months=
+        first_chart_month = add_months(
+            current_month_start,
+            -(chart_months - 1),
         )
+        # Income and expenses per month for the whole window in one query
+        monthly_totals = {
+            row['year_month']: row
+            for row in MonthlySummary.objects.filter(
+                user=user,
+                year_month__gte=first_chart_month,
+            ).values(
+                'year_month',
+            ).annotate(
+                income=Sum(
+                    'total',
+                    filter=Q(transaction_type=Transaction.INCOME),
+                ),
+                expenses=Sum(
+                    'total',
+                    filter=Q(transaction_type=Transaction.EXPENSE),
+                ),
+            ).order_by()
+        }
 
         # Prepare data structure for monthly evolution
         chart_monthly_data = {
@@ -150,82 +408,39 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             'expenses': [],
         }
 
-        # Portuguese month abbreviations mapping
-        month_names_pt = {
-            1: 'Jan',
-            2: 'Fev',
-            3: 'Mar',
-            4: 'Abr',
-            5: 'Mai',
-            6: 'Jun',
-            7: 'Jul',
-            8: 'Ago',
-            9: 'Set',
-            10: 'Out',
-            11: 'Nov',
-            12: 'Dez',
-        }
-
-        # Iterate through last 6 months
-        current_date = first_day_six_months_ago
-        for i in range(6):
-            # Calculate month boundaries
-            month_start = current_date.replace(day=1)
-            if month_start.month == 12:
-                month_end = month_start.replace(
-                    year=month_start.year + 1,
-                    month=1,
-                    day=1,
-                )
-            else:
-                month_end = month_start.replace(
-                    month=month_start.month + 1,
-                    day=1,
-                )
-
-            # Get month name in Portuguese
-            month_label = month_names_pt[month_start.month]
+        # Fill every month of the window; months without rows are zero
+        for offset in range(chart_months):
+            month_start = add_months(first_chart_month, offset)
+            month_label = MONTH_NAMES_PT[month_start.month]
+            if chart_months > 12:
+                month_label = f'{month_label}/{month_start:%y}'
             chart_monthly_data['labels'].append(month_label)
 
-            # Calculate income for this month
-            income_total = Transaction.objects.filter(
-                account__user=user,
-                transaction_type=Transaction.INCOME,
-                transaction_date__gte=month_start.date(),
-                transaction_date__lt=month_end.date(),
-            ).aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-
-            # Calculate expenses for this month
-            expenses_total = Transaction.objects.filter(
-                account__user=user,
-                transaction_type=Transaction.EXPENSE,
-                transaction_date__gte=month_start.date(),
-                transaction_date__lt=month_end.date(),
-            ).aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-
-            chart_monthly_data['income'].append(float(income_total))
-            chart_monthly_data['expenses'].append(float(expenses_total))
-
-            # Move to next month
-            current_date = month_end
-
-        # Add all data to context
-        context.update({
-            'total_balance': total_balance,
-            'total_income_month': total_income_month,
-            'total_expenses_month': total_expenses_month,
-            'month_balance': month_balance,
-            'recent_transactions': recent_transactions,
-            'income_by_category': income_by_category,
-            'expenses_by_category': expenses_by_category,
-            'active_accounts_count': active_accounts_count,
-            'current_month': now.strftime('%B %Y'),
-            'chart_categories_data': chart_categories_data,
-            'chart_monthly_data': chart_monthly_data,
-        })
+            totals = monthly_totals.get(month_start, {})
+            chart_monthly_data['income'].append(
+                float(totals.get('income') or 0)
+            )
+            chart_monthly_data['expenses'].append(
+                float(totals.get('expenses') or 0)
+            )
+
+        # 3. Line Chart: Total balance over the last 30 days
+        # Read from the daily balance snapshots (one range scan)
+        chart_balance_data = {
+            'labels': [],
+            'values': [],
+        }
+        for day, balance in balance_history(
+            Account.objects.filter(user=user),
+            today - timedelta(days=BALANCE_HISTORY_DAYS - 1),
+            today,
+        ):
+            chart_balance_data['labels'].append(day.strftime('%d/%m'))
+            chart_balance_data['values'].append(float(balance))
 
-        return context
+        return {
+            'categories': chart_categories_data,
+            'monthly': chart_monthly_data,
+            'balance': chart_balance_data,
+            'months': chart_months,
+        }
@@ -17,9 +17,12 @@ def create_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_profile(sender, instance, **kwargs):
+def save_profile(sender, instance, created, **kwargs):
     """
     Salva o Profile sempre que o User é salvo.
+
+    Na criação o Profile acabou de ser inserido por `create_profile` e
+    não é salvo de novo.
     """
-    if hasattr(instance, 'profile'):
+    if not created and hasattr(instance, 'profile'):
         instance.profile.save()
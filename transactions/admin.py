@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .balances import defer_balance_updates
 from .models import Transaction
 
 
@@ -62,13 +63,13 @@ class TransactionAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
 
         # Otimiza queries com select_related
-        qs = qs.select_related('account', 'category', 'account__user')
+        qs = qs.select_related('account', 'category')
 
         if request.user.is_superuser:
             return qs
 
-        # Filtra por transações das contas do usuário
-        return qs.filter(account__user=request.user)
+        # Filtra pelo dono da transação (sem join com as contas)
+        return qs.filter(user=request.user)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         """
@@ -89,3 +90,10 @@ class TransactionAdmin(admin.ModelAdmin):
                 )
 
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def delete_queryset(self, request, queryset):
+        """
+        Exclui em lote aplicando um único ajuste de saldo por conta.
+        """
+        with defer_balance_updates(using=queryset.db):
+            super().delete_queryset(request, queryset)
@@ -0,0 +1,629 @@
+"""
+Atualização do saldo das contas a partir do impacto das transações.
+
+Todo impacto passa por `record_transaction_effect()`, que mantém
+`Account.balance`, os resumos diários (`AccountDailyBalance`) e os
+resumos mensais (`MonthlySummary`). Fora de um lote o impacto é gravado
+na hora, com UPDATEs relativos (`balance = balance + delta`); dentro de
+`defer_balance_updates()` os deltas são somados e gravados uma única vez
+ao final do bloco.
+"""
+# Standard library
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+# Django imports
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import (
+    Case,
+    DateField,
+    DecimalField,
+    F,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Local imports
+from accounts.models import Account, AccountDailyBalance
+from core.cache import bump_data_version
+
+from .models import Transaction
+from .summaries import apply_monthly_deltas, month_start
+
+# Days per relative UPDATE of the daily summaries (bounds query params)
+DAILY_UPDATE_CHUNK_SIZE = 200
+
+# (income, expense) of a day without changes
+ZERO_PAIR = (Decimal('0'), Decimal('0'))
+
+# The savepoint layers read two private attributes of the connection
+# (see _open_savepoint_ids and _pending_on_commit). Django has no public
+# hook for savepoint rollbacks; these are the versions they were checked
+# against (transactions/tests/test_signals.py fails on any other one)
+VERIFIED_DJANGO_VERSIONS = ((5, 2),)
+
+_local = threading.local()
+
+
+def balance_delta(amount, transaction_type):
+    """
+    Retorna o impacto assinado de uma transação no saldo da conta.
+
+    - INCOME: +valor
+    - EXPENSE: -valor
+    """
+    if transaction_type == Transaction.INCOME:
+        return amount
+    if transaction_type == Transaction.EXPENSE:
+        return -amount
+    return Decimal('0')
+
+
+def apply_balance_delta(account_id, delta, using=DEFAULT_DB_ALIAS):
+    """
+    Aplica um delta ao saldo de uma conta direto no banco de dados.
+
+    Executa um único `UPDATE ... SET balance = balance + delta`, de modo
+    que atualizações concorrentes na mesma conta nunca se sobrescrevem.
+    Deltas nulos não geram nenhuma query.
+    """
+    if not delta:
+        return
+
+    Account.objects.using(using).filter(pk=account_id).update(
+        balance=F('balance') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def apply_daily_deltas(account_id, days, using=DEFAULT_DB_ALIAS):
+    """
+    Aplica deltas de entradas/saídas aos resumos diários de uma conta.
+
+    Args:
+        account_id: Conta afetada
+        days: Dicionário {data: (entradas, saídas)} com os deltas do dia
+        using: Alias do banco
+
+    Uma única leitura traz o saldo de abertura, a linha anterior ao dia
+    mais antigo, as linhas do período e a primeira linha posterior a
+    ele. Se houver linhas a partir do dia mais antigo, elas recebem um
+    único UPDATE relativo (`closing_balance = closing_balance + CASE
+    ...`); os dias que ainda não têm linha são criados com `bulk_create`
+    a partir do saldo da linha anterior (ou do saldo de abertura) e os
+    que ficaram sem movimento são removidos.
+    """
+    dates = sorted(days)
+    if not dates:
+        return
+
+    snapshots = AccountDailyBalance.objects.using(using).filter(
+        account_id=account_id,
+    )
+    previous_date = snapshots.filter(date__lt=dates[0]).order_by(
+        '-date',
+    ).values('date')[:1]
+    next_date = snapshots.filter(date__gt=dates[-1]).order_by(
+        'date',
+    ).values('date')[:1]
+
+    rows = snapshots.filter(
+        date__gte=Coalesce(Subquery(previous_date), Value(dates[0])),
+        date__lte=Coalesce(Subquery(next_date), Value(dates[-1])),
+    ).order_by().values_list(
+        'date',
+        'closing_balance',
+        'income',
+        'expense',
+    ).union(
+        # The opening balance comes back as the row without a date
+        Account.objects.using(using).filter(pk=account_id).order_by(
+        ).values_list(
+            Value(None, output_field=DateField()),
+            'opening_balance',
+            Value(None, output_field=DecimalField()),
+            Value(None, output_field=DecimalField()),
+        ),
+        all=True,
+    )
+
+    opening_balance = None
+    base_balance = None
+    existing = {}
+    has_later_rows = False
+    for day, closing_balance, income, expense in rows:
+        if day is None:
+            opening_balance = closing_balance
+        elif day < dates[0]:
+            base_balance = closing_balance
+        elif day > dates[-1]:
+            has_later_rows = True
+        else:
+            existing[day] = (closing_balance, income, expense)
+
+    empty_days = [
+        day for day, (_, income, expense) in existing.items()
+        if not (income + days.get(day, ZERO_PAIR)[0]
+                or expense + days.get(day, ZERO_PAIR)[1])
+    ]
+    if has_later_rows or len(empty_days) < len(existing):
+        for start in range(0, len(dates), DAILY_UPDATE_CHUNK_SIZE):
+            _update_daily_rows(
+                snapshots,
+                days,
+                dates[start:start + DAILY_UPDATE_CHUNK_SIZE],
+            )
+
+    new_rows = []
+    cumulative = Decimal('0')
+    closing = opening_balance if base_balance is None else base_balance
+    for day in sorted(existing.keys() | days.keys()):
+        income, expense = days.get(day, ZERO_PAIR)
+        cumulative += income - expense
+
+        if day in existing:
+            closing = existing[day][0] + cumulative
+            continue
+
+        closing += income - expense
+        new_rows.append(AccountDailyBalance(
+            account_id=account_id,
+            date=day,
+            closing_balance=closing,
+            income=income,
+            expense=expense,
+        ))
+
+    if new_rows:
+        AccountDailyBalance.objects.using(using).bulk_create(new_rows)
+    if empty_days:
+        # Days left without transactions: the previous row already
+        # carries the same closing balance
+        snapshots.filter(date__in=empty_days).delete()
+
+
+def _update_daily_rows(snapshots, days, dates):
+    """
+    Emite o UPDATE relativo das linhas diárias a partir de `dates[0]`.
+    """
+    closing_whens = []
+    income_whens = []
+    expense_whens = []
+    cumulative = Decimal('0')
+
+    for day in dates:
+        income, expense = days[day]
+        cumulative += income - expense
+        closing_whens.append(When(date__gte=day, then=Value(cumulative)))
+        if income:
+            income_whens.append(When(date=day, then=Value(income)))
+        if expense:
+            expense_whens.append(When(date=day, then=Value(expense)))
+
+    def shift(field_name, whens):
+        return F(field_name) + Case(
+            *whens,
+            default=Value(Decimal('0')),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+
+    updates = {}
+    if cumulative or len(closing_whens) > 1:
+        # Most recent day first: each row gets the sum up to its date
+        updates['closing_balance'] = shift(
+            'closing_balance',
+            closing_whens[::-1],
+        )
+    if income_whens:
+        updates['income'] = shift('income', income_whens)
+    if expense_whens:
+        updates['expense'] = shift('expense', expense_whens)
+
+    if updates:
+        snapshots.filter(date__gte=dates[0]).update(
+            **updates,
+            updated_at=timezone.now(),
+        )
+
+
+def transaction_values(transaction):
+    """
+    Extrai de uma transação os campos de `Transaction.BALANCE_FIELDS`.
+    """
+    return {
+        attname: getattr(transaction, attname)
+        for attname in Transaction.BALANCE_FIELDS
+    }
+
+
+def record_transaction_effect(
+    values,
+    sign=1,
+    user_id=None,
+    using=DEFAULT_DB_ALIAS,
+):
+    """
+    Registra o impacto de uma transação no saldo e nos resumos.
+
+    Args:
+        values: Campos de `Transaction.BALANCE_FIELDS` da transação
+        sign: 1 para aplicar o impacto, -1 para revertê-lo
+        user_id: Dono da conta, se já conhecido (evita uma consulta)
+        using: Alias do banco
+
+    Dentro de `defer_balance_updates()` o impacto é acumulado no lote
+    ativo; fora dele é gravado na hora.
+    """
+    buffer = get_active_buffer(using)
+    if buffer is not None:
+        buffer.add(values, sign, user_id=user_id)
+        return
+
+    buffer = BalanceDeltaBuffer(using)
+    buffer.add(values, sign, user_id=user_id)
+    buffer.flush()
+
+
+class BalanceDeltaBuffer:
+    """
+    Acumula o impacto de transações para gravá-lo de uma só vez.
+
+    Guarda entradas e saídas por conta e dia (saldo e resumos diários) e
+    total e quantidade por conta, mês, categoria e tipo (resumos
+    mensais, consolidados por usuário na gravação).
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.deltas = defaultdict(lambda: ZERO_PAIR)
+        self.monthly = defaultdict(lambda: (Decimal('0'), 0))
+        self.account_users = {}
+        self.touched_accounts = set()
+        # Savepoints opened after this point get their own layer
+        self.savepoint_depth = len(_open_savepoint_ids(using))
+        self.savepoints = {}
+
+    def add(self, values, sign=1, user_id=None):
+        """
+        Soma o impacto de uma transação aos totais pendentes.
+
+        Dentro de um savepoint aberto depois do buffer (um `atomic()`
+        aninhado), o impacto vai para a camada daquele savepoint e só é
+        incorporado se ele não sofrer rollback (ver `_settle`).
+
+        Args:
+            values: Campos de `Transaction.BALANCE_FIELDS` da transação
+            sign: 1 para aplicar o impacto, -1 para revertê-lo
+            user_id: Dono da conta, se já conhecido
+        """
+        self._current_layer()._add(values, sign, user_id)
+
+    def _current_layer(self):
+        """
+        Retorna o buffer do savepoint mais interno aberto depois deste
+        buffer, ou o próprio buffer se não houver nenhum.
+
+        Cada camada se registra em `on_commit`: o Django descarta os
+        callbacks de um savepoint desfeito, então a camada ausente da
+        lista indica que seus deltas também devem ser descartados.
+        """
+        sids = [
+            sid
+            for sid in _open_savepoint_ids(self.using)[self.savepoint_depth:]
+            if sid is not None
+        ]
+        if not sids:
+            return self
+
+        layer = self.savepoints.get(sids[-1])
+        if layer is None:
+            layer = _SavepointLayer(self.using)
+            transaction.on_commit(layer, using=self.using)
+            self.savepoints[sids[-1]] = layer
+        return layer.buffer
+
+    def _settle(self):
+        """
+        Incorpora as camadas dos savepoints confirmados e descarta as dos
+        savepoints desfeitos.
+        """
+        if not self.savepoints:
+            return
+
+        registered = {id(func) for func in _pending_on_commit(self.using)}
+        savepoints, self.savepoints = self.savepoints, {}
+        for layer in savepoints.values():
+            if id(layer) in registered:
+                self._merge(layer.buffer)
+
+    def _add(self, values, sign, user_id):
+        account_id = values['account_id']
+        transaction_type = values['transaction_type']
+        amount = sign * values['amount']
+
+        day_key = (account_id, values['transaction_date'])
+        income, expense = self.deltas[day_key]
+        if transaction_type == Transaction.INCOME:
+            income += amount
+        elif transaction_type == Transaction.EXPENSE:
+            expense += amount
+        self.deltas[day_key] = (income, expense)
+
+        month_key = (
+            account_id,
+            month_start(values['transaction_date']),
+            values['category_id'],
+            transaction_type,
+        )
+        total, count = self.monthly[month_key]
+        self.monthly[month_key] = (total + amount, count + sign)
+
+        self.touched_accounts.add(account_id)
+        if user_id is not None:
+            self.account_users[account_id] = user_id
+
+    def merge(self, other):
+        """Incorpora os deltas pendentes de outro buffer."""
+        other._settle()
+        self._current_layer()._merge(other)
+
+    def _merge(self, other):
+        for key, (income, expense) in other.deltas.items():
+            current_income, current_expense = self.deltas[key]
+            self.deltas[key] = (
+                current_income + income,
+                current_expense + expense,
+            )
+        for key, (total, count) in other.monthly.items():
+            current_total, current_count = self.monthly[key]
+            self.monthly[key] = (current_total + total, current_count + count)
+        self.account_users.update(other.account_users)
+        self.touched_accounts |= other.touched_accounts
+
+    def flush(self):
+        """
+        Grava os deltas pendentes e esvazia o buffer.
+
+        Para cada conta, um UPDATE no saldo (se o delta líquido não for
+        zero) e a atualização dos resumos diários; depois, os resumos
+        mensais de cada usuário. As contas são processadas em ordem de
+        id para que lotes concorrentes travem as linhas sempre na mesma
+        sequência; o UPDATE do saldo trava a conta antes de os resumos
+        diários serem lidos. Em seguida a versão dos dados dos donos das
+        contas tocadas é incrementada (ver `core.cache`): o UPDATE trava
+        as linhas dos usuários, e lotes concorrentes do mesmo usuário
+        esperam antes de ler e inserir os resumos mensais.
+        """
+        self._settle()
+        deltas, self.deltas = self.deltas, defaultdict(lambda: ZERO_PAIR)
+        monthly = self.monthly
+        self.monthly = defaultdict(lambda: (Decimal('0'), 0))
+        touched_accounts, self.touched_accounts = self.touched_accounts, set()
+
+        accounts = defaultdict(dict)
+        for (account_id, day), (income, expense) in deltas.items():
+            if income or expense:
+                accounts[account_id][day] = (income, expense)
+
+        monthly = {key: value for key, value in monthly.items() if any(value)}
+
+        if not touched_accounts:
+            return
+
+        with transaction.atomic(using=self.using, savepoint=False):
+            for account_id in sorted(accounts):
+                days = accounts[account_id]
+                delta = sum(
+                    income - expense for income, expense in days.values()
+                )
+                if delta:
+                    apply_balance_delta(account_id, delta, using=self.using)
+                else:
+                    # Same net amount moved between days: lock explicitly
+                    list(
+                        Account.objects.using(self.using).select_for_update(
+                        ).filter(pk=account_id).values_list('pk', flat=True)
+                    )
+                apply_daily_deltas(account_id, days, using=self.using)
+
+            # Also locks the users for apply_monthly_deltas
+            account_users = self.account_users
+            bump_data_version(
+                user_ids=[
+                    account_users[account_id]
+                    for account_id in touched_accounts
+                    if account_id in account_users
+                ],
+                account_ids=touched_accounts - account_users.keys(),
+                using=self.using,
+            )
+
+            self._flush_monthly(monthly)
+
+    def _flush_monthly(self, monthly):
+        """Consolida os deltas mensais por usuário e grava cada um."""
+        account_users = self.account_users
+        unknown = {key[0] for key in monthly} - account_users.keys()
+        if unknown:
+            account_users.update(
+                Account.objects.using(self.using).filter(
+                    pk__in=unknown,
+                ).order_by().values_list('pk', 'user_id')
+            )
+
+        users = defaultdict(lambda: defaultdict(lambda: (Decimal('0'), 0)))
+        for (account_id, *key), (total, count) in monthly.items():
+            key = tuple(key)
+            entries = users[account_users[account_id]]
+            current_total, current_count = entries[key]
+            entries[key] = (current_total + total, current_count + count)
+
+        for user_id in sorted(users):
+            apply_monthly_deltas(user_id, users[user_id], using=self.using)
+
+
+class _SavepointLayer:
+    """
+    Deltas registrados dentro de um savepoint.
+
+    A própria camada é o marcador registrado em `on_commit`: chamá-la não
+    faz nada, só a presença na lista importa.
+    """
+
+    def __init__(self, using):
+        self.buffer = BalanceDeltaBuffer(using)
+
+    def __call__(self):
+        pass
+
+
+def _open_savepoint_ids(using):
+    """
+    Ids dos savepoints abertos na conexão, do mais externo ao mais
+    interno (`None` para blocos `atomic()` sem savepoint).
+
+    Lê `savepoint_ids`, atributo interno do Django (ver
+    `VERIFIED_DJANGO_VERSIONS`).
+    """
+    return transaction.get_connection(using).savepoint_ids
+
+
+def _pending_on_commit(using):
+    """
+    Callbacks de `on_commit` ainda pendentes na conexão; os registrados
+    em savepoints desfeitos já foram descartados pelo Django.
+
+    Lê `run_on_commit`, atributo interno do Django, com tuplas (ids dos
+    savepoints, callback, robust) (ver `VERIFIED_DJANGO_VERSIONS`).
+    """
+    return [
+        func
+        for _, func, _ in transaction.get_connection(using).run_on_commit
+    ]
+
+
+def rebuild_daily_balances(account_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Recria do zero os resumos diários das contas informadas.
+
+    As contas são travadas antes da leitura: signals concorrentes
+    esperam o fim da reconstrução, então nenhum delta gravado entre a
+    leitura e a troca das linhas se perde. Uma única query agrupada por
+    conta e dia soma entradas e saídas; o saldo de fechamento é
+    acumulado em Python a partir do saldo de abertura e as linhas
+    antigas são substituídas com `bulk_create`.
+
+    Returns:
+        int: Quantidade de linhas diárias criadas
+    """
+    account_ids = list(account_ids)
+
+    with transaction.atomic(using=using):
+        opening_balances = dict(
+            Account.objects.using(using).select_for_update().filter(
+                pk__in=account_ids,
+            ).order_by('pk').values_list('pk', 'opening_balance')
+        )
+        days = Transaction.objects.using(using).filter(
+            account_id__in=account_ids,
+        ).values('account_id', 'transaction_date').annotate(
+            income=Sum(
+                'amount',
+                filter=Q(transaction_type=Transaction.INCOME),
+            ),
+            expense=Sum(
+                'amount',
+                filter=Q(transaction_type=Transaction.EXPENSE),
+            ),
+        ).order_by('account_id', 'transaction_date')
+
+        rows = []
+        closing = {}
+        for day in days:
+            account_id = day['account_id']
+            income = day['income'] or Decimal('0')
+            expense = day['expense'] or Decimal('0')
+            closing[account_id] = (
+                closing.get(account_id, opening_balances[account_id])
+                + income
+                - expense
+            )
+            rows.append(AccountDailyBalance(
+                account_id=account_id,
+                date=day['transaction_date'],
+                closing_balance=closing[account_id],
+                income=income,
+                expense=expense,
+            ))
+
+        AccountDailyBalance.objects.using(using).filter(
+            account_id__in=account_ids,
+        ).delete()
+        AccountDailyBalance.objects.using(using).bulk_create(
+            rows,
+            batch_size=1000,
+        )
+
+    return len(rows)
+
+
+def _get_stack(using):
+    """Retorna a pilha de buffers ativos da conexão `using`."""
+    stacks = getattr(_local, 'stacks', None)
+    if stacks is None:
+        stacks = _local.stacks = {}
+    return stacks.setdefault(using, [])
+
+
+def get_active_buffer(using=DEFAULT_DB_ALIAS):
+    """Retorna o buffer do lote mais interno ativo na conexão, se houver."""
+    stack = _get_stack(using)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def defer_balance_updates(using=DEFAULT_DB_ALIAS):
+    """
+    Agrupa as atualizações de saldo de um lote de transações.
+
+    Abre um `transaction.atomic()` e, enquanto ele está ativo, os signals
+    de `Transaction` acumulam os deltas por conta e dia em vez de gravar
+    a cada save. Ao final do bloco cada conta recebe um único UPDATE de
+    saldo e uma única atualização dos resumos diários, ainda dentro da
+    mesma transação do banco: tudo é confirmado junto com as transações
+    e descartado junto com elas em caso de rollback.
+
+    Blocos aninhados repassam seus deltas ao bloco externo, que grava
+    tudo no final. Deltas registrados dentro de um `atomic()` aninhado
+    que sofre rollback são descartados junto com ele.
+
+    Dentro do bloco, `Account.balance` e `AccountDailyBalance` no banco
+    ainda não refletem os saves pendentes.
+
+    Example:
+        with defer_balance_updates():
+            for transaction in transactions:
+                transaction.save()
+    """
+    stack = _get_stack(using)
+
+    with transaction.atomic(using=using):
+        buffer = BalanceDeltaBuffer(using)
+        stack.append(buffer)
+        try:
+            yield buffer
+        finally:
+            stack.pop()
+
+        parent = get_active_buffer(using)
+        if parent is not None:
+            parent.merge(buffer)
+        else:
+            buffer.flush()
@@ -0,0 +1,331 @@
+"""
+Exportação das transações filtradas em CSV e XLSX.
+
+As linhas vêm de `values_list().iterator(chunk_size=...)`: nenhuma
+instância de modelo é criada e o banco entrega os resultados em blocos.
+Os escritores são geradores que produzem o arquivo aos poucos para um
+`StreamingHttpResponse`, então a memória usada não depende do número de
+transações exportadas.
+
+O CSV usa os mesmos cabeçalhos aceitos pela importação; textos que uma
+planilha leria como fórmula recebem um apóstrofo (`csv_text`). O XLSX é
+montado à mão: as partes fixas do pacote são pequenas e a planilha é
+escrita linha a linha (com strings inline, nunca avaliadas como fórmula,
+sem tabela de strings compartilhadas) dentro de um ZIP gravado em modo
+de streaming.
+"""
+# Standard library
+import csv
+import re
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+
+# Local imports
+from .models import Transaction
+
+CSV = 'csv'
+XLSX = 'xlsx'
+FORMAT_CHOICES = [
+    (CSV, 'CSV'),
+    (XLSX, 'XLSX'),
+]
+
+CONTENT_TYPES = {
+    CSV: 'text/csv; charset=utf-8',
+    XLSX: (
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    ),
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# (header, field) pairs; headers match importers.CSV_HEADER_ALIASES
+EXPORT_COLUMNS = [
+    ('data', 'transaction_date'),
+    ('descricao', 'description'),
+    ('valor', 'amount'),
+    ('tipo', 'transaction_type'),
+    ('conta', 'account__name'),
+    ('categoria', 'category__name'),
+]
+
+TYPE_LABELS = dict(Transaction.TRANSACTION_TYPE_CHOICES)
+
+# A worksheet holds at most 1,048,576 rows, the header included
+XLSX_MAX_ROWS = 1048576
+
+# Excel serial dates count days from 1899-12-30
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# Control characters are not allowed in XML 1.0
+XML_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Spreadsheet apps evaluate CSV cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Cells escaped by csv_text: formulas and texts that already start with the
+# escape, so importers.parse_csv can strip exactly one apostrophe
+CSV_ESCAPED_PREFIXES = CSV_FORMULA_PREFIXES + ("'",)
+
+
+def export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Itera as linhas exportadas como tuplas, na ordem do queryset.
+
+    Args:
+        queryset: Queryset de `Transaction` já filtrado e ordenado
+        chunk_size: Linhas buscadas do banco por vez
+
+    Returns:
+        Iterator: Tuplas com os campos de `EXPORT_COLUMNS`
+    """
+    fields = [field for _, field in EXPORT_COLUMNS]
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def csv_text(value):
+    """
+    Neutraliza textos que uma planilha interpretaria como fórmula.
+
+    O apóstrofo inicial faz o Excel e o LibreOffice exibirem a célula
+    como texto (injeção de fórmulas em CSV). Textos que já começam com
+    apóstrofo também recebem um, para que a importação (`parse_csv`)
+    recupere o valor original. Use só em colunas de texto: valores
+    numéricos negativos também começam com "-".
+    """
+    if value and value.startswith(CSV_ESCAPED_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class _Echo:
+    """Arquivo falso que devolve o que recebe, para o `csv.writer`."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """
+    Gera o CSV linha a linha (texto), começando pelo cabeçalho.
+
+    Args:
+        rows: Tuplas produzidas por `export_rows`
+    """
+    writer = csv.writer(_Echo())
+    # BOM so spreadsheet apps detect UTF-8 (ignored by the importer)
+    yield '\ufeff' + writer.writerow([header for header, _ in EXPORT_COLUMNS])
+
+    for (
+        transaction_date,
+        description,
+        amount,
+        transaction_type,
+        account_name,
+        category_name,
+    ) in rows:
+        yield writer.writerow([
+            transaction_date.isoformat(),
+            csv_text(description),
+            amount,
+            TYPE_LABELS.get(transaction_type, transaction_type),
+            csv_text(account_name),
+            csv_text(category_name),
+        ])
+
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'content-types">'
+    '<Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType='
+    '"application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/'
+    '2006/main" xmlns:r="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships">'
+    '<sheets><sheet name="Transações" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Cell styles: 0 default, 1 date (dd/mm/yyyy), 2 amount (#,##0.00)
+XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/'
+    '2006/main">'
+    '<numFmts count="1">'
+    '<numFmt numFmtId="164" formatCode="dd/mm/yyyy"/>'
+    '</numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill>'
+    '</fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" xfId="0"/>'
+    '<xf numFmtId="164" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="4" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/'
+    '2006/main"><sheetData>'
+)
+
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def _text_cell(value):
+    """Célula de texto inline."""
+    value = XML_INVALID_CHARS.sub('', value or '')
+    return (
+        '<c t="inlineStr"><is><t xml:space="preserve">'
+        f'{escape(value)}</t></is></c>'
+    )
+
+
+def _xlsx_row(values):
+    """Linha da planilha já serializada em XML."""
+    return f'<row>{"".join(values)}</row>'
+
+
+class _ChunkBuffer:
+    """
+    Destino de escrita sem `seek` para o `ZipFile`.
+
+    Acumula os bytes escritos até que o gerador os entregue; como não é
+    pesquisável, o `zipfile` grava os tamanhos em descritores de dados
+    depois de cada arquivo em vez de voltar ao cabeçalho.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        """Retorna e descarta os bytes acumulados."""
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_xlsx(rows, rows_per_chunk=500):
+    """
+    Gera o XLSX aos poucos (bytes), começando pelo cabeçalho.
+
+    Linhas além do limite de uma planilha (`XLSX_MAX_ROWS`) são
+    descartadas.
+
+    Args:
+        rows: Tuplas produzidas por `export_rows`
+        rows_per_chunk: Linhas serializadas por bloco entregue
+    """
+    buffer = _ChunkBuffer()
+    archive = zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED)
+
+    for name, content in (
+        ('[Content_Types].xml', XLSX_CONTENT_TYPES),
+        ('_rels/.rels', XLSX_ROOT_RELS),
+        ('xl/workbook.xml', XLSX_WORKBOOK),
+        ('xl/_rels/workbook.xml.rels', XLSX_WORKBOOK_RELS),
+        ('xl/styles.xml', XLSX_STYLES),
+    ):
+        archive.writestr(name, content)
+    yield buffer.pop()
+
+    with archive.open(
+        'xl/worksheets/sheet1.xml',
+        'w',
+        force_zip64=True,
+    ) as sheet:
+        sheet.write(XLSX_SHEET_START.encode())
+        sheet.write(_xlsx_row(
+            _text_cell(header) for header, _ in EXPORT_COLUMNS
+        ).encode())
+
+        pending = []
+        for row_number, (
+            transaction_date,
+            description,
+            amount,
+            transaction_type,
+            account_name,
+            category_name,
+        ) in enumerate(rows, start=2):
+            if row_number > XLSX_MAX_ROWS:
+                break
+            pending.append(_xlsx_row([
+                f'<c s="1"><v>{(transaction_date - EXCEL_EPOCH).days}</v>'
+                '</c>',
+                _text_cell(description),
+                f'<c s="2"><v>{amount}</v></c>',
+                _text_cell(TYPE_LABELS.get(
+                    transaction_type,
+                    transaction_type,
+                )),
+                _text_cell(account_name),
+                _text_cell(category_name),
+            ]))
+            if len(pending) >= rows_per_chunk:
+                sheet.write(''.join(pending).encode())
+                pending = []
+                yield buffer.pop()
+
+        sheet.write(''.join(pending).encode())
+        sheet.write(XLSX_SHEET_END.encode())
+
+    archive.close()
+    yield buffer.pop()
+
+
+def stream_export(queryset, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Seleciona o escritor adequado para o formato informado."""
+    rows = export_rows(queryset, chunk_size=chunk_size)
+    if file_format == XLSX:
+        return stream_xlsx(rows)
+    return stream_csv(rows)
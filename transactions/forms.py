@@ -1,11 +1,14 @@
 # Django imports
 from django import forms
 from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 from django.utils import timezone
 
+# Local imports
 from accounts.models import Account
 from categories.models import Category
-# Local imports
+from core.lookups import UserLookups
+from transactions.importers import CSV, FORMAT_CHOICES, OFX
 from transactions.models import Transaction
 
 INPUT_STYLE_CLASSES = (
@@ -15,6 +18,100 @@ INPUT_STYLE_CLASSES = (
 )
 
 
+class LookupChoiceIterator(ModelChoiceIterator):
+    """
+    Itera as opções a partir de `field.objects`, sem consultar o banco.
+    """
+
+    def __iter__(self):
+        if self.field.objects is None:
+            yield from super().__iter__()
+            return
+
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.objects.values():
+            yield self.choice(obj)
+
+    def __len__(self):
+        if self.field.objects is None:
+            return super().__len__()
+        return len(self.field.objects) + (
+            self.field.empty_label is not None
+        )
+
+    def __bool__(self):
+        if self.field.objects is None:
+            return super().__bool__()
+        return self.field.empty_label is not None or bool(self.field.objects)
+
+
+class LookupChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField servido por um dicionário `{pk: objeto}` já
+    carregado (ver `core.lookups`): opções e validação não fazem queries.
+
+    Sem `objects` definido, se comporta como um ModelChoiceField comum.
+    """
+
+    iterator = LookupChoiceIterator
+
+    def __init__(self, *args, **kwargs):
+        self.objects = None
+        super().__init__(*args, **kwargs)
+
+    def set_objects(self, objects):
+        """
+        Define os objetos válidos, indexados por pk.
+
+        O queryset também é restringido a eles (sem executar query), para
+        que nenhum uso direto dele exponha registros de outros usuários.
+        """
+        self.objects = objects
+        self.queryset = self.queryset.filter(pk__in=list(objects))
+
+    @property
+    def available_objects(self):
+        """Objetos disponíveis, para templates que montam as opções."""
+        if self.objects is None:
+            return self.queryset
+        return list(self.objects.values())
+
+    def to_python(self, value):
+        if self.objects is None:
+            return super().to_python(value)
+        if value in self.empty_values:
+            return None
+
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        try:
+            obj = self.objects.get(int(value))
+        except (TypeError, ValueError):
+            obj = None
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
+
+
+def _get_lookups(kwargs):
+    """
+    Extrai `lookups` (ou `user`) dos kwargs de um formulário.
+
+    Sem `lookups`, os dados do `user` são carregados sem o cache entre
+    requisições, já que o usuário pode não ser o da requisição atual.
+    """
+    user = kwargs.pop('user', None)
+    lookups = kwargs.pop('lookups', None)
+    if lookups is None and user:
+        lookups = UserLookups(user, use_cache=False)
+    return lookups
+
+
 class TransactionForm(forms.ModelForm):
     """
     Formulário para criar e editar transações financeiras.
@@ -33,6 +130,10 @@ class TransactionForm(forms.ModelForm):
             'transaction_date',
             'description',
         ]
+        field_classes = {
+            'account': LookupChoiceField,
+            'category': LookupChoiceField,
+        }
         labels = {
             'account': 'Conta',
             'category': 'Categoria',
@@ -88,22 +189,29 @@ class TransactionForm(forms.ModelForm):
         Inicializa o formulário e filtra contas e categorias do usuário.
 
         Args:
-            user: Usuário logado (obrigatório via kwargs)
+            user: Usuário logado (via kwargs)
+            lookups: `UserLookups` da requisição (via kwargs; evita
+                consultar contas e categorias novamente)
         """
-        user = kwargs.pop('user', None)
+        lookups = _get_lookups(kwargs)
         super().__init__(*args, **kwargs)
 
-        if user:
-            # Filtra apenas contas do usuário logado
-            self.fields['account'].queryset = Account.objects.filter(
-                user=user,
-                is_active=True,
-            )
+        if lookups:
+            # Apenas contas ativas e categorias do usuário logado
+            self.fields['account'].set_objects(lookups.active_accounts)
+            self.fields['category'].set_objects(lookups.categories)
 
-            # Filtra apenas categorias do usuário logado
-            self.fields['category'].queryset = Category.objects.filter(
-                user=user,
-            )
+    def _get_validation_exclusions(self):
+        """
+        Pula a checagem de existência das chaves estrangeiras no
+        `full_clean` do modelo quando os objetos já foram validados em
+        memória pelo `LookupChoiceField`.
+        """
+        exclude = super()._get_validation_exclusions()
+        for name in ('account', 'category'):
+            if self.fields[name].objects is not None:
+                exclude.add(name)
+        return exclude
 
     def clean_amount(self):
         """
@@ -189,27 +297,24 @@ class TransactionForm(forms.ModelForm):
             and account
             and amount is not None
         ):
-            available_balance = account.balance
+            # The account may come from the cached lookups, so its balance
+            # could predate the latest transactions
+            available_balance = Account.objects.filter(
+                pk=account.pk,
+            ).values_list('balance', flat=True).get()
 
-            if self.instance.pk:
-                try:
-                    old_transaction = Transaction.objects.get(
-                        pk=self.instance.pk
-                    )
-                except Transaction.DoesNotExist:
-                    old_transaction = None
-                else:
-                    if old_transaction.account_id == account.pk:
-                        if (
-                            old_transaction.transaction_type
-                            == Transaction.EXPENSE
-                        ):
-                            available_balance += old_transaction.amount
-                        elif (
-                            old_transaction.transaction_type
-                            == Transaction.INCOME
-                        ):
-                            available_balance -= old_transaction.amount
+            # Valores originais vêm do carregamento da instância,
+            # sem buscar a transação novamente no banco
+            original = (
+                self.instance.get_original_values()
+                if self.instance.pk
+                else None
+            )
+            if original and original['account_id'] == account.pk:
+                if original['transaction_type'] == Transaction.EXPENSE:
+                    available_balance += original['amount']
+                elif original['transaction_type'] == Transaction.INCOME:
+                    available_balance -= original['amount']
 
             if amount > available_balance:
                 raise ValidationError(
@@ -222,3 +327,92 @@ class TransactionForm(forms.ModelForm):
                 )
 
         return cleaned_data
+
+
+class TransactionImportForm(forms.Form):
+    """
+    Formulário de upload para importar transações de um arquivo.
+    Conta e categorias padrão são usadas quando a linha não as informa.
+    """
+
+    file = forms.FileField(
+        label='Arquivo',
+        help_text=(
+            'CSV com cabeçalho (data, descricao, valor, tipo, conta, '
+            'categoria) ou extrato OFX do seu banco.'
+        ),
+        widget=forms.ClearableFileInput(
+            attrs={
+                'class': INPUT_STYLE_CLASSES,
+                'accept': '.csv,.ofx,text/csv',
+            }
+        ),
+    )
+    file_format = forms.ChoiceField(
+        label='Formato',
+        choices=FORMAT_CHOICES,
+        initial=CSV,
+        widget=forms.Select(attrs={'class': INPUT_STYLE_CLASSES}),
+    )
+    account = LookupChoiceField(
+        label='Conta padrão',
+        queryset=Account.objects.none(),
+        required=False,
+        help_text='Obrigatória para OFX ou quando o CSV não tem conta.',
+        widget=forms.Select(attrs={'class': INPUT_STYLE_CLASSES}),
+    )
+    income_category = LookupChoiceField(
+        label='Categoria padrão para entradas',
+        queryset=Category.objects.none(),
+        required=False,
+        widget=forms.Select(attrs={'class': INPUT_STYLE_CLASSES}),
+    )
+    expense_category = LookupChoiceField(
+        label='Categoria padrão para saídas',
+        queryset=Category.objects.none(),
+        required=False,
+        widget=forms.Select(attrs={'class': INPUT_STYLE_CLASSES}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        """
+        Inicializa o formulário e filtra contas e categorias do usuário.
+
+        Args:
+            user: Usuário logado (via kwargs)
+            lookups: `UserLookups` da requisição (via kwargs)
+        """
+        lookups = _get_lookups(kwargs)
+        super().__init__(*args, **kwargs)
+
+        if lookups:
+            self.fields['account'].set_objects(lookups.active_accounts)
+            self.fields['income_category'].set_objects(
+                lookups.categories_of_type(Category.INCOME)
+            )
+            self.fields['expense_category'].set_objects(
+                lookups.categories_of_type(Category.EXPENSE)
+            )
+
+    def clean(self):
+        """
+        Exige conta e categorias padrão para extratos OFX, que não
+        trazem essas informações por lançamento.
+        """
+        cleaned_data = super().clean()
+
+        if cleaned_data.get('file_format') == OFX:
+            required = {
+                'account': 'Selecione a conta do extrato OFX.',
+                'income_category': (
+                    'Selecione a categoria das entradas do extrato OFX.'
+                ),
+                'expense_category': (
+                    'Selecione a categoria das saídas do extrato OFX.'
+                ),
+            }
+            for field_name, message in required.items():
+                if not cleaned_data.get(field_name):
+                    self.add_error(field_name, message)
+
+        return cleaned_data
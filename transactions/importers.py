@@ -0,0 +1,514 @@
+"""
+Importação em lote de transações a partir de arquivos CSV e OFX.
+
+Os parsers são geradores que leem o arquivo aos poucos e produzem uma
+linha por vez, então a memória usada não depende do tamanho do arquivo.
+`TransactionImporter` valida cada linha contra as contas e categorias do
+usuário (carregadas uma única vez), insere em lotes com `bulk_create` e
+aplica um único ajuste de saldo (e dos resumos diários e mensais) por
+conta ao final.
+"""
+# Standard library
+import csv
+import re
+import unicodedata
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+# Django imports
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+# Local imports
+from accounts.models import Account
+from core.lookups import UserLookups
+
+from .balances import defer_balance_updates, transaction_values
+from .exporters import CSV_ESCAPED_PREFIXES
+from .models import Transaction
+
+CSV = 'csv'
+OFX = 'ofx'
+FORMAT_CHOICES = [
+    (CSV, 'CSV'),
+    (OFX, 'OFX'),
+]
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+# Transaction.amount is DecimalField(max_digits=12, decimal_places=2)
+MAX_AMOUNT = Decimal('10000000000')
+
+# Accepted CSV headers (normalized) mapped to row keys
+CSV_HEADER_ALIASES = {
+    'date': 'date',
+    'data': 'date',
+    'description': 'description',
+    'descricao': 'description',
+    'amount': 'amount',
+    'valor': 'amount',
+    'type': 'type',
+    'tipo': 'type',
+    'account': 'account',
+    'conta': 'account',
+    'category': 'category',
+    'categoria': 'category',
+}
+
+# OFX dates: AAAAMMDD, optionally followed by the time and the time zone
+# (e.g. "20240105120000.000[-3:BRT]")
+OFX_DATE_PATTERN = re.compile(
+    r'(\d{8})(?:\d{2,6}(?:\.\d+)?)?(?:\[[^\]]*\])?'
+)
+
+TYPE_ALIASES = {
+    'income': Transaction.INCOME,
+    'entrada': Transaction.INCOME,
+    'receita': Transaction.INCOME,
+    'expense': Transaction.EXPENSE,
+    'saida': Transaction.EXPENSE,
+    'despesa': Transaction.EXPENSE,
+}
+
+
+class ImportRowError(ValueError):
+    """Linha do arquivo que não pode ser importada."""
+
+
+class ImportResult:
+    """
+    Resumo de uma importação: linhas lidas, importadas e rejeitadas.
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        """Registra uma linha rejeitada (até MAX_REPORTED_ERRORS)."""
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _normalize(value):
+    """Remove acentos, espaços extras e caixa para comparações."""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return value.strip().lower()
+
+
+def parse_csv(stream):
+    """
+    Lê um CSV linha a linha e produz um dicionário por transação.
+
+    O cabeçalho é obrigatório e aceita nomes em inglês ou português
+    (`date`/`data`, `description`/`descricao`, `amount`/`valor`,
+    `type`/`tipo`, `account`/`conta`, `category`/`categoria`). O
+    delimitador (vírgula ou ponto e vírgula) é detectado no cabeçalho, e
+    o apóstrofo que a exportação põe antes de fórmulas (ver
+    `exporters.csv_text`) é removido.
+
+    Args:
+        stream: Arquivo de texto aberto
+
+    Yields:
+        dict: Valores brutos da linha, com a chave `line` (número da
+        linha no arquivo)
+    """
+    header_line = stream.readline()
+    delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    keys = [CSV_HEADER_ALIASES.get(_normalize(name)) for name in header]
+
+    reader = csv.reader(stream, delimiter=delimiter)
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+
+        row = {'line': reader.line_num + 1}
+        for key, value in zip(keys, values):
+            if key:
+                row[key] = _unescape_csv_text(value.strip())
+        yield row
+
+
+def _unescape_csv_text(value):
+    """Desfaz o escape de `exporters.csv_text`."""
+    if value.startswith("'") and value[1:].startswith(CSV_ESCAPED_PREFIXES):
+        return value[1:]
+    return value
+
+
+def _iter_ofx_tags(stream, chunk_size=64 * 1024):
+    """
+    Quebra um arquivo OFX (SGML ou XML) em pares (tag, valor).
+
+    Lê blocos de tamanho fixo, então funciona mesmo quando o arquivo
+    inteiro está em uma única linha.
+    """
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parts = (pending + chunk).split('<')
+        pending = parts.pop()
+        for part in parts:
+            tag, separator, value = part.partition('>')
+            if separator:
+                yield tag.strip().upper(), value.strip()
+
+    tag, separator, value = pending.partition('>')
+    if separator:
+        yield tag.strip().upper(), value.strip()
+
+
+def parse_ofx(stream):
+    """
+    Lê os lançamentos (`<STMTTRN>`) de um extrato OFX.
+
+    O tipo é inferido pelo sinal de `<TRNAMT>` e a descrição vem de
+    `<MEMO>` ou, na falta dele, de `<NAME>`.
+
+    Args:
+        stream: Arquivo de texto aberto
+
+    Yields:
+        dict: Valores brutos do lançamento, com a chave `line` (posição
+        do lançamento no extrato)
+    """
+    current = None
+    position = 0
+
+    for tag, value in _iter_ofx_tags(stream):
+        if tag == 'STMTTRN':
+            current = {}
+        elif tag == '/STMTTRN' and current is not None:
+            position += 1
+            yield {
+                'line': position,
+                'date': current.get('DTPOSTED', ''),
+                'amount': current.get('TRNAMT', ''),
+                'description': (
+                    current.get('MEMO') or current.get('NAME') or ''
+                ),
+            }
+            current = None
+        elif current is not None and not tag.startswith('/'):
+            current[tag] = value
+
+
+def parse_rows(stream, file_format):
+    """Seleciona o parser adequado para o formato informado."""
+    if file_format == OFX:
+        return parse_ofx(stream)
+    return parse_csv(stream)
+
+
+def parse_amount(value):
+    """
+    Converte um valor textual ("1.234,56", "1,234.56", "-50.00", "R$ 10")
+    em Decimal.
+
+    Com os dois separadores, o último é o decimal e o outro separa os
+    milhares. Com um só separador repetido ("1.234.567"), ele separa os
+    milhares; usado uma vez, é o decimal, exceto quando seguido de
+    exatamente três dígitos ("1,000"), caso ambíguo entre os formatos
+    brasileiro e inglês que é rejeitado em vez de adivinhado.
+    """
+    value = (value or '').replace('R$', '').replace(' ', '').strip()
+    value = _normalize_separators(value)
+
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ImportRowError(f'Valor inválido: "{value}".')
+
+    if not amount.is_finite():
+        raise ImportRowError(f'Valor inválido: "{value}".')
+    return amount
+
+
+def _normalize_separators(value):
+    """Troca os separadores de `value` pelo formato aceito por Decimal."""
+    last_comma = value.rfind(',')
+    last_dot = value.rfind('.')
+    if last_comma < 0 and last_dot < 0:
+        return value
+
+    if last_comma >= 0 and last_dot >= 0:
+        decimal_mark = ',' if last_comma > last_dot else '.'
+        thousands_mark = '.' if decimal_mark == ',' else ','
+        pattern = (
+            rf'[+-]?\d{{1,3}}(?:{re.escape(thousands_mark)}\d{{3}})+'
+            rf'{re.escape(decimal_mark)}\d+'
+        )
+        if not re.fullmatch(pattern, value):
+            raise ImportRowError(f'Valor inválido: "{value}".')
+        return value.replace(thousands_mark, '').replace(decimal_mark, '.')
+
+    mark = ',' if last_comma >= 0 else '.'
+    if value.count(mark) > 1:
+        pattern = rf'[+-]?\d{{1,3}}(?:{re.escape(mark)}\d{{3}})+'
+        if not re.fullmatch(pattern, value):
+            raise ImportRowError(f'Valor inválido: "{value}".')
+        return value.replace(mark, '')
+
+    if len(value) - value.index(mark) - 1 == 3:
+        raise ImportRowError(
+            f'Valor ambíguo: "{value}". Informe os centavos '
+            '(ex.: "1.000,00" ou "1,000.00").'
+        )
+    return value.replace(mark, '.')
+
+
+def parse_date(value):
+    """
+    Converte datas nos formatos AAAA-MM-DD, DD/MM/AAAA ou AAAAMMDD (OFX,
+    com hora e fuso opcionais, que são ignorados).
+    """
+    value = (value or '').strip()
+
+    try:
+        if len(value) == 10 and value[2] == '/' and value[5] == '/':
+            return date(int(value[6:]), int(value[3:5]), int(value[:2]))
+        ofx_date = OFX_DATE_PATTERN.fullmatch(value)
+        if ofx_date:
+            return datetime.strptime(ofx_date.group(1), '%Y%m%d').date()
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f'Data inválida: "{value}".')
+
+
+class TransactionImporter:
+    """
+    Importa transações de um usuário em lotes.
+
+    Contas ativas e categorias do usuário são carregadas uma única vez
+    (ou recebidas prontas em `lookups`, ver `core.lookups`) em
+    dicionários indexados por id e por nome. Cada linha válida vira uma
+    `Transaction` acumulada em memória até completar `batch_size` e então
+    gravada com `bulk_create`. Como `bulk_create` não dispara signals, os
+    deltas são somados por conta e dia e gravados ao final (um UPDATE de
+    saldo por conta, mais os resumos diários e mensais), na mesma
+    transação do banco que os inserts.
+
+    Linhas inválidas são ignoradas e descritas em `ImportResult.errors`.
+    Assim como no lançamento manual, a data não pode estar no futuro, o
+    valor deve ser positivo, a categoria deve ser do mesmo tipo da
+    transação e a despesa não pode superar o saldo da conta. O saldo
+    considerado é o atual mais as linhas já aceitas do arquivo, na ordem
+    em que aparecem.
+    """
+
+    def __init__(
+        self,
+        user,
+        account=None,
+        income_category=None,
+        expense_category=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        progress_callback=None,
+        using=DEFAULT_DB_ALIAS,
+        lookups=None,
+    ):
+        self.user = user
+        self.default_account = account
+        self.default_categories = {
+            Transaction.INCOME: income_category,
+            Transaction.EXPENSE: expense_category,
+        }
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.using = using
+        self.today = timezone.localdate()
+
+        if lookups is None:
+            lookups = UserLookups(user, use_cache=False, using=using)
+
+        self.accounts_by_id = {}
+        self.accounts_by_name = {}
+        for account_obj in lookups.active_accounts.values():
+            self.accounts_by_id[str(account_obj.pk)] = account_obj
+            self.accounts_by_name[_normalize(account_obj.name)] = account_obj
+
+        self.categories_by_id = {}
+        self.categories_by_name = {}
+        for category_obj in lookups.categories.values():
+            self.categories_by_id[str(category_obj.pk)] = category_obj
+            self.categories_by_name[_normalize(category_obj.name)] = (
+                category_obj
+            )
+
+    def run(self, rows):
+        """
+        Valida e grava as linhas produzidas por um parser.
+
+        Args:
+            rows: Iterável de dicionários (ver `parse_csv`/`parse_ofx`)
+
+        Returns:
+            ImportResult: Totais e erros da importação
+        """
+        result = ImportResult()
+        batch = []
+
+        with defer_balance_updates(using=self.using) as balances:
+            available = self._available_balances()
+            for row in rows:
+                result.processed += 1
+                try:
+                    transaction = self.build_transaction(row)
+                    self._reserve_balance(transaction, available)
+                except ImportRowError as error:
+                    result.add_error(row.get('line'), str(error))
+                    continue
+
+                batch.append(transaction)
+                balances.add(
+                    transaction_values(transaction),
+                    user_id=self.user.pk,
+                )
+
+                if len(batch) >= self.batch_size:
+                    self._write_batch(batch, result)
+                    batch = []
+
+            if batch:
+                self._write_batch(batch, result)
+
+        return result
+
+    def _available_balances(self):
+        """
+        Saldo atual de cada conta, lido do banco (as contas podem vir das
+        consultas em cache, com um saldo anterior às últimas transações).
+        """
+        account_ids = {
+            account_obj.pk for account_obj in self.accounts_by_id.values()
+        }
+        if self.default_account is not None:
+            account_ids.add(self.default_account.pk)
+
+        return dict(
+            Account.objects.using(self.using).filter(
+                pk__in=account_ids,
+            ).values_list('pk', 'balance')
+        )
+
+    def _reserve_balance(self, transaction, available):
+        """
+        Aplica a transação ao saldo disponível da conta.
+
+        Raises:
+            ImportRowError: Se a despesa superar o saldo disponível
+        """
+        balance = available[transaction.account_id]
+        if transaction.transaction_type == Transaction.INCOME:
+            available[transaction.account_id] = balance + transaction.amount
+            return
+
+        if transaction.amount > balance:
+            raise ImportRowError(
+                'Saldo insuficiente na conta para esta despesa.'
+            )
+        available[transaction.account_id] = balance - transaction.amount
+
+    def _write_batch(self, batch, result):
+        """Insere um lote com `bulk_create` e reporta o progresso."""
+        Transaction.objects.using(self.using).bulk_create(batch)
+        result.created += len(batch)
+
+        if self.progress_callback:
+            self.progress_callback(result)
+
+    def build_transaction(self, row):
+        """
+        Converte uma linha bruta em uma `Transaction` não salva.
+
+        Raises:
+            ImportRowError: Se algum campo for inválido
+        """
+        transaction_date = parse_date(row.get('date'))
+        if transaction_date > self.today:
+            raise ImportRowError(
+                'A data da transação não pode estar no futuro.'
+            )
+
+        amount = parse_amount(row.get('amount'))
+        transaction_type = self._resolve_type(row.get('type'), amount)
+        amount = abs(amount)
+        if amount < Decimal('0.01'):
+            raise ImportRowError(
+                'O valor da transação deve ser maior que zero.'
+            )
+        if amount >= MAX_AMOUNT:
+            raise ImportRowError(f'Valor muito alto: "{amount}".')
+
+        account = self._resolve_account(row.get('account'))
+        category = self._resolve_category(
+            row.get('category'),
+            transaction_type,
+        )
+
+        return Transaction(
+            user_id=self.user.pk,
+            account_id=account.pk,
+            category_id=category.pk,
+            transaction_type=transaction_type,
+            amount=amount.quantize(Decimal('0.01')),
+            transaction_date=transaction_date,
+            description=row.get('description', ''),
+        )
+
+    def _resolve_type(self, value, amount):
+        """Usa a coluna de tipo ou, se vazia, o sinal do valor."""
+        if value:
+            transaction_type = TYPE_ALIASES.get(_normalize(value))
+            if transaction_type is None:
+                raise ImportRowError(f'Tipo inválido: "{value}".')
+            return transaction_type
+
+        return Transaction.EXPENSE if amount < 0 else Transaction.INCOME
+
+    def _resolve_account(self, value):
+        """Busca a conta por id ou nome; usa a conta padrão se vazio."""
+        if not value:
+            if self.default_account is None:
+                raise ImportRowError('Conta não informada.')
+            return self.default_account
+
+        account = (
+            self.accounts_by_id.get(value)
+            or self.accounts_by_name.get(_normalize(value))
+        )
+        if account is None:
+            raise ImportRowError(f'Conta não encontrada: "{value}".')
+        return account
+
+    def _resolve_category(self, value, transaction_type):
+        """Busca a categoria por id ou nome e valida o tipo."""
+        if not value:
+            category = self.default_categories[transaction_type]
+            if category is None:
+                raise ImportRowError('Categoria não informada.')
+        else:
+            category = (
+                self.categories_by_id.get(value)
+                or self.categories_by_name.get(_normalize(value))
+            )
+            if category is None:
+                raise ImportRowError(
+                    f'Categoria não encontrada: "{value}".'
+                )
+
+        if category.category_type != transaction_type:
+            raise ImportRowError(
+                f'A categoria "{category.name}" não corresponde ao tipo '
+                'da transação.'
+            )
+        return category
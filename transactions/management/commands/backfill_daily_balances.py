@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Account
+from core.cache import bump_data_version
+from transactions.balances import rebuild_daily_balances
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Recria os resumos diários de saldo a partir das transações."""
+
+    help = (
+        'Recria a tabela de saldos diários (AccountDailyBalance) de cada '
+        'conta a partir do saldo de abertura e das transações.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Restringe às contas do usuário com este e-mail.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Contas por lote (padrão: {DEFAULT_CHUNK_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.order_by('pk')
+
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(email=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(
+                    f'Usuário não encontrado: {options["user"]}'
+                )
+            accounts = accounts.filter(user=user)
+
+        chunk_size = options['chunk_size']
+        account_count = 0
+        row_count = 0
+        last_pk = 0
+
+        while True:
+            ids = list(
+                accounts.filter(pk__gt=last_pk).values_list(
+                    'pk',
+                    flat=True,
+                )[:chunk_size]
+            )
+            if not ids:
+                break
+
+            last_pk = ids[-1]
+            account_count += len(ids)
+            row_count += rebuild_daily_balances(ids)
+            bump_data_version(account_ids=ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{row_count} saldos diários gerados para '
+                f'{account_count} contas.'
+            )
+        )
@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.importers import (
+    CSV,
+    DEFAULT_BATCH_SIZE,
+    FORMAT_CHOICES,
+    OFX,
+    TransactionImporter,
+    parse_rows,
+)
+
+
+class Command(BaseCommand):
+    """Importa transações de um arquivo CSV ou OFX para um usuário."""
+
+    help = (
+        'Importa transações de um arquivo CSV ou OFX em lotes, '
+        'atualizando o saldo de cada conta uma única vez.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Caminho do arquivo CSV ou OFX.')
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='E-mail do usuário dono das transações.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=[value for value, _ in FORMAT_CHOICES],
+            help='Formato do arquivo (padrão: pela extensão).',
+        )
+        parser.add_argument(
+            '--account',
+            help='Conta padrão (id ou nome); obrigatória para OFX.',
+        )
+        parser.add_argument(
+            '--income-category',
+            help='Categoria padrão para entradas (id ou nome).',
+        )
+        parser.add_argument(
+            '--expense-category',
+            help='Categoria padrão para saídas (id ou nome).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Linhas por bulk_create (padrão: {DEFAULT_BATCH_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'Arquivo não encontrado: {path}')
+
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Usuário não encontrado: {options["user"]}')
+
+        file_format = options['format'] or (
+            OFX if path.suffix.lower() == '.ofx' else CSV
+        )
+        account = self._lookup(
+            Account.objects.filter(user=user, is_active=True),
+            options['account'],
+            'Conta',
+        )
+        if file_format == OFX and account is None:
+            raise CommandError('Informe --account para arquivos OFX.')
+
+        importer = TransactionImporter(
+            user,
+            account=account,
+            income_category=self._lookup(
+                Category.objects.filter(
+                    user=user,
+                    category_type=Category.INCOME,
+                ),
+                options['income_category'],
+                'Categoria de entrada',
+            ),
+            expense_category=self._lookup(
+                Category.objects.filter(
+                    user=user,
+                    category_type=Category.EXPENSE,
+                ),
+                options['expense_category'],
+                'Categoria de saída',
+            ),
+            batch_size=options['batch_size'],
+            progress_callback=self._report_progress,
+        )
+
+        with path.open(encoding='utf-8-sig', newline='') as stream:
+            result = importer.run(parse_rows(stream, file_format))
+
+        for line, message in result.errors:
+            self.stderr.write(f'Linha {line}: {message}')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{result.created} transações importadas, '
+                f'{result.skipped} linhas ignoradas.'
+            )
+        )
+
+    def _report_progress(self, result):
+        self.stdout.write(
+            f'{result.processed} linhas processadas, '
+            f'{result.created} importadas...'
+        )
+
+    @staticmethod
+    def _lookup(queryset, value, label):
+        """Busca um objeto por id ou nome dentro do queryset."""
+        if not value:
+            return None
+
+        lookup = {'pk': value} if value.isdigit() else {'name': value}
+        try:
+            return queryset.get(**lookup)
+        except queryset.model.DoesNotExist:
+            raise CommandError(f'{label} não encontrada: {value}')
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import bump_data_version
+from transactions.summaries import rebuild_monthly_summaries
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Recria os resumos mensais a partir das transações."""
+
+    help = (
+        'Recria a tabela de resumos mensais (MonthlySummary) de cada '
+        'usuário a partir das transações.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Restringe ao usuário com este e-mail.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Usuários por lote (padrão: {DEFAULT_CHUNK_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+
+        if options['user']:
+            users = users.filter(email=options['user'])
+            if not users.exists():
+                raise CommandError(
+                    f'Usuário não encontrado: {options["user"]}'
+                )
+
+        chunk_size = options['chunk_size']
+        user_count = 0
+        row_count = 0
+        last_pk = 0
+
+        while True:
+            ids = list(
+                users.filter(pk__gt=last_pk).values_list(
+                    'pk',
+                    flat=True,
+                )[:chunk_size]
+            )
+            if not ids:
+                break
+
+            last_pk = ids[-1]
+            user_count += len(ids)
+            row_count += rebuild_monthly_summaries(ids)
+            bump_data_version(user_ids=ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{row_count} resumos mensais gerados para '
+                f'{user_count} usuários.'
+            )
+        )
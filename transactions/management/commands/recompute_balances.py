@@ -0,0 +1,150 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from accounts.models import Account
+from core.cache import bump_data_version
+from transactions.models import Transaction
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Recalcula Account.balance a partir do ledger de transações."""
+
+    help = (
+        'Recalcula o saldo de cada conta como saldo de abertura + '
+        'entradas - saídas e corrige os valores divergentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas lista as divergências, sem gravar correções.',
+        )
+        parser.add_argument(
+            '--user',
+            help='Restringe às contas do usuário com este e-mail.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Contas por lote (padrão: {DEFAULT_CHUNK_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(email=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(
+                    f'Usuário não encontrado: {options["user"]}'
+                )
+            accounts = accounts.filter(user=user)
+
+        dry_run = options['dry_run']
+        chunk_size = options['chunk_size']
+        checked = 0
+        corrected = 0
+        last_pk = 0
+
+        while True:
+            with transaction.atomic():
+                chunk = self._load_chunk(accounts, last_pk, chunk_size)
+                if not chunk:
+                    break
+
+                last_pk = chunk[-1][0]
+                checked += len(chunk)
+                fixes = self._find_fixes(chunk)
+                corrected += len(fixes)
+
+                if fixes and not dry_run:
+                    Account.objects.bulk_update(
+                        fixes,
+                        ['balance', 'updated_at'],
+                    )
+                    # bulk_update skips signals, so cached totals would
+                    # keep showing the drifted balances
+                    bump_data_version(account_ids=[fix.pk for fix in fixes])
+
+        verb = 'divergentes' if dry_run else 'corrigidas'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{checked} contas verificadas, {corrected} {verb}.'
+            )
+        )
+
+    @staticmethod
+    def _load_chunk(accounts, last_pk, chunk_size):
+        """
+        Lê o próximo lote de contas com o saldo calculado pelo ledger.
+
+        As linhas das contas são travadas antes de somar o ledger e assim
+        ficam até o fim do lote: signals concorrentes esperam, e a soma não
+        perde transações gravadas entre a leitura e a correção. Uma única
+        query agrupada soma entradas e saídas por conta.
+        """
+        ids = list(
+            accounts.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk',
+                flat=True,
+            )[:chunk_size]
+        )
+        if not ids:
+            return []
+
+        rows = list(
+            Account.objects.select_for_update().filter(
+                pk__in=ids,
+            ).order_by('pk').values_list('pk', 'balance', 'opening_balance')
+        )
+
+        ledger = {
+            row['account_id']: (
+                (row['income'] or Decimal('0'))
+                - (row['expense'] or Decimal('0'))
+            )
+            for row in Transaction.objects.filter(
+                account_id__in=ids,
+            ).values('account_id').annotate(
+                income=Sum(
+                    'amount',
+                    filter=Q(transaction_type=Transaction.INCOME),
+                ),
+                expense=Sum(
+                    'amount',
+                    filter=Q(transaction_type=Transaction.EXPENSE),
+                ),
+            ).order_by()
+        }
+
+        return [
+            (pk, balance, opening_balance + ledger.get(pk, Decimal('0')))
+            for pk, balance, opening_balance in rows
+        ]
+
+    def _find_fixes(self, chunk):
+        """Monta instâncias mínimas de Account para os saldos divergentes."""
+        now = timezone.now()
+        fixes = []
+
+        for pk, stored, expected in chunk:
+            if stored == expected:
+                continue
+
+            self.stdout.write(
+                f'Conta #{pk}: saldo armazenado {stored}, '
+                f'calculado {expected}.'
+            )
+            fixes.append(Account(pk=pk, balance=expected, updated_at=now))
+
+        return fixes
@@ -0,0 +1,426 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Account
+from categories.defaults import get_default_categories
+from categories.models import Category
+from profiles.models import Profile
+from transactions.balances import rebuild_daily_balances
+from transactions.models import Transaction
+from transactions.summaries import rebuild_monthly_summaries
+
+DEFAULT_USERS = 1
+DEFAULT_YEARS = 10
+DEFAULT_TRANSACTIONS = 5000
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5000
+REBUILD_CHUNK_SIZE = 500
+
+CENTS = Decimal('0.01')
+
+ACCOUNT_TEMPLATES = [
+    ('Conta Corrente', 'Banco do Brasil', Account.CHECKING),
+    ('Conta Digital', 'Nubank', Account.CHECKING),
+    ('Poupança', 'Caixa Econômica', Account.SAVINGS),
+    ('Carteira', 'Dinheiro', Account.WALLET),
+]
+
+INCOME_DESCRIPTIONS = [
+    'Projeto freelance',
+    'Rendimento da poupança',
+    'Reembolso de despesas',
+    'Venda de item usado',
+    'Bônus anual',
+]
+
+EXPENSE_DESCRIPTIONS = [
+    'Supermercado',
+    'Padaria do bairro',
+    'Restaurante',
+    'Posto de combustível',
+    'Aplicativo de transporte',
+    'Farmácia',
+    'Conta de luz',
+    'Conta de água',
+    'Internet e telefone',
+    'Aluguel do apartamento',
+    'Assinatura de streaming',
+    'Academia',
+    'Livraria',
+    'Cinema',
+    'Loja de roupas',
+    'Presente de aniversário',
+    'Consulta médica',
+    'Mensalidade do curso',
+]
+
+# Typical amounts (median, in R$) drawn for each expense category
+EXPENSE_MEDIANS = [25, 45, 80, 150, 300, 900]
+
+
+class Command(BaseCommand):
+    """Gera uma massa de dados sintética e determinística para benchmarks."""
+
+    help = (
+        'Cria usuários com contas, categorias e transações realistas via '
+        'bulk_create em lotes. Os saldos, resumos diários e mensais são '
+        'calculados a partir das transações geradas. A mesma semente '
+        'gera sempre os mesmos dados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=DEFAULT_USERS,
+            help=f'Usuários a criar (padrão: {DEFAULT_USERS}).',
+        )
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=DEFAULT_TRANSACTIONS,
+            help=(
+                'Transações por usuário '
+                f'(padrão: {DEFAULT_TRANSACTIONS}).'
+            ),
+        )
+        parser.add_argument(
+            '--years',
+            type=int,
+            default=DEFAULT_YEARS,
+            help=f'Anos de histórico (padrão: {DEFAULT_YEARS}).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=DEFAULT_SEED,
+            help=f'Semente dos dados (padrão: {DEFAULT_SEED}).',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=date.fromisoformat,
+            help=(
+                'Última data do histórico, AAAA-MM-DD (padrão: hoje). '
+                'Fixe-a para reproduzir exatamente uma massa anterior.'
+            ),
+        )
+        parser.add_argument(
+            '--email-domain',
+            default='benchmark.finanpy',
+            help='Domínio dos e-mails gerados (padrão: benchmark.finanpy).',
+        )
+        parser.add_argument(
+            '--password',
+            default='benchmark-pass-123',
+            help='Senha de todos os usuários gerados.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Linhas por bulk_create (padrão: {DEFAULT_BATCH_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'transactions', 'years', 'batch_size'):
+            if options[name] < 1:
+                option = name.replace('_', '-')
+                raise CommandError(f'--{option} deve ser maior que zero.')
+
+        started = time.perf_counter()
+        end_date = options['end_date'] or timezone.localdate()
+        start_date = _years_before(end_date, options['years'])
+        batch_size = options['batch_size']
+
+        users = self._create_users(options, batch_size)
+        categories = self._create_categories(users, batch_size)
+
+        account_ids = []
+        transaction_count = 0
+        for index, user in enumerate(users):
+            rng = random.Random(f'{options["seed"]}:{index}')
+            with transaction.atomic():
+                accounts, created = self._seed_user(
+                    rng,
+                    user,
+                    categories[user.pk],
+                    start_date,
+                    end_date,
+                    options['transactions'],
+                    batch_size,
+                )
+            account_ids.extend(account.pk for account in accounts)
+            transaction_count += created
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{user.email}: {created} transações.')
+
+        for chunk in _chunks(account_ids, REBUILD_CHUNK_SIZE):
+            rebuild_daily_balances(chunk)
+        for chunk in _chunks([user.pk for user in users], REBUILD_CHUNK_SIZE):
+            rebuild_monthly_summaries(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(users)} usuários, {len(account_ids)} contas e '
+                f'{transaction_count} transações geradas em '
+                f'{elapsed:.1f}s (semente {options["seed"]}, '
+                f'{start_date:%d/%m/%Y} a {end_date:%d/%m/%Y}).'
+            )
+        )
+
+    def _create_users(self, options, batch_size):
+        """Cria os usuários e perfis; a senha é criptografada uma vez."""
+        user_model = get_user_model()
+        emails = [
+            f'bench{index:05d}@{options["email_domain"]}'
+            for index in range(options['users'])
+        ]
+        if user_model.objects.filter(email__in=emails).exists():
+            raise CommandError(
+                'Já existem usuários de benchmark com estes e-mails; use '
+                'outro --email-domain ou um banco vazio.'
+            )
+
+        password = make_password(options['password'])
+        with transaction.atomic():
+            users = user_model.objects.bulk_create(
+                [
+                    user_model(email=email, username=email, password=password)
+                    for email in emails
+                ],
+                batch_size=batch_size,
+            )
+            Profile.objects.bulk_create(
+                [Profile(user=user) for user in users],
+                batch_size=batch_size,
+            )
+        return users
+
+    def _create_categories(self, users, batch_size):
+        """Cria as categorias padrão de todos os usuários."""
+        defaults = get_default_categories()
+        created = Category.objects.bulk_create(
+            [
+                Category(user=user, **category)
+                for user in users
+                for category in defaults
+            ],
+            batch_size=batch_size,
+        )
+
+        by_user = {user.pk: [] for user in users}
+        for category in created:
+            by_user[category.user_id].append(category)
+        return by_user
+
+    def _seed_user(
+        self,
+        rng,
+        user,
+        categories,
+        start_date,
+        end_date,
+        count,
+        batch_size,
+    ):
+        """
+        Gera as contas e transações de um usuário.
+
+        As transações são sorteadas em memória; os saldos de cada conta
+        são somados nessa mesma passagem e as contas são gravadas já com
+        o saldo final (saldo de abertura + entradas - saídas).
+
+        Returns:
+            tuple: Contas criadas e quantidade de transações
+        """
+        income_categories = [
+            category for category in categories
+            if category.category_type == Category.INCOME
+        ]
+        expense_categories = [
+            category for category in categories
+            if category.category_type == Category.EXPENSE
+        ]
+        if not income_categories or not expense_categories:
+            raise CommandError(
+                'As categorias padrão precisam ter ao menos uma de '
+                'receita e uma de despesa.'
+            )
+
+        templates = ACCOUNT_TEMPLATES[:rng.randint(2, len(ACCOUNT_TEMPLATES))]
+        account_weights = [6] + [rng.randint(1, 3) for _ in templates[1:]]
+        openings = [Decimal(rng.randint(0, 5000)) for _ in templates]
+
+        rows = _generate_rows(
+            rng,
+            income_categories,
+            expense_categories,
+            len(templates),
+            account_weights,
+            start_date,
+            end_date,
+            count,
+        )
+
+        ledgers = [Decimal('0')] * len(templates)
+        for account_index, _, transaction_type, amount, _, _ in rows:
+            if transaction_type == Transaction.INCOME:
+                ledgers[account_index] += amount
+            else:
+                ledgers[account_index] -= amount
+
+        accounts = []
+        for (name, bank_name, account_type), opening, ledger in zip(
+            templates,
+            openings,
+            ledgers,
+        ):
+            # Cover any overdraft with the opening balance
+            if opening + ledger < 0:
+                opening = -ledger + Decimal(rng.randint(0, 500))
+            accounts.append(Account(
+                user=user,
+                name=name,
+                bank_name=bank_name,
+                account_type=account_type,
+                opening_balance=opening,
+                balance=opening + ledger,
+            ))
+        Account.objects.bulk_create(accounts)
+
+        for batch in _chunks(rows, batch_size):
+            Transaction.objects.bulk_create([
+                Transaction(
+                    user=user,
+                    account=accounts[account_index],
+                    category=category,
+                    transaction_type=transaction_type,
+                    amount=amount,
+                    transaction_date=transaction_date,
+                    description=description,
+                )
+                for (
+                    account_index,
+                    category,
+                    transaction_type,
+                    amount,
+                    transaction_date,
+                    description,
+                ) in batch
+            ])
+
+        return accounts, len(rows)
+
+
+def _generate_rows(
+    rng,
+    income_categories,
+    expense_categories,
+    account_count,
+    account_weights,
+    start_date,
+    end_date,
+    count,
+):
+    """
+    Sorteia as transações de um usuário, em ordem cronológica.
+
+    Há um salário mensal na conta principal, entradas esporádicas nas
+    demais categorias de receita e despesas distribuídas entre as
+    categorias com pesos e valores típicos próprios. As despesas somam
+    de 75% a 95% das entradas.
+
+    Returns:
+        list: Tuplas (índice da conta, categoria, tipo, valor, data,
+        descrição)
+    """
+    span = (end_date - start_date).days
+
+    def random_date():
+        return start_date + timedelta(days=rng.randint(0, span))
+
+    # Monthly salary on the 5th (or the first day in range)
+    salary_category = income_categories[0]
+    salary = Decimal(rng.randint(30, 150) * 100)
+    month = start_date.replace(day=1)
+    paydays = []
+    while month <= end_date:
+        payday = max(month.replace(day=5), start_date)
+        if payday <= end_date:
+            paydays.append(payday)
+        month = (month + timedelta(days=32)).replace(day=1)
+    paydays = paydays[-count:]
+
+    incomes = [
+        (0, salary_category, Transaction.INCOME, salary, payday,
+         'Salário mensal')
+        for payday in paydays
+    ]
+
+    remaining = count - len(incomes)
+    extra_incomes = min(remaining, round(remaining * 0.05))
+    extra_categories = income_categories[1:] or income_categories
+    for _ in range(extra_incomes):
+        amount = salary * Decimal(rng.lognormvariate(-1.5, 0.6))
+        incomes.append((
+            rng.randrange(account_count),
+            rng.choice(extra_categories),
+            Transaction.INCOME,
+            max(amount.quantize(CENTS), CENTS),
+            random_date(),
+            rng.choice(INCOME_DESCRIPTIONS),
+        ))
+
+    category_weights = [rng.random() + 0.2 for _ in expense_categories]
+    medians = [rng.choice(EXPENSE_MEDIANS) for _ in expense_categories]
+    expenses = []
+    for _ in range(remaining - extra_incomes):
+        index = rng.choices(
+            range(len(expense_categories)),
+            weights=category_weights,
+        )[0]
+        expenses.append([
+            rng.choices(range(account_count), weights=account_weights)[0],
+            expense_categories[index],
+            Transaction.EXPENSE,
+            Decimal(medians[index] * rng.lognormvariate(0, 0.6)),
+            random_date(),
+            rng.choice(EXPENSE_DESCRIPTIONS),
+        ])
+
+    # Scale expenses to a realistic share of the income
+    income_total = sum(row[3] for row in incomes)
+    expense_total = sum(row[3] for row in expenses)
+    if expense_total:
+        factor = (
+            income_total * Decimal(rng.uniform(0.75, 0.95)) / expense_total
+        )
+        for row in expenses:
+            row[3] = max((row[3] * factor).quantize(CENTS), CENTS)
+
+    rows = incomes + [tuple(row) for row in expenses]
+    rows.sort(key=lambda row: row[4])
+    return rows
+
+
+def _years_before(day, years):
+    """Mesma data `years` anos antes (29/02 vira 28/02)."""
+    try:
+        return day.replace(year=day.year - years) + timedelta(days=1)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28) + timedelta(days=1)
+
+
+def _chunks(items, size):
+    """Divide uma lista em fatias de até `size` itens."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
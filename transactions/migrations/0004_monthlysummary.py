@@ -0,0 +1,76 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+BATCH_SIZE = 1000
+
+
+def backfill_monthly_summaries(apps, schema_editor):
+    """
+    Gera o resumo mensal por usuário, categoria e tipo das transações.
+    """
+    MonthlySummary = apps.get_model('transactions', 'MonthlySummary')
+    Transaction = apps.get_model('transactions', 'Transaction')
+    db_alias = schema_editor.connection.alias
+
+    rows = Transaction.objects.using(db_alias).annotate(
+        year_month=TruncMonth('transaction_date'),
+    ).values(
+        'year_month',
+        'category_id',
+        'transaction_type',
+        user_id=F('account__user_id'),
+    ).annotate(
+        total=Sum('amount'),
+        count=Count('pk'),
+    ).order_by()
+
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(MonthlySummary(**row))
+        if len(batch) >= BATCH_SIZE:
+            MonthlySummary.objects.using(db_alias).bulk_create(batch)
+            batch = []
+
+    if batch:
+        MonthlySummary.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_category_categories__user_id_f0c68e_idx'),
+        ('transactions', '0003_transaction_transaction_account_984d8b_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_month', models.DateField(verbose_name='Mês')),
+                ('transaction_type', models.CharField(choices=[('income', 'Entrada'), ('expense', 'Saída')], max_length=10, verbose_name='Tipo de Transação')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Quantidade')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='categories.category', verbose_name='Categoria')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Resumo Mensal',
+                'verbose_name_plural': 'Resumos Mensais',
+                'ordering': ['-year_month'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'year_month', 'category', 'transaction_type'), name='unique_monthly_summary')],
+            },
+        ),
+        migrations.RunPython(
+            backfill_monthly_summaries,
+            migrations.RunPython.noop,
+        ),
+    ]
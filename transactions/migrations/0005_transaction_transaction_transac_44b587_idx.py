@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_accountdailybalance'),
+        ('categories', '0002_category_categories__user_id_f0c68e_idx'),
+        ('transactions', '0004_monthlysummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-transaction_date', '-created_at', '-id'], name='transaction_transac_44b587_idx'),
+        ),
+    ]
@@ -0,0 +1,120 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE transactions_transaction
+    ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('portuguese', coalesce(description, ''))
+    ) STORED
+    """,
+    """
+    CREATE INDEX transactions_transaction_search_idx
+    ON transactions_transaction USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS transactions_transaction_search_idx',
+    """
+    ALTER TABLE transactions_transaction
+    DROP COLUMN IF EXISTS search_vector
+    """,
+]
+
+# Later migrations that rebuild the table on SQLite (AlterField and
+# friends) drop these triggers and must run SQLITE_DROP_TRIGGERS and
+# SQLITE_CREATE_TRIGGERS again (see 0009_alter_transaction_user_and_more).
+# 0010_transaction_search_user replaces them with user-scoped triggers
+SQLITE_CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER transactions_transaction_fts_insert
+    AFTER INSERT ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(rowid, description)
+        VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_transaction_fts_delete
+    AFTER DELETE ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(
+            transactions_transaction_fts, rowid, description
+        ) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_transaction_fts_update
+    AFTER UPDATE OF description ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(
+            transactions_transaction_fts, rowid, description
+        ) VALUES ('delete', old.id, old.description);
+        INSERT INTO transactions_transaction_fts(rowid, description)
+        VALUES (new.id, new.description);
+    END
+    """,
+]
+
+SQLITE_DROP_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS transactions_transaction_fts_insert',
+    'DROP TRIGGER IF EXISTS transactions_transaction_fts_delete',
+    'DROP TRIGGER IF EXISTS transactions_transaction_fts_update',
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE transactions_transaction_fts USING fts5(
+        description,
+        content='transactions_transaction',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    *SQLITE_CREATE_TRIGGERS,
+    """
+    INSERT INTO transactions_transaction_fts(transactions_transaction_fts)
+    VALUES ('rebuild')
+    """,
+]
+
+SQLITE_BACKWARD = [
+    *SQLITE_DROP_TRIGGERS,
+    'DROP TABLE IF EXISTS transactions_transaction_fts',
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    """Executa as instruções do banco atual (outros bancos: nada)."""
+    vendor = schema_editor.connection.vendor
+    for statement in statements_by_vendor.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Cria o índice de busca textual adequado ao banco.
+    """
+    _run(schema_editor, {
+        'postgresql': POSTGRESQL_FORWARD,
+        'sqlite': SQLITE_FORWARD,
+    })
+
+
+def drop_search_index(apps, schema_editor):
+    """
+    Remove o índice de busca textual.
+    """
+    _run(schema_editor, {
+        'postgresql': POSTGRESQL_BACKWARD,
+        'sqlite': SQLITE_BACKWARD,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_transaction_transaction_transac_44b587_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
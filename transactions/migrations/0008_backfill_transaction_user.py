@@ -0,0 +1,61 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def backfill_transaction_user(apps, schema_editor):
+    """
+    Copia o dono da conta para `Transaction.user`, em lotes por id.
+
+    A migração não é atômica: cada lote é gravado (e confirmado) por um
+    único UPDATE, sem manter uma transação longa aberta em tabelas
+    grandes.
+    """
+    Account = apps.get_model('accounts', 'Account')
+    Transaction = apps.get_model('transactions', 'Transaction')
+    db_alias = schema_editor.connection.alias
+
+    account_user = Subquery(
+        Account.objects.using(db_alias).filter(
+            pk=OuterRef('account_id'),
+        ).values('user_id')[:1]
+    )
+    pending = Transaction.objects.using(db_alias).filter(
+        user__isnull=True,
+    ).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch_pks = list(
+            pending.filter(pk__gt=last_pk).values_list(
+                'pk',
+                flat=True,
+            )[:BATCH_SIZE]
+        )
+        if not batch_pks:
+            break
+
+        Transaction.objects.using(db_alias).filter(
+            pk__gte=batch_pks[0],
+            pk__lte=batch_pks[-1],
+            user__isnull=True,
+        ).update(user_id=account_user)
+        last_pk = batch_pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0004_accountdailybalance'),
+        ('transactions', '0007_transaction_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_transaction_user,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:02
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Rebuilding the table on SQLite (AlterField) drops its triggers
+search_migration = import_module(
+    'transactions.migrations.0006_transaction_search'
+)
+
+
+def recreate_search_triggers(apps, schema_editor):
+    """
+    Recria os triggers do índice FTS5 depois da reconstrução da tabela.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in search_migration.SQLITE_DROP_TRIGGERS:
+        schema_editor.execute(statement)
+    for statement in search_migration.SQLITE_CREATE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_backfill_transaction_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL, verbose_name='Usuário'),
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_transac_44b587_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-transaction_date', '-created_at', '-id'], name='transaction_user_id_be0d98_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'transaction_type', 'transaction_date'], name='transaction_user_id_fb59de_idx'),
+        ),
+        migrations.RunPython(
+            recreate_search_triggers,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:30
+
+from importlib import import_module
+
+from django.db import migrations
+
+search_migration = import_module(
+    'transactions.migrations.0006_transaction_search'
+)
+
+# The owner is indexed as a token, so MATCH 'user_id : "42" AND ...' only
+# walks that user's rows instead of every user's matches. These triggers
+# supersede the 0006 ones: later migrations that rebuild the table on
+# SQLite must run SQLITE_DROP_TRIGGERS and SQLITE_CREATE_TRIGGERS from here
+SQLITE_CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER transactions_transaction_fts_insert
+    AFTER INSERT ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(rowid, description, user_id)
+        VALUES (new.id, new.description, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_transaction_fts_delete
+    AFTER DELETE ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(
+            transactions_transaction_fts, rowid, description, user_id
+        ) VALUES ('delete', old.id, old.description, old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_transaction_fts_update
+    AFTER UPDATE OF description, user_id ON transactions_transaction BEGIN
+        INSERT INTO transactions_transaction_fts(
+            transactions_transaction_fts, rowid, description, user_id
+        ) VALUES ('delete', old.id, old.description, old.user_id);
+        INSERT INTO transactions_transaction_fts(rowid, description, user_id)
+        VALUES (new.id, new.description, new.user_id);
+    END
+    """,
+]
+
+SQLITE_DROP_TRIGGERS = search_migration.SQLITE_DROP_TRIGGERS
+
+SQLITE_FORWARD = [
+    *search_migration.SQLITE_BACKWARD,
+    """
+    CREATE VIRTUAL TABLE transactions_transaction_fts USING fts5(
+        description,
+        user_id,
+        content='transactions_transaction',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    *SQLITE_CREATE_TRIGGERS,
+    """
+    INSERT INTO transactions_transaction_fts(transactions_transaction_fts)
+    VALUES ('rebuild')
+    """,
+]
+
+SQLITE_BACKWARD = [
+    *search_migration.SQLITE_BACKWARD,
+    *search_migration.SQLITE_FORWARD,
+]
+
+
+def index_search_user(apps, schema_editor):
+    """
+    Inclui o dono da transação no índice FTS5 (apenas SQLite).
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_FORWARD:
+        schema_editor.execute(statement)
+
+
+def unindex_search_user(apps, schema_editor):
+    """
+    Volta ao índice FTS5 apenas com a descrição.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_BACKWARD:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0009_alter_transaction_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_search_user, unindex_search_user),
+    ]
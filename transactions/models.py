@@ -2,13 +2,16 @@
 from decimal import Decimal
 
 # Django imports
+from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models
 
 # Local imports
 from accounts.models import Account
 from categories.models import Category
 
+User = get_user_model()
+
 
 class Transaction(models.Model):
     """
@@ -27,6 +30,16 @@ class Transaction(models.Model):
         (EXPENSE, 'Saída'),
     ]
 
+    # Fields that affect the account balance and the daily/monthly
+    # summaries, tracked since loading
+    BALANCE_FIELDS = (
+        'account_id',
+        'category_id',
+        'amount',
+        'transaction_type',
+        'transaction_date',
+    )
+
     # Foreign Keys
     account = models.ForeignKey(
         Account,
@@ -35,6 +48,15 @@ class Transaction(models.Model):
         verbose_name='Conta'
     )
 
+    # Denormalized from account.user so user-scoped queries skip the join
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='transactions',
+        verbose_name='Usuário',
+        editable=False,
+    )
+
     category = models.ForeignKey(
         Category,
         on_delete=models.PROTECT,
@@ -76,6 +98,13 @@ class Transaction(models.Model):
         indexes = [
             models.Index(fields=['-transaction_date']),
             models.Index(fields=['-created_at']),
+            # User-scoped list/dashboard sort (and cursor pagination)
+            models.Index(
+                fields=['user', '-transaction_date', '-created_at', '-id'],
+            ),
+            models.Index(
+                fields=['user', 'transaction_type', 'transaction_date'],
+            ),
             models.Index(fields=['account', '-transaction_date']),
             models.Index(fields=['account', 'transaction_type']),
             models.Index(fields=['category', 'transaction_type']),
@@ -86,3 +115,166 @@ class Transaction(models.Model):
             f'{self.transaction_type} - {self.amount} - '
             f'{self.transaction_date}'
         )
+
+    def save(self, *args, **kwargs):
+        """
+        Salva a transação mantendo `user` igual ao dono da conta.
+
+        Com a conta já carregada (caso dos formulários) o dono vem dela;
+        caso contrário só há uma query quando a conta mudou ou o usuário
+        ainda não é conhecido.
+        """
+        if Transaction.account.is_cached(self):
+            self.user_id = self.account.user_id
+        elif self.user_id is None or self._account_changed():
+            self.user_id = Account.objects.using(
+                kwargs.get('using') or self._state.db or DEFAULT_DB_ALIAS
+            ).values_list('user_id', flat=True).get(pk=self.account_id)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and (
+            'account' in update_fields or 'account_id' in update_fields
+        ):
+            kwargs['update_fields'] = {*update_fields, 'user'}
+
+        super().save(*args, **kwargs)
+
+    def _account_changed(self):
+        """Indica se a conta mudou desde o carregamento do banco."""
+        original = getattr(self, '_original_values', {})
+        return original.get('account_id', self.account_id) != self.account_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Guarda os valores originais dos campos de saldo ao hidratar.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.store_original_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """
+        Recarrega do banco e atualiza os valores originais rastreados.
+        """
+        super().refresh_from_db(
+            using=using,
+            fields=fields,
+            from_queryset=from_queryset,
+        )
+        self.store_original_values(fields)
+
+    def store_original_values(self, fields=None):
+        """
+        Registra o estado atual dos campos de saldo como o original.
+
+        Args:
+            fields: Restringe a atualização a estes campos (opcional)
+        """
+        original = getattr(self, '_original_values', {})
+        deferred = self.get_deferred_fields()
+
+        for attname in self.BALANCE_FIELDS:
+            field_name = attname.removesuffix('_id')
+            if fields is not None and (
+                field_name not in fields and attname not in fields
+            ):
+                continue
+            if attname in deferred:
+                original.pop(attname, None)
+            else:
+                original[attname] = getattr(self, attname)
+
+        self._original_values = original
+
+    def get_original_values(self):
+        """
+        Retorna os valores originais dos campos de saldo.
+
+        Returns:
+            dict | None: Valores carregados do banco, ou None se a
+            instância não foi carregada do banco com todos eles.
+        """
+        original = getattr(self, '_original_values', {})
+        if all(attname in original for attname in self.BALANCE_FIELDS):
+            return original
+        return None
+
+    def has_balance_changes(self):
+        """
+        Indica se algum campo que afeta o saldo mudou desde o carregamento.
+        """
+        original = self.get_original_values()
+        if original is None:
+            return True
+        return any(
+            original[attname] != getattr(self, attname)
+            for attname in self.BALANCE_FIELDS
+        )
+
+
+class MonthlySummary(models.Model):
+    """
+    Total mensal das transações de um usuário por categoria e tipo.
+
+    Mantido pelos signals de `Transaction`; serve o dashboard sem varrer
+    as transações.
+    """
+
+    # Foreign Keys
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='monthly_summaries',
+        verbose_name='Usuário'
+    )
+
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='monthly_summaries',
+        verbose_name='Categoria'
+    )
+
+    # Main fields
+    # First day of the month
+    year_month = models.DateField('Mês')
+
+    transaction_type = models.CharField(
+        'Tipo de Transação',
+        max_length=10,
+        choices=Transaction.TRANSACTION_TYPE_CHOICES
+    )
+
+    total = models.DecimalField(
+        'Total',
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+
+    count = models.PositiveIntegerField('Quantidade', default=0)
+
+    # MANDATORY timestamps
+    created_at = models.DateTimeField('Criado em', auto_now_add=True)
+    updated_at = models.DateTimeField('Atualizado em', auto_now=True)
+
+    class Meta:
+        """Define unicidade e índices do resumo mensal."""
+
+        ordering = ['-year_month']
+        verbose_name = 'Resumo Mensal'
+        verbose_name_plural = 'Resumos Mensais'
+        constraints = [
+            # Also serves the (user, year_month) range reads
+            models.UniqueConstraint(
+                fields=['user', 'year_month', 'category', 'transaction_type'],
+                name='unique_monthly_summary',
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f'{self.year_month:%m/%Y} - {self.category_id} - '
+            f'{self.transaction_type} - {self.total}'
+        )
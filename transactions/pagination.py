@@ -0,0 +1,285 @@
+"""
+Paginação por cursor (keyset) para listas de transações.
+
+Em vez de OFFSET/LIMIT, cada página filtra as linhas posteriores (ou
+anteriores) à última linha exibida, comparando a tupla de ordenação
+completa, por exemplo (`transaction_date`, `created_at`, `id`). Com um
+índice nessas colunas, a página N custa o mesmo que a página 1, e nenhum
+`COUNT(*)` é executado.
+
+Os cursores são opacos para o cliente: JSON em base64 com a direção, a
+ordenação, um resumo (hash) dos filtros (`filters_digest`) e os valores
+da linha de referência. Um cursor reaproveitado com outros filtros ou
+outra ordenação é rejeitado (`InvalidCursor`).
+
+`PrecountedPaginator` atende o modo tradicional (por número de página)
+reaproveitando a contagem calculada junto com as estatísticas da lista.
+"""
+# Standard library
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from decimal import Decimal
+
+# Django imports
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou gerado para outra ordenação ou filtros."""
+
+
+def filters_digest(params):
+    """
+    Resumo dos filtros de uma listagem, guardado no cursor.
+
+    Args:
+        params: Pares (nome, valor) dos parâmetros que definem as linhas
+            e a ordem da listagem
+
+    Returns:
+        str: Hash curto, independente da ordem dos parâmetros
+    """
+    canonical = json.dumps(sorted(params), separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def _serialize(value):
+    """Converte um valor de ordenação em um tipo aceito pelo JSON."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(direction, ordering, values, filters=''):
+    """
+    Gera o cursor opaco para a linha com os `values` informados.
+    """
+    payload = json.dumps(
+        {
+            'd': direction,
+            'o': list(ordering),
+            'f': filters,
+            'v': [_serialize(value) for value in values],
+        },
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering, filters=''):
+    """
+    Lê um cursor gerado por `encode_cursor`.
+
+    Returns:
+        tuple: (direção, valores)
+
+    Raises:
+        InvalidCursor: Se o cursor for inválido ou de outra ordenação ou
+            outros filtros
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, cursor_ordering, cursor_filters, values = (
+            payload['d'],
+            payload['o'],
+            payload['f'],
+            payload['v'],
+        )
+    except (
+        binascii.Error,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+        ValueError,
+    ):
+        raise InvalidCursor('Cursor inválido.')
+
+    if (
+        direction not in (NEXT, PREVIOUS)
+        or cursor_ordering != list(ordering)
+        or cursor_filters != filters
+        or not isinstance(values, list)
+        or len(values) != len(ordering)
+    ):
+        raise InvalidCursor('Cursor inválido.')
+    return direction, values
+
+
+def _field_value(obj, field):
+    """Lê `field` (ex.: `account__name`) de uma instância."""
+    for attribute in field.split('__'):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """
+    Monta o filtro das linhas que vêm depois de `values` na ordenação.
+
+    Para (a, b, c) em ordem crescente: a > va OU (a = va E b > vb) OU
+    (a = va E b = vb E c > vc). Campos com `-` comparam com `<`, e
+    `reverse=True` inverte todas as comparações (linhas anteriores).
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        lookup = 'lt' if descending != reverse else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def reverse_ordering(ordering):
+    """Inverte a direção de cada campo da ordenação."""
+    return [
+        field[1:] if field.startswith('-') else f'-{field}'
+        for field in ordering
+    ]
+
+
+class PrecountedPaginator(Paginator):
+    """
+    `Paginator` que reaproveita uma contagem já calculada.
+
+    Quando `count` é informado (ex.: junto com outros agregados da mesma
+    consulta), o `COUNT(*)` do paginator não é executado.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # Overrides the cached_property before it is first computed
+            self.count = count
+
+
+class CursorPage(Sequence):
+    """
+    Página de uma `CursorPaginator`, com os cursores vizinhos.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage: {len(self)} itens>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        """Cursor da página seguinte (None na última página)."""
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.cursor_for(self.object_list[-1], NEXT)
+
+    @property
+    def previous_cursor(self):
+        """Cursor da página anterior (None na primeira página)."""
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.cursor_for(self.object_list[0], PREVIOUS)
+
+
+class CursorPaginator:
+    """
+    Pagina um queryset pela tupla de ordenação, sem OFFSET nem COUNT.
+
+    A ordenação precisa terminar em um campo único (ex.: `id`) para que
+    a posição de cada linha seja inequívoca.
+
+    Args:
+        queryset: Queryset filtrado (a ordenação é reaplicada aqui)
+        per_page: Itens por página
+        ordering: Campos de ordenação, como em `order_by()`
+        filters: Resumo dos filtros do queryset (ver `filters_digest`)
+    """
+
+    def __init__(self, queryset, per_page, ordering, filters=''):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.filters = filters
+
+    def cursor_for(self, obj, direction):
+        """Cursor que aponta para as linhas após (ou antes de) `obj`."""
+        values = [
+            _field_value(obj, field.lstrip('-'))
+            for field in self.ordering
+        ]
+        return encode_cursor(direction, self.ordering, values, self.filters)
+
+    def page(self, cursor=None):
+        """
+        Retorna a página indicada pelo cursor (ou a primeira).
+
+        Raises:
+            InvalidCursor: Se o cursor for inválido
+        """
+        if not cursor:
+            rows = list(
+                self.queryset.order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return CursorPage(
+                rows[:self.per_page],
+                self,
+                has_next=len(rows) > self.per_page,
+                has_previous=False,
+            )
+
+        direction, values = decode_cursor(
+            cursor,
+            self.ordering,
+            self.filters,
+        )
+        backwards = direction == PREVIOUS
+        ordering = (
+            reverse_ordering(self.ordering)
+            if backwards
+            else self.ordering
+        )
+        rows = list(
+            self.queryset.filter(
+                keyset_filter(self.ordering, values, reverse=backwards)
+            ).order_by(*ordering)[:self.per_page + 1]
+        )
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return CursorPage(
+                rows,
+                self,
+                has_next=True,
+                has_previous=has_more,
+            )
+        return CursorPage(rows, self, has_next=has_more, has_previous=True)
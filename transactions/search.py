@@ -0,0 +1,177 @@
+"""
+Busca textual nas descrições das transações.
+
+O índice depende do banco (ver migração `0006_transaction_search`):
+
+- PostgreSQL: coluna gerada `search_vector` (`tsvector`, configuração
+  `portuguese`) com índice GIN, atualizada pelo próprio banco a cada
+  INSERT/UPDATE.
+- SQLite: tabela virtual FTS5 `transactions_transaction_fts` (sem
+  acentos) com a descrição e o dono (`user_id`, ver
+  `0010_transaction_search_user`), mantida por triggers na tabela de
+  transações. Cada consulta ao índice é restrita ao usuário, e a
+  relevância vem de uma única consulta ao índice, materializada
+  (requer SQLite 3.35+). Migrações que reconstroem a tabela no SQLite
+  apagam os triggers e precisam recriá-los (ver
+  `0009_alter_transaction_user_and_more`).
+
+Em outros bancos a busca volta a ser `description__icontains`. Cada
+palavra digitada vira um prefixo ("alu" encontra "aluguel") e todas
+precisam aparecer na descrição. No PostgreSQL, buscas só com stopwords
+("de", "para") viram um tsquery vazio, que não encontraria nada; elas
+também usam `description__icontains`.
+"""
+# Standard library
+import re
+from functools import lru_cache
+
+# Django imports
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'transactions_transaction_fts'
+SEARCH_CONFIG = 'portuguese'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """Separa a busca em palavras, ignorando pontuação e operadores."""
+    return WORD_PATTERN.findall(query or '')
+
+
+def _tsquery(terms):
+    """tsquery do PostgreSQL com cada termo como prefixo."""
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+@lru_cache(maxsize=256)
+def _is_empty_tsquery(using, tsquery):
+    """
+    Indica se o PostgreSQL descarta todos os termos (só stopwords).
+
+    O resultado depende apenas da configuração de busca, então fica em
+    cache no processo.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"SELECT numnode(to_tsquery('{SEARCH_CONFIG}', %s))",
+            [tsquery],
+        )
+        return cursor.fetchone()[0] == 0
+
+
+def uses_text_index(using, terms):
+    """
+    Indica se a busca pelos termos pode usar o índice textual do banco.
+
+    Sem termos, em bancos sem índice ou (no PostgreSQL) com apenas
+    stopwords, a busca usa `description__icontains`.
+    """
+    vendor = connections[using].vendor
+    if not terms or vendor not in ('postgresql', 'sqlite'):
+        return False
+    if vendor == 'postgresql':
+        return not _is_empty_tsquery(using, _tsquery(terms))
+    return True
+
+
+def _fts_query(terms, user_id):
+    """
+    Consulta FTS5 com cada termo como prefixo na descrição, restrita às
+    transações do usuário.
+    """
+    words = ' '.join(f'"{term}"*' for term in terms)
+    return f'user_id : "{user_id}" AND description : ({words})'
+
+
+def _match_sql(vendor, terms, user_id):
+    """
+    Condição SQL (e parâmetros) que casa as transações com os termos.
+    """
+    table = 'transactions_transaction'
+    if vendor == 'postgresql':
+        tsquery = _tsquery(terms)
+        return (
+            f'{table}.search_vector @@ '
+            f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        ), [tsquery]
+
+    return (
+        f'{table}.id IN (SELECT rowid FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s)'
+    ), [_fts_query(terms, user_id)]
+
+
+def _rank_sql(vendor, terms, user_id):
+    """
+    Relevância de cada transação (maior é melhor) e seus parâmetros.
+    """
+    table = 'transactions_transaction'
+    if vendor == 'postgresql':
+        tsquery = _tsquery(terms)
+        return (
+            f'ts_rank({table}.search_vector, '
+            f"to_tsquery('{SEARCH_CONFIG}', %s))"
+        ), [tsquery]
+
+    # bm25() is lower for better matches, so it is negated; the user_id
+    # column weighs 0. The match runs once per query (MATERIALIZED), the
+    # rows then look up their score, instead of one MATCH per row
+    return (
+        f'(WITH matches AS MATERIALIZED ('
+        f'SELECT rowid, -bm25({FTS_TABLE}, 1.0, 0.0) AS score '
+        f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s) '
+        f'SELECT score FROM matches WHERE matches.rowid = {table}.id)'
+    ), [_fts_query(terms, user_id)]
+
+
+def search_transactions(queryset, query, user, with_rank=False):
+    """
+    Filtra as transações cuja descrição contém os termos buscados.
+
+    Args:
+        queryset: Queryset de `Transaction`, já filtrado por `user`
+        query: Texto digitado pelo usuário
+        user: Dono das transações; restringe a consulta ao índice
+        with_rank: Anota `search_rank` (relevância, maior é melhor)
+
+    Returns:
+        QuerySet: Transações encontradas
+    """
+    terms = search_terms(query)
+    vendor = connections[queryset.db].vendor
+
+    if not uses_text_index(queryset.db, terms):
+        queryset = queryset.filter(description__icontains=query)
+    else:
+        sql, params = _match_sql(vendor, terms, user.pk)
+        queryset = queryset.filter(
+            RawSQL(sql, params, output_field=BooleanField())
+        )
+
+    if with_rank:
+        queryset = rank_transactions(queryset, query, user)
+    return queryset
+
+
+def rank_transactions(queryset, query, user):
+    """
+    Anota `search_rank` (relevância, maior é melhor) nas transações.
+
+    Separado do filtro para que agregações sobre o resultado da busca
+    não calculem a relevância de cada linha.
+    """
+    terms = search_terms(query)
+    vendor = connections[queryset.db].vendor
+
+    if not uses_text_index(queryset.db, terms):
+        return queryset.annotate(
+            search_rank=RawSQL('0', [], output_field=FloatField()),
+        )
+
+    sql, params = _rank_sql(vendor, terms, user.pk)
+    return queryset.annotate(
+        search_rank=RawSQL(sql, params, output_field=FloatField()),
+    )
@@ -1,108 +1,78 @@
 # Django imports
-from django.db import transaction
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 # Local imports
+from accounts.models import Account
+from core.cache import bump_data_version
+
+from .balances import (
+    BalanceDeltaBuffer,
+    get_active_buffer,
+    record_transaction_effect,
+    transaction_values,
+)
 from .models import Transaction
+from .summaries import rebuild_monthly_summaries
 
 
 @receiver(pre_save, sender=Transaction)
 def store_old_transaction_data(sender, instance, **kwargs):
     """
-    Armazena dados da transação antes de salvar para detectar mudanças.
+    Garante que a transação conheça seus valores originais antes de salvar.
 
-    Este signal é executado ANTES do save() e armazena o estado anterior
-    da transação para que possamos reverter o saldo corretamente no post_save.
+    Instâncias carregadas do banco já trazem os valores originais dos
+    campos de saldo (ver `Transaction.from_db`), então nenhuma query é
+    feita. Só instâncias montadas à mão com uma pk
+    existente precisam buscar o estado anterior no banco.
     """
-    if instance.pk:  # Apenas para updates (não para creates)
-        try:
-            # Busca a versão antiga da transação do banco de dados
-            old_transaction = Transaction.objects.get(pk=instance.pk)
-
-            # Armazena dados antigos como atributos temporários na instância
-            instance._old_account = old_transaction.account
-            instance._old_amount = old_transaction.amount
-            instance._old_transaction_type = old_transaction.transaction_type
-        except Transaction.DoesNotExist:
-            # Transação não existe no banco (edge case improvável)
-            instance._old_account = None
-            instance._old_amount = None
-            instance._old_transaction_type = None
+    if not instance.pk or instance.get_original_values() is not None:
+        return
+
+    # Busca apenas os campos que afetam o saldo, sem carregar a conta
+    old_values = Transaction.objects.filter(pk=instance.pk).values(
+        *Transaction.BALANCE_FIELDS
+    ).first()
+
+    # Transação inexistente no banco (edge case improvável): trata como
+    # se não houvesse impacto anterior a reverter
+    instance._original_values = old_values or {}
 
 
 @receiver(post_save, sender=Transaction)
-def update_balance_on_save(sender, instance, created, **kwargs):
+def update_balance_on_save(sender, instance, created, using, **kwargs):
     """
     Atualiza o saldo da conta quando uma transação é criada ou atualizada.
 
     Cenários tratados:
-    - CREATE: adiciona/subtrai valor do saldo da conta
-    - UPDATE sem mudança de conta: reverte valor antigo e aplica novo
-    - UPDATE com mudança de conta: reverte na conta antiga e aplica na nova
-    - UPDATE com mudança de tipo: ajusta cálculo conforme novo tipo
-
-    Uses transaction.atomic() para garantir consistência dos dados.
+    - CREATE: aplica o impacto da transação na conta e nos resumos
+      diário e mensal
+    - UPDATE sem mudança em conta, categoria, valor, tipo ou data:
+      apenas incrementa a versão dos dados do usuário
+    - UPDATE com mudança nesses campos: reverte o impacto original e
+      aplica o novo em um único lote, gravando apenas a diferença
+      líquida por conta e dia (nada, se ela for zero)
+
+    O saldo é alterado no banco via F() (balance = balance ± valor),
+    evitando o SELECT extra e a perda de atualizações concorrentes.
+    Dentro de `defer_balance_updates()` os deltas são acumulados e
+    gravados uma vez por conta ao final do lote.
     """
     try:
-        with transaction.atomic():
-            if created:
-                # CENÁRIO 1: Nova transação criada
-                _update_account_balance(
-                    account=instance.account,
-                    amount=instance.amount,
-                    transaction_type=instance.transaction_type,
-                    operation='add'
-                )
-            else:
-                # CENÁRIO 2: Transação atualizada
-
-                # Verifica se há dados da transação antiga armazenados
-                if hasattr(instance, '_old_account') and instance._old_account:
-                    old_account = instance._old_account
-                    old_amount = instance._old_amount
-                    old_transaction_type = instance._old_transaction_type
-
-                    # Verifica se a conta mudou
-                    if old_account.pk != instance.account.pk:
-                        # CENÁRIO 2A: Conta foi alterada
-                        # Reverte o saldo na conta antiga
-                        _update_account_balance(
-                            account=old_account,
-                            amount=old_amount,
-                            transaction_type=old_transaction_type,
-                            operation='remove'
-                        )
-
-                        # Aplica o saldo na conta nova
-                        _update_account_balance(
-                            account=instance.account,
-                            amount=instance.amount,
-                            transaction_type=instance.transaction_type,
-                            operation='add'
-                        )
-                    else:
-                        # CENÁRIO 2B: Mesma conta; valor ou tipo atualizados
-                        # Reverte o valor antigo
-                        _update_account_balance(
-                            account=old_account,
-                            amount=old_amount,
-                            transaction_type=old_transaction_type,
-                            operation='remove'
-                        )
-
-                        # Aplica o novo valor
-                        _update_account_balance(
-                            account=instance.account,
-                            amount=instance.amount,
-                            transaction_type=instance.transaction_type,
-                            operation='add'
-                        )
-
-                    # Limpa atributos temporários
-                    delattr(instance, '_old_account')
-                    delattr(instance, '_old_amount')
-                    delattr(instance, '_old_transaction_type')
+        if created:
+            # CENÁRIO 1: Nova transação criada
+            _record_effect(instance, using)
+        elif instance.has_balance_changes():
+            # CENÁRIO 2: Transação atualizada em campos de saldo
+            original = instance.get_original_values()
+            if original is not None:
+                _apply_balance_changes(instance, original, using)
+        else:
+            # CENÁRIO 3: Só descrição mudou; invalida o cache do usuário
+            _bump_owner_version(instance, using)
+
+        # Os valores salvos passam a ser os originais da instância
+        instance.store_original_values()
 
     except Exception as e:
         # Log do erro (em produção, usar logging adequado)
@@ -111,25 +81,17 @@ def update_balance_on_save(sender, instance, created, **kwargs):
 
 
 @receiver(post_delete, sender=Transaction)
-def update_balance_on_delete(sender, instance, **kwargs):
+def update_balance_on_delete(sender, instance, using, **kwargs):
     """
     Reverte o saldo da conta quando uma transação é deletada.
 
-    Remove o impacto da transação deletada do saldo da conta:
+    Remove o impacto da transação deletada do saldo da conta e dos
+    resumos diário e mensal:
     - INCOME: subtrai o valor do saldo
     - EXPENSE: adiciona o valor de volta ao saldo
-
-    Uses transaction.atomic() para garantir consistência dos dados.
     """
     try:
-        with transaction.atomic():
-            # Reverte a transação removendo seu impacto no saldo
-            _update_account_balance(
-                account=instance.account,
-                amount=instance.amount,
-                transaction_type=instance.transaction_type,
-                operation='remove'
-            )
+        _record_effect(instance, using, sign=-1)
 
     except Exception as e:
         # Log do erro (em produção, usar logging adequado)
@@ -137,38 +99,66 @@ def update_balance_on_delete(sender, instance, **kwargs):
         raise
 
 
-def _update_account_balance(account, amount, transaction_type, operation):
+def _record_effect(instance, using, sign=1):
+    """Registra (ou reverte, com `sign=-1`) o impacto da transação."""
+    record_transaction_effect(
+        transaction_values(instance),
+        sign=sign,
+        user_id=instance.user_id,
+        using=using,
+    )
+
+
+def _bump_owner_version(instance, using):
+    """Incrementa a versão dos dados do dono da transação."""
+    bump_data_version(user_ids=[instance.user_id], using=using)
+
+
+def _apply_balance_changes(instance, original, using):
     """
-    Função auxiliar para atualizar o saldo de uma conta.
+    Aplica nas contas a diferença entre o estado original e o atual.
+
+    A reversão e o novo impacto são somados no mesmo buffer (o do lote
+    ativo, se houver), então mudanças que se anulam não geram queries e
+    mudanças de conta atualizam as duas contas atomicamente.
 
     Args:
-        account: Instância do modelo Account
-        amount: Valor decimal da transação
-        transaction_type: 'income' ou 'expense'
-        operation: 'add' (adicionar impacto) ou 'remove' (remover impacto)
-
-    Lógica:
-        - INCOME + add: saldo += valor (adiciona receita)
-        - INCOME + remove: saldo -= valor (remove receita)
-        - EXPENSE + add: saldo -= valor (adiciona despesa)
-        - EXPENSE + remove: saldo += valor (remove despesa)
+        instance: Transação recém-salva
+        original: Valores originais de `Transaction.BALANCE_FIELDS`
+        using: Alias do banco em que a transação foi salva
+    """
+    active_buffer = get_active_buffer(using)
+    balances = active_buffer or BalanceDeltaBuffer(using)
+
+    balances.add(original, sign=-1)
+    balances.add(transaction_values(instance), user_id=instance.user_id)
+
+    if active_buffer is None:
+        balances.flush()
+
+
+@receiver(post_save, sender=Account)
+def sync_transaction_owner(sender, instance, created, using, **kwargs):
+    """
+    Mantém `Transaction.user` igual ao dono da conta.
+
+    Só faz algo quando a conta muda de dono (ex.: pelo admin): as
+    transações passam para o novo dono e os resumos mensais dos dois
+    usuários são recalculados.
     """
-    # Refresh para garantir que temos os dados mais recentes
-    account.refresh_from_db()
-
-    if operation == 'add':
-        # Adicionando impacto da transação
-        if transaction_type == Transaction.INCOME:
-            account.balance += amount
-        elif transaction_type == Transaction.EXPENSE:
-            account.balance -= amount
-
-    elif operation == 'remove':
-        # Removendo impacto da transação (operação inversa)
-        if transaction_type == Transaction.INCOME:
-            account.balance -= amount
-        elif transaction_type == Transaction.EXPENSE:
-            account.balance += amount
-
-    # Salva a conta com update_fields para evitar disparar outros signals
-    account.save(update_fields=['balance', 'updated_at'])
+    if created:
+        return
+
+    transactions = Transaction.objects.using(using).filter(
+        account=instance,
+    ).exclude(user_id=instance.user_id)
+    previous_owners = set(
+        transactions.values_list('user_id', flat=True).distinct()
+    )
+    if not previous_owners:
+        return
+
+    transactions.update(user_id=instance.user_id)
+    affected_users = previous_owners | {instance.user_id}
+    rebuild_monthly_summaries(affected_users, using=using)
+    bump_data_version(user_ids=affected_users, using=using)
@@ -0,0 +1,174 @@
+"""
+Resumo mensal das transações por usuário, categoria e tipo.
+
+`MonthlySummary` guarda o total e a quantidade de transações de cada
+(usuário, mês, categoria, tipo). A tabela é mantida pelos signals de
+`Transaction` (via `transactions.balances`) e pode ser recriada com
+`rebuild_monthly_summaries()`; o dashboard lê apenas dela.
+"""
+# Standard library
+from decimal import Decimal
+
+# Django imports
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    IntegerField,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+# Local imports
+from .models import MonthlySummary, Transaction
+
+
+def month_start(day):
+    """Retorna o primeiro dia do mês de `day`."""
+    return day.replace(day=1)
+
+
+def apply_monthly_deltas(user_id, entries, using=DEFAULT_DB_ALIAS):
+    """
+    Aplica deltas de total e quantidade aos resumos mensais de um usuário.
+
+    Args:
+        user_id: Usuário dono das transações
+        entries: Dicionário {(mês, categoria, tipo): (total, quantidade)}
+        using: Alias do banco
+
+    Uma leitura localiza as linhas existentes; elas recebem um único
+    UPDATE relativo (`total = total + CASE ...`), as que chegam a zero
+    transações são removidas e as combinações novas são inseridas com
+    `bulk_create`.
+
+    A linha do usuário precisa estar travada na transação atual (o flush
+    de `BalanceDeltaBuffer` a trava ao incrementar `data_version`);
+    senão dois lotes concorrentes podem ler "sem linha" e inserir a mesma
+    combinação duas vezes.
+    """
+    entries = {key: value for key, value in entries.items() if any(value)}
+    if not entries:
+        return
+
+    summaries = MonthlySummary.objects.using(using).filter(user_id=user_id)
+    rows = summaries.filter(
+        year_month__in={month for month, _, _ in entries},
+        category_id__in={category_id for _, category_id, _ in entries},
+    ).values_list(
+        'pk',
+        'year_month',
+        'category_id',
+        'transaction_type',
+        'count',
+    )
+
+    total_whens = []
+    count_whens = []
+    changed_ids = []
+    empty_ids = []
+    for pk, year_month, category_id, transaction_type, count in rows:
+        key = (year_month, category_id, transaction_type)
+        if key not in entries:
+            continue
+
+        total, count_delta = entries.pop(key)
+        if count + count_delta <= 0:
+            empty_ids.append(pk)
+            continue
+        changed_ids.append(pk)
+        if total:
+            total_whens.append(When(pk=pk, then=Value(total)))
+        if count_delta:
+            count_whens.append(When(pk=pk, then=Value(count_delta)))
+
+    updates = {}
+    if total_whens:
+        updates['total'] = F('total') + Case(
+            *total_whens,
+            default=Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+    if count_whens:
+        updates['count'] = F('count') + Case(
+            *count_whens,
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    if updates:
+        summaries.filter(pk__in=changed_ids).update(
+            **updates,
+            updated_at=timezone.now(),
+        )
+
+    if empty_ids:
+        summaries.filter(pk__in=empty_ids).delete()
+
+    new_rows = [
+        MonthlySummary(
+            user_id=user_id,
+            year_month=year_month,
+            category_id=category_id,
+            transaction_type=transaction_type,
+            total=total,
+            count=count,
+        )
+        for (year_month, category_id, transaction_type), (total, count)
+        in entries.items()
+        if count > 0
+    ]
+    if new_rows:
+        MonthlySummary.objects.using(using).bulk_create(new_rows)
+
+
+def rebuild_monthly_summaries(user_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Recria do zero os resumos mensais dos usuários informados.
+
+    Os usuários são travados antes da leitura, como no flush dos lotes
+    de saldo: nenhum resumo gravado entre a leitura e a troca das linhas
+    se perde.
+
+    Returns:
+        int: Quantidade de linhas criadas
+    """
+    user_ids = list(user_ids)
+
+    with transaction.atomic(using=using):
+        list(
+            get_user_model().objects.using(using).select_for_update().filter(
+                pk__in=user_ids,
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+        rows = [
+            MonthlySummary(**row)
+            for row in Transaction.objects.using(using).filter(
+                user_id__in=user_ids,
+            ).annotate(
+                year_month=TruncMonth('transaction_date'),
+            ).values(
+                'year_month',
+                'category_id',
+                'transaction_type',
+                'user_id',
+            ).annotate(
+                total=Sum('amount'),
+                count=Count('pk'),
+            ).order_by()
+        ]
+
+        MonthlySummary.objects.using(using).filter(
+            user_id__in=user_ids,
+        ).delete()
+        MonthlySummary.objects.using(using).bulk_create(
+            rows,
+            batch_size=1000,
+        )
+
+    return len(rows)
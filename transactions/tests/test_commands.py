@@ -0,0 +1,235 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Min, Sum
+from django.test import TestCase
+
+from accounts.forms import AccountForm
+from accounts.models import Account, AccountDailyBalance
+from categories.models import Category
+from transactions.models import MonthlySummary, Transaction
+
+
+class RecomputeBalancesCommandTests(TestCase):
+    """Valida a reconstrução dos saldos a partir do ledger."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='recompute@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Corrente',
+            bank_name='Banco Central',
+            balance=Decimal('1000.00'),
+        )
+        self.other_account = Account.objects.create(
+            user=self.user,
+            name='Poupança',
+            bank_name='Banco Central',
+            balance=Decimal('200.00'),
+        )
+        income_category = Category.objects.get(
+            user=self.user,
+            name='Salário',
+        )
+        expense_category = Category.objects.get(
+            user=self.user,
+            name='Alimentação',
+        )
+        Transaction.objects.create(
+            account=self.account,
+            category=income_category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('500.00'),
+            transaction_date=date(2024, 3, 1),
+        )
+        Transaction.objects.create(
+            account=self.account,
+            category=expense_category,
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal('120.00'),
+            transaction_date=date(2024, 3, 2),
+        )
+
+    def _drift(self, account, balance):
+        Account.objects.filter(pk=account.pk).update(balance=balance)
+
+    def _call(self, **options):
+        output = io.StringIO()
+        call_command('recompute_balances', stdout=output, **options)
+        return output.getvalue()
+
+    def test_new_account_uses_balance_as_opening_balance(self):
+        self.assertEqual(self.other_account.opening_balance, Decimal('200'))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.opening_balance, Decimal('1000.00'))
+        self.assertEqual(self.account.balance, Decimal('1380.00'))
+
+    def test_fixes_drifted_balances_only(self):
+        self._drift(self.account, Decimal('1.00'))
+        self.user.refresh_from_db()
+        version = self.user.data_version
+
+        output = self._call(chunk_size=1)
+
+        self.assertIn('2 contas verificadas, 1 corrigidas', output)
+        self.account.refresh_from_db()
+        self.other_account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('1380.00'))
+        self.assertEqual(self.other_account.balance, Decimal('200.00'))
+        # Cached dashboards must not keep the drifted balance
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.data_version, version + 1)
+
+    def test_dry_run_reports_without_writing(self):
+        self._drift(self.account, Decimal('1.00'))
+
+        self.user.refresh_from_db()
+        version = self.user.data_version
+
+        output = self._call(dry_run=True)
+
+        self.assertIn(f'Conta #{self.account.pk}', output)
+        self.assertIn('1 divergentes', output)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('1.00'))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.data_version, version)
+
+    def test_user_option_limits_accounts(self):
+        other_user = get_user_model().objects.create_user(
+            email='outro@example.com',
+            password='strong-pass-123',
+        )
+        foreign = Account.objects.create(
+            user=other_user,
+            name='Conta Alheia',
+            bank_name='Banco Central',
+            balance=Decimal('10.00'),
+        )
+        self._drift(foreign, Decimal('99.00'))
+
+        output = self._call(user=self.user.email)
+
+        self.assertIn('2 contas verificadas, 0 corrigidas', output)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.balance, Decimal('99.00'))
+
+    def test_manual_balance_edit_survives_recompute(self):
+        self.account.refresh_from_db()
+        form = AccountForm(
+            data={
+                'name': self.account.name,
+                'bank_name': self.account.bank_name,
+                'account_type': self.account.account_type,
+                'balance': '1400.00',
+            },
+            instance=self.account,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self._call()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.opening_balance, Decimal('1020.00'))
+        self.assertEqual(self.account.balance, Decimal('1400.00'))
+
+
+class SeedBenchmarkDataCommandTests(TestCase):
+    """Valida a massa sintética usada nos benchmarks."""
+
+    def _call(self, **options):
+        options.setdefault('users', 2)
+        options.setdefault('transactions', 300)
+        options.setdefault('years', 2)
+        options.setdefault('end_date', date(2024, 6, 30))
+        output = io.StringIO()
+        call_command('seed_benchmark_data', stdout=output, **options)
+        return output.getvalue()
+
+    def _fingerprint(self, domain):
+        return [
+            list(
+                Transaction.objects.filter(
+                    user__email=f'bench{index:05d}@{domain}',
+                ).order_by(
+                    'transaction_date', 'pk',
+                ).values_list(
+                    'account__name',
+                    'category__name',
+                    'transaction_type',
+                    'amount',
+                    'transaction_date',
+                    'description',
+                )
+            )
+            for index in range(2)
+        ]
+
+    def test_creates_users_with_consistent_balances(self):
+        output = self._call(email_domain='seed.test')
+
+        self.assertIn('2 usuários', output)
+        self.assertIn('600 transações', output)
+        users = get_user_model().objects.filter(
+            email__endswith='@seed.test',
+        )
+        self.assertEqual(users.count(), 2)
+        for user in users:
+            self.assertTrue(user.check_password('benchmark-pass-123'))
+            self.assertTrue(hasattr(user, 'profile'))
+            self.assertTrue(user.categories.exists())
+            self.assertEqual(user.transactions.count(), 300)
+
+        dates = Transaction.objects.aggregate(
+            first=Min('transaction_date'),
+        )
+        self.assertGreaterEqual(dates['first'], date(2022, 7, 1))
+        self.assertIn('0 divergentes', self._recompute_dry_run())
+
+        for account in Account.objects.all():
+            self.assertGreaterEqual(account.balance, 0)
+            last_day = AccountDailyBalance.objects.filter(
+                account=account,
+            ).order_by('-date').first()
+            self.assertEqual(last_day.closing_balance, account.balance)
+
+        summaries = MonthlySummary.objects.aggregate(
+            total=Sum('total'),
+            count=Sum('count'),
+        )
+        ledger = Transaction.objects.aggregate(
+            total=Sum('amount'),
+            count=Count('pk'),
+        )
+        self.assertEqual(summaries['total'], ledger['total'])
+        self.assertEqual(summaries['count'], ledger['count'])
+
+    def _recompute_dry_run(self):
+        output = io.StringIO()
+        call_command('recompute_balances', dry_run=True, stdout=output)
+        return output.getvalue()
+
+    def test_same_seed_generates_the_same_data(self):
+        self._call(email_domain='first.test')
+        self._call(email_domain='second.test')
+        self._call(email_domain='other.test', seed=7)
+
+        first = self._fingerprint('first.test')
+        self.assertEqual(len(first[0]), 300)
+        self.assertEqual(first, self._fingerprint('second.test'))
+        self.assertNotEqual(first, self._fingerprint('other.test'))
+        self.assertNotEqual(first[0], first[1])
+
+    def test_refuses_to_overwrite_existing_users(self):
+        self._call(email_domain='seed.test', users=1, transactions=10)
+
+        with self.assertRaises(CommandError):
+            self._call(email_domain='seed.test', users=1, transactions=10)
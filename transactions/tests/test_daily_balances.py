@@ -0,0 +1,216 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.forms import AccountForm
+from accounts.history import balance_history, balance_on
+from accounts.models import Account, AccountDailyBalance
+from categories.models import Category
+from transactions.balances import (
+    defer_balance_updates,
+    rebuild_daily_balances,
+)
+from transactions.models import Transaction
+
+
+class DailyBalanceTests(TestCase):
+    """Garante que os resumos diários acompanhem cada transação."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='daily@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Diária',
+            bank_name='Banco Central',
+            balance=Decimal('1000.00'),
+        )
+        self.other_account = Account.objects.create(
+            user=self.user,
+            name='Conta Reserva',
+            bank_name='Banco Central',
+            balance=Decimal('100.00'),
+        )
+        self.income_category = Category.objects.get(
+            user=self.user,
+            name='Salário',
+        )
+        self.expense_category = Category.objects.get(
+            user=self.user,
+            name='Alimentação',
+        )
+
+    def _create(self, day, amount, transaction_type=Transaction.EXPENSE,
+                account=None):
+        category = (
+            self.income_category
+            if transaction_type == Transaction.INCOME
+            else self.expense_category
+        )
+        return Transaction.objects.create(
+            account=account or self.account,
+            category=category,
+            transaction_type=transaction_type,
+            amount=Decimal(amount),
+            transaction_date=date(2024, 5, day),
+        )
+
+    def _snapshots(self, account=None):
+        return list(
+            AccountDailyBalance.objects.filter(
+                account=account or self.account,
+            ).values_list('date', 'closing_balance', 'income', 'expense')
+        )
+
+    def assertMatchesRebuild(self):
+        """Compara o estado incremental com a reconstrução do zero."""
+        incremental = self._snapshots()
+        rebuild_daily_balances([self.account.pk])
+        self.assertEqual(incremental, self._snapshots())
+
+    def test_create_records_day_and_shifts_later_days(self):
+        self._create(10, '100.00')
+        self._create(12, '500.00', Transaction.INCOME)
+        self._create(10, '50.00', Transaction.INCOME)
+        self._create(5, '20.00')
+
+        self.assertEqual(self._snapshots(), [
+            (date(2024, 5, 5), Decimal('980.00'), 0, Decimal('20.00')),
+            (
+                date(2024, 5, 10),
+                Decimal('930.00'),
+                Decimal('50.00'),
+                Decimal('100.00'),
+            ),
+            (date(2024, 5, 12), Decimal('1430.00'), Decimal('500.00'), 0),
+        ])
+        self.assertMatchesRebuild()
+
+    def test_shifted_rows_get_updated_timestamp(self):
+        self._create(12, '500.00', Transaction.INCOME)
+        later = AccountDailyBalance.objects.get(account=self.account)
+
+        self._create(10, '100.00')
+
+        shifted = AccountDailyBalance.objects.get(pk=later.pk)
+        self.assertEqual(shifted.created_at, later.created_at)
+        self.assertGreater(shifted.updated_at, later.updated_at)
+
+    def test_edit_and_delete_update_snapshots(self):
+        first = self._create(10, '100.00')
+        self._create(12, '40.00')
+
+        first.transaction_date = date(2024, 5, 14)
+        first.save()
+        self._create(11, '10.00', account=self.other_account)
+        first.account = self.other_account
+        first.save()
+        Transaction.objects.get(transaction_date=date(2024, 5, 12)).delete()
+
+        self.assertEqual(self._snapshots(), [])
+        self.assertEqual(self._snapshots(self.other_account), [
+            (date(2024, 5, 11), Decimal('90.00'), 0, Decimal('10.00')),
+            (date(2024, 5, 14), Decimal('-10.00'), 0, Decimal('100.00')),
+        ])
+        self.assertMatchesRebuild()
+
+    def test_batch_writes_match_rebuild(self):
+        with defer_balance_updates():
+            for day in (3, 9, 1, 9, 20):
+                self._create(day, '10.00')
+            self._create(15, '300.00', Transaction.INCOME)
+
+        self._create(2, '5.00')
+
+        with defer_balance_updates():
+            for transaction in Transaction.objects.filter(
+                transaction_date__lte=date(2024, 5, 9),
+            ):
+                transaction.amount += Decimal('1.00')
+                transaction.save()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('1240.00'))
+        self.assertMatchesRebuild()
+
+    def test_history_reads_latest_snapshot_per_day(self):
+        self._create(10, '100.00')
+        self._create(12, '500.00', Transaction.INCOME)
+        self._create(11, '30.00', account=self.other_account)
+
+        self.assertEqual(
+            balance_on(self.account, date(2024, 5, 9)),
+            Decimal('1000.00'),
+        )
+        self.assertEqual(
+            balance_on(self.account, date(2024, 5, 11)),
+            Decimal('900.00'),
+        )
+
+        with self.assertNumQueries(2):
+            history = balance_history(
+                Account.objects.filter(user=self.user),
+                date(2024, 5, 9),
+                date(2024, 5, 13),
+            )
+
+        self.assertEqual(history, [
+            (date(2024, 5, 9), Decimal('1100.00')),
+            (date(2024, 5, 10), Decimal('1000.00')),
+            (date(2024, 5, 11), Decimal('970.00')),
+            (date(2024, 5, 12), Decimal('1470.00')),
+            (date(2024, 5, 13), Decimal('1470.00')),
+        ])
+
+    def test_manual_balance_edit_shifts_snapshots(self):
+        self._create(10, '100.00')
+        before = AccountDailyBalance.objects.get(account=self.account)
+        self.account.refresh_from_db()
+        form = AccountForm(
+            data={
+                'name': self.account.name,
+                'bank_name': self.account.bank_name,
+                'account_type': self.account.account_type,
+                'balance': '1000.00',
+            },
+            instance=self.account,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(
+            balance_on(self.account, date(2024, 5, 10)),
+            Decimal('1000.00'),
+        )
+        self.assertGreater(
+            AccountDailyBalance.objects.get(pk=before.pk).updated_at,
+            before.updated_at,
+        )
+        self.assertMatchesRebuild()
+
+    def test_backfill_command_rebuilds_snapshots(self):
+        self._create(10, '100.00')
+        self._create(11, '30.00', account=self.other_account)
+        AccountDailyBalance.objects.all().delete()
+        self.user.refresh_from_db()
+        version = self.user.data_version
+        output = io.StringIO()
+
+        call_command('backfill_daily_balances', chunk_size=1, stdout=output)
+
+        self.assertIn(
+            '2 saldos diários gerados para 2 contas',
+            output.getvalue(),
+        )
+        # One bump per chunk
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.data_version, version + 2)
+        self.assertEqual(self._snapshots(), [
+            (date(2024, 5, 10), Decimal('900.00'), 0, Decimal('100.00')),
+        ])
@@ -0,0 +1,273 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.exporters import stream_csv, stream_xlsx
+from transactions.importers import parse_csv
+from transactions.models import Transaction
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+class TransactionExportTests(TestCase):
+    """Garante a exportação em streaming das transações filtradas."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='export_user',
+            email='export@example.com',
+            password='strong-pass-123',
+        )
+        self.client.force_login(self.user)
+
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Exportação',
+            bank_name='Banco Exportação',
+            balance=Decimal('0'),
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Despesa Exportação',
+            category_type=Category.EXPENSE,
+            color='#ff0000',
+        )
+        self.rent = self._create('Aluguel', '1200.00', date(2024, 3, 5))
+        self.market = self._create('Mercado', '350.50', date(2024, 3, 10))
+        self.old = self._create('Mercado antigo', '80.00', date(2023, 12, 1))
+
+        other_user = get_user_model().objects.create_user(
+            username='export_other',
+            email='export_other@example.com',
+            password='strong-pass-123',
+        )
+        other_account = Account.objects.create(
+            user=other_user,
+            name='Conta Alheia',
+            bank_name='Banco Alheio',
+            balance=Decimal('0'),
+        )
+        Transaction.objects.create(
+            account=other_account,
+            category=Category.objects.filter(
+                user=other_user,
+                category_type=Category.EXPENSE,
+            ).first(),
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal('10.00'),
+            transaction_date=date(2024, 3, 7),
+            description='Mercado alheio',
+        )
+
+    def _create(self, description, amount, transaction_date):
+        return Transaction.objects.create(
+            account=self.account,
+            category=self.category,
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal(amount),
+            transaction_date=transaction_date,
+            description=description,
+        )
+
+    def _export(self, file_format, params=None):
+        response = self.client.get(
+            reverse('transactions:export', args=[file_format]),
+            params or {},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def _sheet_rows(self, content):
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = ElementTree.fromstring(
+                archive.read('xl/worksheets/sheet1.xml'),
+            )
+        return [
+            [
+                ''.join(cell.itertext())
+                for cell in row.findall('s:c', SHEET_NS)
+            ]
+            for row in sheet.iter(f'{{{SHEET_NS["s"]}}}row')
+        ]
+
+    def test_csv_export_follows_list_filters_and_sort(self):
+        params = {
+            'data_inicio': '2024-01-01',
+            'sort': 'amount',
+            'direction': 'asc',
+        }
+        response, content = self._export('csv', params)
+
+        self.assertEqual(
+            response['Content-Type'],
+            'text/csv; charset=utf-8',
+        )
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        rows = list(parse_csv(io.StringIO(content.decode('utf-8-sig'))))
+        listed = self.client.get(
+            reverse('transactions:list'),
+            params,
+        ).context['transactions']
+
+        self.assertEqual(
+            [row['description'] for row in rows],
+            [transaction.description for transaction in listed],
+        )
+        self.assertEqual(rows[0], {
+            'line': 2,
+            'date': '2024-03-10',
+            'description': 'Mercado',
+            'amount': '350.50',
+            'type': 'Saída',
+            'account': 'Conta Exportação',
+            'category': 'Despesa Exportação',
+        })
+
+    def test_csv_neutralizes_formulas_in_text_columns(self):
+        content = ''.join(stream_csv([(
+            date(2024, 3, 10),
+            '=HYPERLINK("http://x","y")',
+            Decimal('-10.00'),
+            Transaction.EXPENSE,
+            '+Conta',
+            '@Categoria',
+        ), (
+            date(2024, 3, 11),
+            "'Mercado' - parcela 1",
+            Decimal('5.00'),
+            Transaction.INCOME,
+            '-Conta',
+            '',
+        )]))
+
+        cells = list(csv.reader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(
+            [row[1:] for row in cells[1:]],
+            [
+                ["'=HYPERLINK(\"http://x\",\"y\")", '-10.00', 'Saída',
+                 "'+Conta", "'@Categoria"],
+                ["''Mercado' - parcela 1", '5.00', 'Entrada', "'-Conta",
+                 ''],
+            ],
+        )
+
+    def test_csv_text_round_trips_through_import(self):
+        descriptions = [
+            '=SUM(A1:A2)',
+            "'=texto com apóstrofo",
+            "'Mercado'",
+            "Mercado d'água",
+            '- parcela',
+        ]
+        content = ''.join(stream_csv([
+            (
+                date(2024, 3, 10),
+                description,
+                Decimal('1.00'),
+                Transaction.INCOME,
+                '@Conta',
+                "'Categoria",
+            )
+            for description in descriptions
+        ]))
+
+        rows = list(parse_csv(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(
+            [row['description'] for row in rows],
+            descriptions,
+        )
+        self.assertEqual(
+            {(row['account'], row['category']) for row in rows},
+            {('@Conta', "'Categoria")},
+        )
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        _, content = self._export('xlsx', {'q': 'mercado'})
+
+        rows = self._sheet_rows(content)
+
+        self.assertEqual(rows[0], [
+            'data',
+            'descricao',
+            'valor',
+            'tipo',
+            'conta',
+            'categoria',
+        ])
+        # Dates are Excel serial numbers (2024-03-10 -> 45361)
+        self.assertEqual(rows[1:], [
+            [
+                '45361',
+                'Mercado',
+                '350.50',
+                'Saída',
+                'Conta Exportação',
+                'Despesa Exportação',
+            ],
+            [
+                '45261',
+                'Mercado antigo',
+                '80.00',
+                'Saída',
+                'Conta Exportação',
+                'Despesa Exportação',
+            ],
+        ])
+
+    def test_export_does_not_load_model_instances(self):
+        with mock.patch.object(
+            Transaction,
+            'from_db',
+            side_effect=AssertionError('model instance loaded'),
+        ):
+            for file_format in ('csv', 'xlsx'):
+                self._export(file_format)
+
+    def test_xlsx_rows_escape_xml_and_stream_in_chunks(self):
+        rows = [
+            (
+                date(2024, 1, 1),
+                f'<Item {index}> & "x"\x01',
+                Decimal('1.00'),
+                Transaction.INCOME,
+                'Conta',
+                'Categoria',
+            )
+            for index in range(5)
+        ]
+
+        chunks = list(stream_xlsx(iter(rows), rows_per_chunk=2))
+
+        self.assertGreater(len(chunks), 3)
+        sheet_rows = self._sheet_rows(b''.join(chunks))
+        self.assertEqual(len(sheet_rows), 6)
+        self.assertEqual(sheet_rows[1][1], '<Item 0> & "x"')
+        self.assertEqual(sheet_rows[1][3], 'Entrada')
+
+    def test_export_rejects_unknown_format_and_anonymous_users(self):
+        response = self.client.get(
+            reverse('transactions:export', args=['pdf']),
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.client.logout()
+        response = self.client.get(
+            reverse('transactions:export', args=['csv']),
+        )
+        self.assertEqual(response.status_code, 302)
@@ -2,6 +2,7 @@ from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import connection
 from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
@@ -10,6 +11,7 @@ from django.utils import timezone
 
 from accounts.models import Account
 from categories.models import Category
+from core.lookups import UserLookups
 from transactions.forms import TransactionForm
 from transactions.models import Transaction
 
@@ -18,6 +20,8 @@ class TransactionValidationTests(TestCase):
     """Valida regras de negócio do formulário de transações."""
 
     def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username='transaction_user',
             email='transaction_user@example.com',
@@ -147,11 +151,46 @@ class TransactionValidationTests(TestCase):
             form.errors['amount']
         )
 
+    def test_expense_checks_current_balance_not_cached_lookups(self):
+        account = Account.objects.create(
+            user=self.user,
+            name='Conta Cache',
+            bank_name='Banco Cache',
+            balance=Decimal('500.00')
+        )
+        data = {
+            'account': account.pk,
+            'category': self.expense_category.pk,
+            'transaction_type': Transaction.EXPENSE,
+            'amount': '100.00',
+            'transaction_date': timezone.localdate().isoformat(),
+            'description': 'Despesa após saque'
+        }
+        # Same lookups the views pass, cached between requests
+        form = TransactionForm(data=data, lookups=UserLookups(self.user))
+        self.assertTrue(form.is_valid())
+        # update() skips signals: the cached lookups keep the old balance
+        Account.objects.filter(pk=account.pk).update(balance=Decimal('10'))
+
+        form = TransactionForm(data=data, lookups=UserLookups(self.user))
+
+        self.assertEqual(
+            form.fields['account'].objects[account.pk].balance,
+            Decimal('500.00'),
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn(
+            'Saldo insuficiente na conta selecionada para esta despesa.',
+            form.errors['amount']
+        )
+
 
 class TransactionListViewTests(TestCase):
     """Testa filtros, paginação e ordenação da listagem de transações."""
 
     def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username='transaction_list',
             email='transaction_list@example.com',
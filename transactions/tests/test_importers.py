@@ -0,0 +1,292 @@
+import io
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.importers import (
+    ImportRowError,
+    TransactionImporter,
+    parse_amount,
+    parse_csv,
+    parse_date,
+    parse_ofx,
+)
+from transactions.models import Transaction
+
+OFX_STATEMENT = (
+    'OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>'
+    '<BANKTRANLIST>'
+    '<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240105120000[-3:BRT]'
+    '<TRNAMT>1500.00<FITID>1<MEMO>Salario</STMTTRN>'
+    '<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240107'
+    '<TRNAMT>-89.90<FITID>2<NAME>Mercado</STMTTRN>'
+    '</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>'
+)
+
+
+class ParseAmountTests(SimpleTestCase):
+    """Garante a leitura de valores nos formatos brasileiro e inglês."""
+
+    def test_last_separator_is_the_decimal_mark(self):
+        for value, expected in (
+            ('1,234.56', Decimal('1234.56')),
+            ('1.234,56', Decimal('1234.56')),
+            ('-1.234.567,8', Decimal('-1234567.8')),
+            ('10,5', Decimal('10.5')),
+            ('-50.00', Decimal('-50.00')),
+            ('R$ 10', Decimal('10')),
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(parse_amount(value), expected)
+
+    def test_ambiguous_and_malformed_values_are_rejected(self):
+        for value in ('1,000', '-1,000', '1.000', '1,23.45', '12.34.5'):
+            with self.subTest(value=value):
+                with self.assertRaises(ImportRowError):
+                    parse_amount(value)
+
+
+class ParseDateTests(SimpleTestCase):
+    """Garante a leitura das datas de CSV e OFX."""
+
+    def test_accepted_formats(self):
+        for value in (
+            '2024-01-05',
+            '05/01/2024',
+            '20240105',
+            '20240105120000',
+            '20240105120000.000',
+            '20240105120000[-3:BRT]',
+            '20240105120000.000[-3:BRT]',
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(parse_date(value), date(2024, 1, 5))
+
+    def test_invalid_dates_are_rejected(self):
+        for value in ('', 'ontem', '20241305', '2024010', '31/02/2024'):
+            with self.subTest(value=value):
+                with self.assertRaises(ImportRowError):
+                    parse_date(value)
+
+
+class TransactionImporterTests(TestCase):
+    """Valida parsers e importação em lote de transações."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='import@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Corrente',
+            bank_name='Banco Central',
+            balance=Decimal('1000.00'),
+        )
+        self.savings = Account.objects.create(
+            user=self.user,
+            name='Poupança',
+            bank_name='Banco Central',
+            balance=Decimal('0.00'),
+        )
+        self.income_category = Category.objects.get(
+            user=self.user,
+            name='Salário',
+        )
+        self.expense_category = Category.objects.get(
+            user=self.user,
+            name='Alimentação',
+        )
+
+    def test_parse_csv_accepts_portuguese_headers_and_semicolons(self):
+        stream = io.StringIO(
+            'Data;Descrição;Valor;Tipo\n'
+            '05/01/2024;Feira;1.234,56;saída\n'
+            '\n'
+        )
+
+        rows = list(parse_csv(stream))
+
+        self.assertEqual(rows, [{
+            'line': 2,
+            'date': '05/01/2024',
+            'description': 'Feira',
+            'amount': '1.234,56',
+            'type': 'saída',
+        }])
+
+    def test_parse_ofx_reads_statement_transactions(self):
+        rows = list(parse_ofx(io.StringIO(OFX_STATEMENT)))
+
+        self.assertEqual(
+            [(row['date'], row['amount'], row['description']) for row in rows],
+            [
+                ('20240105120000[-3:BRT]', '1500.00', 'Salario'),
+                ('20240107', '-89.90', 'Mercado'),
+            ],
+        )
+
+    def test_import_bulk_creates_and_updates_each_balance_once(self):
+        lines = ['date,description,amount,type,account,category']
+        for day in range(1, 11):
+            lines.append(
+                f'2024-01-{day:02d},Mercado,10.00,expense,'
+                'Conta Corrente,Alimentação'
+            )
+        lines.append('2024-01-15,Salário,500.00,income,Poupança,Salário')
+        stream = io.StringIO('\n'.join(lines))
+        progress = []
+        importer = TransactionImporter(
+            self.user,
+            batch_size=4,
+            progress_callback=lambda result: progress.append(result.created),
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = importer.run(parse_csv(stream))
+
+        self.assertEqual(result.created, 11)
+        self.assertEqual(result.skipped, 0)
+        self.assertEqual(progress, [4, 8, 11])
+        balance_updates = [
+            query for query in queries
+            if query['sql'].startswith('UPDATE "accounts_account"')
+        ]
+        self.assertEqual(len(balance_updates), 2)
+        self.account.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('900.00'))
+        self.assertEqual(self.savings.balance, Decimal('500.00'))
+
+    def test_invalid_rows_are_skipped_and_reported(self):
+        future = (date.today() + timedelta(days=5)).isoformat()
+        stream = io.StringIO(
+            'date,description,amount,category\n'
+            '2024-01-02,Ok,-20.00,Alimentação\n'
+            'ontem,Data ruim,10.00,Alimentação\n'
+            f'{future},Futuro,10.00,Alimentação\n'
+            '2024-01-03,Tipo errado,-10.00,Salário\n'
+            '2024-01-04,Sem categoria,-10.00,Inexistente\n'
+        )
+        importer = TransactionImporter(self.user, account=self.account)
+
+        result = importer.run(parse_csv(stream))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.skipped, 4)
+        self.assertEqual(
+            [line for line, _ in result.errors],
+            [3, 4, 5, 6],
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('980.00'))
+
+    def test_expenses_cannot_exceed_the_running_balance(self):
+        stream = io.StringIO(
+            'date,description,amount,account,category\n'
+            '2024-01-02,Antes do salário,-10.00,Poupança,Alimentação\n'
+            '2024-01-03,Depósito,50.00,Poupança,Salário\n'
+            '2024-01-04,Feira,-30.00,Poupança,Alimentação\n'
+            '2024-01-05,Mercado,-30.00,Poupança,Alimentação\n'
+            '2024-01-06,Mercado,-20.00,Poupança,Alimentação\n'
+        )
+        importer = TransactionImporter(self.user)
+
+        result = importer.run(parse_csv(stream))
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual(
+            [line for line, _ in result.errors],
+            [2, 5],
+        )
+        self.savings.refresh_from_db()
+        self.assertEqual(self.savings.balance, Decimal('0.00'))
+
+    def test_management_command_imports_ofx_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'extrato.ofx'
+            path.write_text(OFX_STATEMENT, encoding='utf-8')
+            output = io.StringIO()
+
+            call_command(
+                'import_transactions',
+                str(path),
+                user=self.user.email,
+                account=str(self.account.pk),
+                income_category='Salário',
+                expense_category='Alimentação',
+                stdout=output,
+            )
+
+        self.assertIn('2 transações importadas', output.getvalue())
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('2410.10'))
+
+
+class TransactionImportViewTests(TestCase):
+    """Testa o upload de arquivos pela interface web."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='import_view@example.com',
+            password='strong-pass-123',
+        )
+        self.client.force_login(self.user)
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Corrente',
+            bank_name='Banco Central',
+            balance=Decimal('100.00'),
+        )
+
+    def test_upload_csv_imports_transactions(self):
+        upload = SimpleUploadedFile(
+            'extrato.csv',
+            (
+                'data,descricao,valor,categoria\n'
+                '2024-02-01,Padaria,-15.50,Alimentação\n'
+            ).encode('utf-8'),
+            content_type='text/csv',
+        )
+
+        response = self.client.post(
+            reverse('transactions:import'),
+            {
+                'file': upload,
+                'file_format': 'csv',
+                'account': self.account.pk,
+            },
+        )
+
+        self.assertRedirects(response, reverse('transactions:list'))
+        transaction = Transaction.objects.get()
+        self.assertEqual(transaction.amount, Decimal('15.50'))
+        self.assertEqual(transaction.transaction_type, Transaction.EXPENSE)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('84.50'))
+
+    def test_ofx_upload_requires_account_and_categories(self):
+        upload = SimpleUploadedFile('extrato.ofx', OFX_STATEMENT.encode())
+
+        response = self.client.post(
+            reverse('transactions:import'),
+            {'file': upload, 'file_format': 'ofx'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('account', response.context['form'].errors)
+        self.assertFalse(Transaction.objects.exists())
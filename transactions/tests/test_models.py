@@ -67,3 +67,55 @@ class TestTransactionModel(TestCase):
 
         with self.assertRaises(ValidationError):
             transaction.full_clean()
+
+    def test_transaction_user_follows_account_owner(self):
+        """user is copied from the account, even when it is not loaded."""
+        transaction = Transaction.objects.create(
+            account_id=self.account.pk,
+            category=self.category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('10.00'),
+            transaction_date=date(2024, 4, 1)
+        )
+        self.assertEqual(transaction.user_id, self.user.pk)
+
+        other_user = get_user_model().objects.create_user(
+            email='other-owner@example.com',
+            password='safe-pass'
+        )
+        other_account = Account.objects.create(
+            user=other_user,
+            name='Conta Outra',
+            bank_name='Banco Teste'
+        )
+        transaction = Transaction.objects.get(pk=transaction.pk)
+        transaction.account_id = other_account.pk
+        transaction.save(update_fields=['account'])
+
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.user_id, other_user.pk)
+
+    def test_account_owner_change_moves_transactions(self):
+        """Changing the account owner updates transactions and summaries."""
+        transaction = Transaction.objects.create(
+            account=self.account,
+            category=self.category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('10.00'),
+            transaction_date=date(2024, 4, 1)
+        )
+        new_owner = get_user_model().objects.create_user(
+            email='new-owner@example.com',
+            password='safe-pass'
+        )
+
+        self.account.user = new_owner
+        self.account.save()
+
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.user_id, new_owner.pk)
+        self.assertFalse(self.user.monthly_summaries.exists())
+        self.assertEqual(
+            new_owner.monthly_summaries.get().total,
+            Decimal('10.00')
+        )
@@ -0,0 +1,224 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.models import Transaction
+from transactions.pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    decode_cursor,
+    filters_digest,
+)
+
+
+class CursorPaginationTests(TestCase):
+    """Garante a paginação por cursor da listagem de transações."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='cursor_user',
+            email='cursor@example.com',
+            password='strong-pass-123',
+        )
+        self.client.force_login(self.user)
+
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Cursor',
+            bank_name='Banco Cursor',
+            balance=Decimal('0'),
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Despesa Cursor',
+            category_type=Category.EXPENSE,
+            color='#ff0000',
+        )
+
+        # Pairs of transactions share the same date to exercise tiebreakers
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=self.user,
+                account=self.account,
+                category=self.category,
+                transaction_type=Transaction.EXPENSE,
+                amount=Decimal(index + 1),
+                transaction_date=date(2024, 1, 1) + timedelta(days=index // 2),
+                description=f'Transacao {index:02d}',
+            )
+            for index in range(25)
+        ])
+
+    def _walk(self, params):
+        """Percorre todas as páginas seguindo os cursores `next`."""
+        params = {'pagination': 'cursor', 'per_page': 10, **params}
+        pages = []
+        cursor = None
+        while True:
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(reverse('transactions:list'), params)
+            page = response.context['page_obj']
+            pages.append(list(page))
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages, page
+
+    def test_cursor_pages_match_offset_ordering(self):
+        for sort, direction in (('date', 'desc'), ('amount', 'asc')):
+            pages, _ = self._walk({'sort': sort, 'direction': direction})
+
+            expected = []
+            page_number = 1
+            while True:
+                response = self.client.get(reverse('transactions:list'), {
+                    'sort': sort,
+                    'direction': direction,
+                    'per_page': 10,
+                    'page': page_number,
+                })
+                expected.append(list(response.context['page_obj']))
+                if not response.context['page_obj'].has_next():
+                    break
+                page_number += 1
+
+            self.assertEqual([len(page) for page in pages], [10, 10, 5])
+            self.assertEqual(pages, expected)
+
+    def test_cursor_mode_skips_the_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('transactions:list'), {
+                'pagination': 'cursor',
+                'per_page': 10,
+            })
+
+        self.assertFalse([
+            query['sql'] for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ])
+        self.assertIsNone(response.context['transaction_count'])
+        self.assertEqual(response.context['total_expense'], Decimal('325'))
+        self.assertContains(response, 'Exibindo 10 transações filtradas')
+
+    def test_previous_cursor_returns_to_previous_page(self):
+        first = self.client.get(reverse('transactions:list'), {
+            'pagination': 'cursor',
+            'per_page': 10,
+        }).context['page_obj']
+        self.assertFalse(first.has_previous())
+
+        second = self.client.get(reverse('transactions:list'), {
+            'pagination': 'cursor',
+            'per_page': 10,
+            'cursor': first.next_cursor,
+        }).context['page_obj']
+        back = self.client.get(reverse('transactions:list'), {
+            'pagination': 'cursor',
+            'per_page': 10,
+            'cursor': second.previous_cursor,
+        }).context['page_obj']
+
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        with CaptureQueriesContext(connection) as first_page:
+            self.client.get(reverse('transactions:list'), {
+                'pagination': 'cursor',
+                'per_page': 10,
+            })
+        _, last_page = self._walk({})
+        with CaptureQueriesContext(connection) as deep_page:
+            self.client.get(reverse('transactions:list'), {
+                'pagination': 'cursor',
+                'per_page': 10,
+                'cursor': last_page.previous_cursor,
+            })
+
+        self.assertEqual(len(deep_page), len(first_page))
+        self.assertFalse([
+            query for query in deep_page.captured_queries
+            if 'OFFSET' in query['sql']
+        ])
+
+    def test_invalid_or_stale_cursor_falls_back_to_first_page(self):
+        first = self.client.get(reverse('transactions:list'), {
+            'pagination': 'cursor',
+            'per_page': 10,
+        }).context['page_obj']
+
+        for params in (
+            {'cursor': 'not-a-cursor'},
+            {'cursor': first.next_cursor, 'sort': 'amount'},
+            {'cursor': first.next_cursor, 'q': 'Transacao'},
+            {'cursor': first.next_cursor, 'conta': self.account.pk},
+        ):
+            response = self.client.get(reverse('transactions:list'), {
+                'pagination': 'cursor',
+                'per_page': 10,
+                **params,
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_decode_cursor_rejects_other_ordering(self):
+        paginator = CursorPaginator(
+            Transaction.objects.all(),
+            10,
+            ['-transaction_date', '-created_at', '-id'],
+        )
+        cursor = paginator.page().next_cursor
+
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, ['amount', 'transaction_date', 'id'])
+
+    def test_decode_cursor_rejects_other_filters(self):
+        ordering = ['-transaction_date', '-created_at', '-id']
+        paginator = CursorPaginator(
+            Transaction.objects.all(),
+            10,
+            ordering,
+            filters=filters_digest([('period', 'this_month')]),
+        )
+        cursor = paginator.page().next_cursor
+
+        self.assertEqual(
+            filters_digest([('tipo', 'expense'), ('conta', '1')]),
+            filters_digest([('conta', '1'), ('tipo', 'expense')]),
+        )
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, ordering)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(
+                cursor,
+                ordering,
+                filters_digest([('period', 'last_month')]),
+            )
+
+    def test_filter_links_keep_cursor_mode(self):
+        list_url = reverse('transactions:list')
+        response = self.client.get(list_url, {
+            'pagination': 'cursor',
+            'period': 'this_month',
+        })
+
+        self.assertContains(
+            response,
+            'href="?period=last_month&amp;pagination=cursor"',
+        )
+        self.assertContains(
+            response,
+            f'href="{list_url}?pagination=cursor"',
+            count=2,
+        )
@@ -0,0 +1,222 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.models import Transaction
+from transactions import search
+from transactions.search import search_terms, search_transactions
+
+
+class TransactionSearchTests(TestCase):
+    """Garante a busca textual nas descrições das transações."""
+
+    def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='search_user',
+            email='search@example.com',
+            password='strong-pass-123',
+        )
+        self.client.force_login(self.user)
+
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Busca',
+            bank_name='Banco Busca',
+            balance=Decimal('0'),
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Despesa Busca',
+            category_type=Category.EXPENSE,
+            color='#ff0000',
+        )
+
+    def _create(self, description):
+        return Transaction.objects.create(
+            account=self.account,
+            category=self.category,
+            transaction_type=Transaction.EXPENSE,
+            amount=Decimal('10.00'),
+            transaction_date=date(2024, 5, 10),
+            description=description,
+        )
+
+    def _search(self, query, **kwargs):
+        return list(search_transactions(
+            Transaction.objects.order_by('pk'),
+            query,
+            self.user,
+            **kwargs,
+        ))
+
+    def test_search_matches_word_prefixes_and_ignores_accents(self):
+        rent = self._create('Aluguel do apartamento')
+        pharmacy = self._create('Farmácia São João')
+        self._create('Supermercado semanal')
+
+        self.assertEqual(self._search('alu'), [rent])
+        self.assertEqual(self._search('farmacia sao'), [pharmacy])
+        self.assertEqual(self._search('aluguel mercado'), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        transaction = self._create('Conta de luz')
+
+        transaction.description = 'Conta de água'
+        transaction.save()
+        self.assertEqual(self._search('luz'), [])
+        self.assertEqual(self._search('agua'), [transaction])
+
+        transaction.delete()
+        self.assertEqual(self._search('agua'), [])
+
+    def test_search_ignores_query_syntax_characters(self):
+        transaction = self._create('Mercado "central" - parcela 1/3')
+
+        self.assertEqual(search_terms('"central" OR -*'), ['central', 'OR'])
+        self.assertEqual(self._search('"central" -*'), [transaction])
+        self.assertEqual(self._search(' - '), [transaction])
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 index')
+    def test_index_lookup_is_scoped_to_the_user(self):
+        own = self._create('Mercado do bairro')
+        other_user = get_user_model().objects.create_user(
+            username='other_search_user',
+            email='other_search@example.com',
+            password='strong-pass-123',
+        )
+        other_account = Account.objects.create(
+            user=other_user,
+            name='Conta Outra',
+            bank_name='Banco Outro',
+            balance=Decimal('0'),
+        )
+        other = Transaction.objects.create(
+            account=other_account,
+            category=self.category,
+            transaction_type=Transaction.INCOME,
+            amount=Decimal('10.00'),
+            transaction_date=date(2024, 5, 10),
+            description='Mercado central',
+        )
+
+        # The queryset is not filtered: only the index lookup scopes it
+        self.assertEqual(self._search('mercado', with_rank=True), [own])
+        self.assertEqual(list(search_transactions(
+            Transaction.objects.all(),
+            'mercado',
+            other_user,
+        )), [other])
+        # The owner's id is not searchable as a description word
+        self.assertEqual(self._search(str(self.user.pk)), [])
+
+    def test_rank_orders_best_matches_first(self):
+        weak = self._create('Pagamento de mercado com outros itens diversos')
+        strong = self._create('Mercado mercado')
+
+        results = list(search_transactions(
+            Transaction.objects.all(),
+            'mercado',
+            self.user,
+            with_rank=True,
+        ).order_by('-search_rank'))
+
+        self.assertEqual(results, [strong, weak])
+
+    def test_list_view_supports_relevance_sort(self):
+        weak = self._create('Pagamento de mercado com outros itens diversos')
+        strong = self._create('Mercado mercado')
+        self._create('Gasolina')
+
+        response = self.client.get(
+            reverse('transactions:list'),
+            {'q': 'merc', 'sort': 'relevance'},
+        )
+
+        self.assertEqual(response.context['current_sort'], 'relevance')
+        self.assertEqual(list(response.context['transactions']), [
+            strong,
+            weak,
+        ])
+        self.assertEqual(response.context['transaction_count'], 2)
+
+        response = self.client.get(
+            reverse('transactions:list'),
+            {'sort': 'relevance'},
+        )
+        self.assertEqual(response.context['current_sort'], 'date')
+
+    def test_statistics_do_not_compute_relevance(self):
+        self._create('Mercado mercado')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                reverse('transactions:list'),
+                {'q': 'merc', 'sort': 'relevance'},
+            )
+
+        ranked = [
+            query['sql'] for query in queries.captured_queries
+            if 'bm25' in query['sql']
+        ]
+        # Only the page query orders by relevance
+        self.assertEqual(len(ranked), 1)
+        self.assertNotIn('COUNT(', ranked[0])
+
+    def test_stopword_only_query_falls_back_to_icontains(self):
+        self.addCleanup(search._is_empty_tsquery.cache_clear)
+        search._is_empty_tsquery.cache_clear()
+        bill = self._create('Conta de luz')
+        age = self._create('Taxa da idade')
+        self._create('Gasolina')
+
+        # PostgreSQL discards "de" (numnode = 0); the rows still come from
+        # the real connection
+        postgres = mock.MagicMock(vendor='postgresql')
+        cursor = postgres.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (0,)
+        with mock.patch.object(
+            search,
+            'connections',
+            {'default': postgres},
+        ):
+            results = self._search('de', with_rank=True)
+
+        self.assertEqual(results, [bill, age])
+        self.assertEqual(results[0].search_rank, 0)
+        self.assertEqual(cursor.execute.call_count, 1)
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 triggers')
+    def test_search_triggers_survive_table_rebuilds(self):
+        # Migrations that rebuild the table on SQLite (AlterField) drop its
+        # triggers; they must recreate them (see
+        # 0010_transaction_search_user)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'trigger' "
+                "AND tbl_name = 'transactions_transaction'"
+            )
+            triggers = {row[0] for row in cursor.fetchall()}
+
+        self.assertEqual(triggers, {
+            'transactions_transaction_fts_insert',
+            'transactions_transaction_fts_delete',
+            'transactions_transaction_fts_update',
+        })
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL stopwords')
+    def test_stopword_only_query_finds_rows_on_postgresql(self):
+        bill = self._create('Conta de luz')
+
+        self.assertEqual(self._search('de'), [bill])
@@ -0,0 +1,158 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Account
+from categories.models import Category
+from transactions.balances import defer_balance_updates
+from transactions.importers import TransactionImporter, parse_csv
+from transactions.models import MonthlySummary, Transaction
+from transactions.summaries import rebuild_monthly_summaries
+
+
+class MonthlySummaryTests(TestCase):
+    """Garante que o resumo mensal acompanhe as transações."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='monthly@example.com',
+            password='strong-pass-123',
+        )
+        self.account = Account.objects.create(
+            user=self.user,
+            name='Conta Corrente',
+            bank_name='Banco Central',
+            balance=Decimal('1000.00'),
+        )
+        self.other_account = Account.objects.create(
+            user=self.user,
+            name='Poupança',
+            bank_name='Banco Central',
+            balance=Decimal('0.00'),
+        )
+        self.food = Category.objects.get(user=self.user, name='Alimentação')
+        self.transport = Category.objects.get(
+            user=self.user,
+            name='Transporte',
+        )
+        self.salary = Category.objects.get(user=self.user, name='Salário')
+
+    def _create(self, month, day, amount, category=None, account=None):
+        category = category or self.food
+        return Transaction.objects.create(
+            account=account or self.account,
+            category=category,
+            transaction_type=category.category_type,
+            amount=Decimal(amount),
+            transaction_date=date(2024, month, day),
+        )
+
+    def _summaries(self):
+        return sorted(
+            MonthlySummary.objects.filter(user=self.user).values_list(
+                'year_month',
+                'category__name',
+                'transaction_type',
+                'total',
+                'count',
+            )
+        )
+
+    def assertMatchesRebuild(self):
+        """Compara o estado incremental com a reconstrução do zero."""
+        incremental = self._summaries()
+        rebuild_monthly_summaries([self.user.pk])
+        self.assertEqual(incremental, self._summaries())
+
+    def test_create_groups_by_month_category_and_type(self):
+        self._create(3, 1, '10.00')
+        self._create(3, 20, '15.00', account=self.other_account)
+        self._create(3, 5, '3000.00', category=self.salary)
+        self._create(4, 2, '7.50')
+
+        self.assertEqual(self._summaries(), [
+            (date(2024, 3, 1), 'Alimentação', 'expense', Decimal('25.00'), 2),
+            (date(2024, 3, 1), 'Salário', 'income', Decimal('3000.00'), 1),
+            (date(2024, 4, 1), 'Alimentação', 'expense', Decimal('7.50'), 1),
+        ])
+        self.assertMatchesRebuild()
+
+    def test_updated_rows_get_updated_timestamp(self):
+        self._create(3, 1, '10.00')
+        summary = MonthlySummary.objects.get(user=self.user)
+
+        self._create(3, 2, '5.00')
+
+        updated = MonthlySummary.objects.get(pk=summary.pk)
+        self.assertEqual(updated.created_at, summary.created_at)
+        self.assertGreater(updated.updated_at, summary.updated_at)
+
+    def test_edits_and_deletes_move_totals(self):
+        first = self._create(3, 1, '10.00')
+        second = self._create(3, 2, '20.00')
+
+        first.category = self.transport
+        first.save()
+        second.transaction_date = date(2024, 5, 2)
+        second.amount = Decimal('25.00')
+        second.save()
+        self._create(5, 3, '5.00').delete()
+
+        self.assertEqual(self._summaries(), [
+            (date(2024, 3, 1), 'Transporte', 'expense', Decimal('10.00'), 1),
+            (date(2024, 5, 1), 'Alimentação', 'expense', Decimal('25.00'), 1),
+        ])
+        self.assertMatchesRebuild()
+
+        first.delete()
+        second.delete()
+        self.assertEqual(self._summaries(), [])
+
+    def test_batches_and_imports_match_rebuild(self):
+        with defer_balance_updates():
+            for day in range(1, 6):
+                self._create(6, day, '2.00')
+            self._create(6, 9, '100.00', category=self.salary)
+            Transaction.objects.filter(
+                transaction_date=date(2024, 6, 1),
+            ).get().delete()
+
+        TransactionImporter(self.user, account=self.account).run(
+            parse_csv(io.StringIO(
+                'date,amount,category\n'
+                '2024-06-10,-4.00,Alimentação\n'
+                '2024-07-01,-6.00,Transporte\n'
+            ))
+        )
+
+        self.assertIn(
+            (date(2024, 6, 1), 'Alimentação', 'expense', Decimal('12.00'), 5),
+            self._summaries(),
+        )
+        self.assertMatchesRebuild()
+
+    def test_rebuild_command(self):
+        self._create(3, 1, '10.00')
+        self._create(3, 2, '30.00', category=self.salary)
+        MonthlySummary.objects.all().delete()
+        self.user.refresh_from_db()
+        version = self.user.data_version
+        output = io.StringIO()
+
+        call_command(
+            'rebuild_monthly_summaries',
+            user=self.user.email,
+            stdout=output,
+        )
+
+        self.assertIn(
+            '2 resumos mensais gerados para 1 usuários',
+            output.getvalue(),
+        )
+        self.assertEqual(len(self._summaries()), 2)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.data_version, version + 1)
@@ -2,7 +2,10 @@ from datetime import date, timedelta
 
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from accounts.models import Account
@@ -14,6 +17,8 @@ class TransactionViewTests(TestCase):
     """Testa listagem, criação, edição e exclusão de transações."""
 
     def setUp(self):
+        # Ids are reused between tests, so versioned keys could collide
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username='transaction_user',
             email='transaction_user@example.com',
@@ -136,6 +141,44 @@ class TransactionViewTests(TestCase):
         ]
         self.assertEqual(descriptions, ['Supermercado semanal'])
 
+    def test_list_view_computes_statistics_in_a_single_query(self):
+        today = date.today()
+        for amount, transaction_type, category, days_ago in (
+            (500, Transaction.INCOME, self.income_category, 0),
+            (200, Transaction.EXPENSE, self.expense_category, 3),
+            (50, Transaction.EXPENSE, self.expense_category, 7),
+        ):
+            Transaction.objects.create(
+                account=self.account,
+                category=category,
+                transaction_type=transaction_type,
+                amount=amount,
+                transaction_date=today - timedelta(days=days_ago),
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('transactions:list'),
+                {'per_page': 10},
+            )
+
+        transaction_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "transactions_transaction"' in query['sql']
+        ]
+        # One aggregate (totals, count, dates) plus the page itself
+        self.assertEqual(len(transaction_queries), 2)
+        self.assertEqual(response.context['total_income'], 500)
+        self.assertEqual(response.context['total_expense'], 250)
+        self.assertEqual(response.context['balance'], 250)
+        self.assertEqual(response.context['transaction_count'], 3)
+        self.assertEqual(response.context['paginator'].count, 3)
+        self.assertEqual(
+            response.context['first_transaction_date'],
+            today - timedelta(days=7),
+        )
+        self.assertEqual(response.context['last_transaction_date'], today)
+
     def test_create_view_creates_transaction_and_adds_message(self):
         response = self.client.post(
             reverse('transactions:create'),
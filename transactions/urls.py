@@ -7,6 +7,16 @@ app_name = 'transactions'
 urlpatterns = [
     path('', views.TransactionListView.as_view(), name='list'),
     path('new/', views.TransactionCreateView.as_view(), name='create'),
+    path(
+        'import/',
+        views.TransactionImportView.as_view(),
+        name='import',
+    ),
+    path(
+        'export/<str:file_format>/',
+        views.TransactionExportView.as_view(),
+        name='export',
+    ),
     path(
         '<int:pk>/edit/',
         views.TransactionUpdateView.as_view(),
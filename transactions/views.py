@@ -1,39 +1,54 @@
 # Standard library
+import io
 from datetime import datetime, timedelta
 
 # Django imports
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, Sum
+from django.db.models import Count, Max, Min, Q, Sum
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, ListView, UpdateView
-
-from accounts.models import Account
-from categories.models import Category
-
-from .forms import TransactionForm
+from django.utils import timezone
+from django.views import View
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    FormView,
+    ListView,
+    UpdateView,
+)
+
+from core.lookups import get_user_lookups
+
+from .exporters import CONTENT_TYPES, DEFAULT_CHUNK_SIZE, stream_export
+from .forms import TransactionForm, TransactionImportForm
+from .importers import TransactionImporter, parse_rows
 # Local imports
 from .models import Transaction
+from .pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    filters_digest,
+    PrecountedPaginator,
+)
+from .search import rank_transactions, search_transactions
 
 
-class TransactionListView(LoginRequiredMixin, ListView):
+class TransactionFilterMixin:
     """
-    List view for transactions with filtering and statistics.
-
-    Features:
-    - Filter by user ownership through account relationship
-    - Filter by search query in description (search or q parameter)
-    - Filter by date range (data_inicio, data_fim)
-    - Filter by account (conta)
-    - Filter by category (categoria)
-    - Pagination (20 transactions per page)
-    - Statistics: total income, total expense, balance
+    Filter and sort the user's transactions from the GET parameters.
+
+    Shared by the list and the export views so an export contains
+    exactly the rows (and order) shown in the list.
+
+    Parameters:
+    - search or q: full-text search in description; `sort=relevance`
+      orders by best match
+    - period or quick_filter: quick date ranges (this_month, ...)
+    - data_inicio, data_fim: manual date range (YYYY-MM-DD)
+    - conta, categoria: account and category ids
+    - sort, direction: ordering (see sortable_fields)
     """
-    model = Transaction
-    template_name = 'transactions/transaction_list.html'
-    context_object_name = 'transactions'
-    paginate_by = 20
-    per_page_options = (10, 20, 50, 100)
     sortable_fields = {
         'date': 'transaction_date',
         'description': 'description',
@@ -44,6 +59,8 @@ class TransactionListView(LoginRequiredMixin, ListView):
     }
     default_sort = 'date'
     default_direction = 'desc'
+    # Only valid while searching; always ordered by best match first
+    relevance_sort = 'relevance'
 
     def get_queryset(self):
         """
@@ -52,13 +69,13 @@ class TransactionListView(LoginRequiredMixin, ListView):
         Returns:
             QuerySet: Filtered and optimized transactions queryset
         """
-        # Base queryset: filter by user through account relationship
+        # Base queryset: filter by the denormalized owner (no join)
         # Optimize queries with select_related to avoid N+1 queries
         queryset = Transaction.objects.select_related(
             'account',
             'category'
         ).filter(
-            account__user=self.request.user
+            user=self.request.user
         )
 
         # Filter by search query (description)
@@ -66,10 +83,13 @@ class TransactionListView(LoginRequiredMixin, ListView):
             self.request.GET.get('search')
             or self.request.GET.get('q')
         )
+        self.search_query = search
         if search:
-            # Case-insensitive search in description field
-            queryset = queryset.filter(
-                Q(description__icontains=search)
+            # Full-text prefix search in description (see search.py)
+            queryset = search_transactions(
+                queryset,
+                search,
+                self.request.user,
             )
 
         # Quick date filters have priority over manual date range
@@ -183,10 +203,98 @@ class TransactionListView(LoginRequiredMixin, ListView):
         sort_key, direction, ordering = self.get_ordering_params()
         self.current_sort = sort_key
         self.current_direction = direction
+        self.current_ordering = ordering
+
+        # Aggregates skip the relevance, which is computed per row
+        self._filtered_queryset = queryset
+        if sort_key == self.relevance_sort:
+            queryset = rank_transactions(
+                queryset,
+                search,
+                self.request.user,
+            )
+
+        return queryset.order_by(*ordering)
+
+    def get_ordering_params(self):
+        """
+        Resolve ordering based on `sort` and `direction` query params.
+        """
+        sort_param = self.request.GET.get('sort', self.default_sort)
+        direction_param = self.request.GET.get(
+            'direction',
+            self.default_direction
+        )
+
+        if sort_param == self.relevance_sort and getattr(
+            self,
+            'search_query',
+            None,
+        ):
+            return sort_param, 'desc', ['-search_rank', '-id']
+
+        is_sort_valid = sort_param in self.sortable_fields
+        sort_key = (
+            sort_param
+            if is_sort_valid
+            else self.default_sort
+        )
+        direction = (
+            direction_param
+            if direction_param in {'asc', 'desc'}
+            else self.default_direction
+        )
+
+        if not is_sort_valid:
+            direction = self.default_direction
+
+        field_name = self.sortable_fields[sort_key]
+        prefix = '' if direction == 'asc' else '-'
+        ordering = [f'{prefix}{field_name}']
+
+        if field_name != 'transaction_date':
+            ordering.append(
+                'transaction_date'
+                if direction == 'asc'
+                else '-transaction_date'
+            )
+
+        ordering.append(
+            'created_at'
+            if direction == 'asc'
+            else '-created_at'
+        )
 
-        ordered_queryset = queryset.order_by(*ordering)
-        self._filtered_queryset = ordered_queryset
-        return ordered_queryset
+        # Unique tiebreaker: keeps pages stable and cursors unambiguous
+        ordering.append('id' if direction == 'asc' else '-id')
+
+        return sort_key, direction, ordering
+
+
+class TransactionListView(
+    LoginRequiredMixin,
+    TransactionFilterMixin,
+    ListView,
+):
+    """
+    List view for transactions with filtering and statistics.
+
+    Features:
+    - Filters and sorting from TransactionFilterMixin (search, date
+      range, quick filters, account, category)
+    - Pagination (20 transactions per page); `pagination=cursor` switches
+      to keyset pagination (`cursor` parameter), whose cost does not grow
+      with the page depth and which skips the COUNT(*)
+    - Statistics: total income, total expense, balance
+    """
+    model = Transaction
+    template_name = 'transactions/transaction_list.html'
+    context_object_name = 'transactions'
+    paginate_by = 20
+    per_page_options = (10, 20, 50, 100)
+    cursor_pagination_value = 'cursor'
+    # Query params that do not change which rows are listed or their order
+    cursor_unbound_params = ('cursor', 'page', 'per_page', 'pagination')
 
     def get_context_data(self, **kwargs):
         """
@@ -195,44 +303,29 @@ class TransactionListView(LoginRequiredMixin, ListView):
         Returns:
             dict: Context with transactions, statistics, and filter data
         """
-        context = super().get_context_data(**kwargs)
-
-        # Get filtered queryset (respects all applied filters)
-        filtered_queryset = getattr(
-            self,
-            '_filtered_queryset',
-            self.get_queryset(),
-        )
-
-        # Calculate statistics using aggregation
-        income_aggregate = filtered_queryset.filter(
-            transaction_type=Transaction.INCOME
-        ).aggregate(total=Sum('amount'))
+        # Totals, count and date range in a single aggregate; the count
+        # is reused by the paginator (see get_paginator)
+        statistics = self.get_statistics()
 
-        expense_aggregate = filtered_queryset.filter(
-            transaction_type=Transaction.EXPENSE
-        ).aggregate(total=Sum('amount'))
+        context = super().get_context_data(**kwargs)
 
-        total_income = income_aggregate['total'] or 0
-        total_expense = expense_aggregate['total'] or 0
+        total_income = statistics['total_income'] or 0
+        total_expense = statistics['total_expense'] or 0
         balance = total_income - total_expense
 
         # Add statistics to context
         context['total_income'] = total_income
         context['total_expense'] = total_expense
         context['balance'] = balance
+        context['transaction_count'] = statistics['count']
+        context['first_transaction_date'] = statistics['first_date']
+        context['last_transaction_date'] = statistics['last_date']
 
-        # Add filter options to context
-        # List of user's accounts for dropdown
-        context['accounts'] = Account.objects.filter(
-            user=self.request.user,
-            is_active=True
-        ).order_by('name')
-
-        # List of user's categories for dropdown
-        context['categories'] = Category.objects.filter(
-            user=self.request.user
-        ).order_by('name')
+        # Add filter options to context, served from the request-scoped
+        # lookups (ordered by name)
+        lookups = get_user_lookups(self.request)
+        context['accounts'] = list(lookups.active_accounts.values())
+        context['categories'] = list(lookups.categories.values())
 
         # Preserve current filter values for form population
         context['filter_search'] = (
@@ -269,6 +362,7 @@ class TransactionListView(LoginRequiredMixin, ListView):
         )
         context['sorting_metadata'] = self.get_sorting_metadata()
         context['per_page_options'] = self.per_page_options
+        context['cursor_pagination'] = self.uses_cursor_pagination()
         context['current_per_page'] = getattr(
             self,
             '_current_per_page',
@@ -277,49 +371,106 @@ class TransactionListView(LoginRequiredMixin, ListView):
 
         return context
 
-    def get_ordering_params(self):
+    def get_statistics(self):
         """
-        Resolve ordering based on `sort` and `direction` query params.
-        """
-        sort_param = self.request.GET.get('sort', self.default_sort)
-        direction_param = self.request.GET.get(
-            'direction',
-            self.default_direction
-        )
+        Aggregate the filtered transactions in a single query.
 
-        is_sort_valid = sort_param in self.sortable_fields
-        sort_key = (
-            sort_param
-            if is_sort_valid
-            else self.default_sort
-        )
-        direction = (
-            direction_param
-            if direction_param in {'asc', 'desc'}
-            else self.default_direction
+        Returns:
+            dict: `total_income`, `total_expense`, `count` (None in
+            cursor mode), `first_date` and `last_date` (cached for the
+            request)
+        """
+        if not hasattr(self, '_statistics'):
+            filtered_queryset = getattr(
+                self,
+                '_filtered_queryset',
+                None,
+            )
+            if filtered_queryset is None:
+                self.get_queryset()
+                filtered_queryset = self._filtered_queryset
+
+            aggregates = {
+                'total_income': Sum(
+                    'amount',
+                    filter=Q(transaction_type=Transaction.INCOME),
+                ),
+                'total_expense': Sum(
+                    'amount',
+                    filter=Q(transaction_type=Transaction.EXPENSE),
+                ),
+                'first_date': Min('transaction_date'),
+                'last_date': Max('transaction_date'),
+            }
+            # Cursor pages show no total, so the COUNT is skipped
+            cursor_mode = self.uses_cursor_pagination()
+            if not cursor_mode:
+                aggregates['count'] = Count('pk')
+
+            self._statistics = filtered_queryset.order_by().aggregate(
+                **aggregates,
+            )
+            if cursor_mode:
+                self._statistics['count'] = None
+        return self._statistics
+
+    def get_paginator(
+        self,
+        queryset,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        **kwargs,
+    ):
+        """
+        Build a paginator that reuses the count from get_statistics().
+        """
+        return PrecountedPaginator(
+            queryset,
+            per_page,
+            count=self.get_statistics()['count'],
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            **kwargs,
         )
 
-        if not is_sort_valid:
-            direction = self.default_direction
+    def uses_cursor_pagination(self):
+        """
+        Whether the request opted into keyset pagination.
+        """
+        return (
+            self.request.GET.get('pagination')
+            == self.cursor_pagination_value
+        )
 
-        field_name = self.sortable_fields[sort_key]
-        prefix = '' if direction == 'asc' else '-'
-        ordering = [f'{prefix}{field_name}']
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate with `CursorPaginator` when cursor mode is requested.
 
-        if field_name != 'transaction_date':
-            ordering.append(
-                'transaction_date'
-                if direction == 'asc'
-                else '-transaction_date'
-            )
+        Cursors are bound to the filters and the sort order; invalid or
+        stale cursors (e.g. reused with other filters) fall back to the
+        first page, like the other ignored filters.
+        """
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
 
-        ordering.append(
-            'created_at'
-            if direction == 'asc'
-            else '-created_at'
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            self.current_ordering,
+            filters=filters_digest([
+                (key, value)
+                for key, values in self.request.GET.lists()
+                if key not in self.cursor_unbound_params
+                for value in values
+            ]),
         )
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            page = paginator.page()
 
-        return sort_key, direction, ordering
+        return paginator, page, page.object_list, page.has_other_pages()
 
     def get_paginate_by(self, queryset):
         """
@@ -372,6 +523,43 @@ class TransactionListView(LoginRequiredMixin, ListView):
         return metadata
 
 
+class TransactionExportView(
+    LoginRequiredMixin,
+    TransactionFilterMixin,
+    View,
+):
+    """
+    Stream the filtered transactions as a CSV or XLSX file.
+
+    Accepts the same GET parameters as the list (see
+    TransactionFilterMixin), so the file has the rows of the list in the
+    same order. Rows are read with values_list().iterator() and written
+    as they arrive, keeping memory constant regardless of the row count.
+    """
+    chunk_size = DEFAULT_CHUNK_SIZE
+
+    def get(self, request, file_format):
+        """
+        Return a StreamingHttpResponse with the export file.
+        """
+        if file_format not in CONTENT_TYPES:
+            raise Http404('Formato de exportação inválido.')
+
+        response = StreamingHttpResponse(
+            stream_export(
+                self.get_queryset(),
+                file_format,
+                chunk_size=self.chunk_size,
+            ),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        filename = f'transacoes-{timezone.localdate():%Y%m%d}.{file_format}'
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+
 class TransactionCreateView(LoginRequiredMixin, CreateView):
     """
     Create view for new transactions.
@@ -390,13 +578,14 @@ class TransactionCreateView(LoginRequiredMixin, CreateView):
 
     def get_form_kwargs(self):
         """
-        Pass logged-in user to the form for filtering options.
+        Pass the request-scoped lookups to the form for filtering options.
 
         Returns:
-            dict: Form kwargs with user added
+            dict: Form kwargs with user and lookups added
         """
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
+        kwargs['lookups'] = get_user_lookups(self.request)
         return kwargs
 
     def form_valid(self, form):
@@ -472,7 +661,7 @@ class TransactionUpdateView(LoginRequiredMixin, UpdateView):
     Update view for editing existing transactions.
 
     Features:
-    - Filters transactions by user ownership (via account__user relationship)
+    - Filters transactions by user ownership (denormalized user field)
     - Filters accounts and categories by logged-in user
     - Validates category type matches transaction type
     - Automatically updates account balance via signals
@@ -489,7 +678,7 @@ class TransactionUpdateView(LoginRequiredMixin, UpdateView):
         Filter transactions by user ownership.
 
         CRITICAL: This ensures users can only edit their own transactions
-        by filtering through the account relationship.
+        by filtering on the transaction owner.
 
         Returns:
             QuerySet: Transactions that belong to the logged-in user
@@ -498,18 +687,19 @@ class TransactionUpdateView(LoginRequiredMixin, UpdateView):
             'account',
             'category'
         ).filter(
-            account__user=self.request.user
+            user=self.request.user
         )
 
     def get_form_kwargs(self):
         """
-        Pass logged-in user to the form for filtering options.
+        Pass the request-scoped lookups to the form for filtering options.
 
         Returns:
-            dict: Form kwargs with user added
+            dict: Form kwargs with user and lookups added
         """
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
+        kwargs['lookups'] = get_user_lookups(self.request)
         return kwargs
 
     def form_valid(self, form):
@@ -575,7 +765,7 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
     Delete view for removing existing transactions.
 
     Features:
-    - Filters transactions by user ownership (via account__user relationship)
+    - Filters transactions by user ownership (denormalized user field)
     - Displays confirmation page before deletion
     - Automatically updates account balance via signals after deletion
     - Success message after deletion
@@ -590,7 +780,7 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
         Filter transactions by user ownership.
 
         CRITICAL: This ensures users can only delete their own transactions
-        by filtering through the account relationship.
+        by filtering on the transaction owner.
 
         Returns:
             QuerySet: Transactions that belong to the logged-in user
@@ -599,7 +789,7 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
             'account',
             'category'
         ).filter(
-            account__user=self.request.user
+            user=self.request.user
         )
 
     def delete(self, request, *args, **kwargs):
@@ -634,3 +824,98 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
             {'label': 'Excluir Transação', 'url': None},
         ]
         return context
+
+
+class TransactionImportView(LoginRequiredMixin, FormView):
+    """
+    Upload view for importing transactions from CSV or OFX files.
+
+    Features:
+    - Streams the uploaded file through a generator parser
+    - Validates rows against the user's accounts and categories
+    - Inserts in bulk batches with one balance update per account
+    - Reports imported and skipped rows through messages
+    """
+    form_class = TransactionImportForm
+    template_name = 'transactions/transaction_import.html'
+    success_url = reverse_lazy('transactions:list')
+    max_reported_errors = 5
+
+    def get_form_kwargs(self):
+        """
+        Pass the request-scoped lookups to the form for filtering options.
+
+        Returns:
+            dict: Form kwargs with user and lookups added
+        """
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        kwargs['lookups'] = get_user_lookups(self.request)
+        return kwargs
+
+    def form_valid(self, form):
+        """
+        Run the import and summarize the result for the user.
+
+        Args:
+            form: Valid TransactionImportForm instance
+
+        Returns:
+            HttpResponseRedirect: Redirect to success_url
+        """
+        importer = TransactionImporter(
+            self.request.user,
+            account=form.cleaned_data['account'],
+            income_category=form.cleaned_data['income_category'],
+            expense_category=form.cleaned_data['expense_category'],
+            lookups=get_user_lookups(self.request),
+        )
+        uploaded_file = form.cleaned_data['file']
+        stream = io.TextIOWrapper(
+            uploaded_file.file,
+            encoding='utf-8-sig',
+            errors='replace',
+            newline='',
+        )
+        result = importer.run(
+            parse_rows(stream, form.cleaned_data['file_format'])
+        )
+
+        if result.created:
+            messages.success(
+                self.request,
+                (
+                    f'{result.created} transações importadas com sucesso! '
+                    'Os saldos das contas foram atualizados.'
+                ),
+            )
+        else:
+            messages.warning(
+                self.request,
+                'Nenhuma transação foi importada.',
+            )
+
+        if result.skipped:
+            details = '; '.join(
+                f'linha {line}: {message}'
+                for line, message in result.errors[:self.max_reported_errors]
+            )
+            messages.error(
+                self.request,
+                f'{result.skipped} linhas ignoradas ({details}).',
+            )
+
+        return super().form_valid(form)
+
+    def get_context_data(self, **kwargs):
+        """
+        Adiciona título e breadcrumbs ao contexto.
+        """
+        context = super().get_context_data(**kwargs)
+        context['title'] = 'Importar Transações'
+        context['breadcrumbs'] = [
+            {'label': 'Home', 'url': 'home'},
+            {'label': 'Transações', 'url': 'transactions:list'},
+            {'label': 'Importar', 'url': None},
+        ]
+        return context
@@ -49,6 +49,13 @@ class CustomUser(AbstractUser):
         }
     )
 
+    # Bumped on every change to the user's financial data (see core.cache)
+    data_version = models.PositiveBigIntegerField(
+        'Versão dos dados',
+        default=0,
+        editable=False,
+    )
+
     # Timestamp fields
     created_at = models.DateTimeField('Criado em', auto_now_add=True)
     updated_at = models.DateTimeField('Atualizado em', auto_now=True)
@@ -69,3 +76,19 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        """
+        Salva o usuário sem sobrescrever `data_version`.
+
+        A versão só muda via `core.cache.bump_data_version()`, com UPDATE
+        relativo; um save comum de uma instância carregada antes do bump
+        não pode voltá-la para um valor antigo.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'data_version'
+            ]
+        super().save(*args, **kwargs)
@@ -3,29 +3,44 @@ Custom template filters for currency formatting.
 
 This module formats decimal or float values as Brazilian Real (R$).
 """
-import locale
-from decimal import Decimal, InvalidOperation
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
 
 from django import template
 
 register = template.Library()
 
+ZERO = 'R$ 0,00'
+CENTS = Decimal('0.01')
 
-def setup_locale():
+# Python formats as "1,234.56"; swap the separators for "1.234,56"
+BRL_SEPARATORS = str.maketrans(',.', '.,')
+
+# Amounts repeat a lot within and across pages (totals, balances)
+FORMAT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_brl(value):
     """
-    Configure locale to pt_BR.UTF-8 for Brazilian currency formatting.
+    Format a finite Decimal as Brazilian Real (R$).
 
-    Falls back to C locale if pt_BR is not available.
+    Pure Python and locale-free, so it is thread-safe and never touches
+    the process-wide locale. Rounds half up to cents without going
+    through float. Results are memoized (Decimals that compare equal,
+    e.g. 1.5 and 1.50, share an entry).
+
+    Args:
+        value: Finite Decimal
+
+    Returns:
+        str: Formatted currency string (e.g., "R$ 1.234,56")
     """
-    try:
-        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-    except locale.Error:
-        try:
-            # Try alternative locale names
-            locale.setlocale(locale.LC_ALL, 'pt_BR')
-        except locale.Error:
-            # Fallback to C locale if pt_BR is not available
-            locale.setlocale(locale.LC_ALL, 'C')
+    quantized = value.quantize(CENTS, rounding=ROUND_HALF_UP)
+    if not quantized:
+        # Avoid "-0,00" for tiny negative values
+        return ZERO
+    return f'R$ {quantized:,.2f}'.translate(BRL_SEPARATORS)
 
 
 @register.filter(name='currency')
@@ -47,12 +62,12 @@ def currency(value):
     Notes:
         - Handles None values by returning "R$ 0,00"
         - Handles invalid values by returning "R$ 0,00"
-        - Uses Brazilian locale for number formatting
-          (thousands: ., decimal: ,)
+        - Brazilian number format (thousands: ., decimal: ,) via
+          format_brl, independent of the server locale
     """
     # Handle None or empty values
     if value is None or value == '':
-        return 'R$ 0,00'
+        return ZERO
 
     # Try to convert to Decimal for precise currency calculation
     try:
@@ -62,40 +77,18 @@ def currency(value):
             # Replace comma with dot for decimal conversion
             value = value.replace(',', '.')
 
-        decimal_value = Decimal(str(value))
+        if not isinstance(value, Decimal):
+            # str() keeps floats at their shortest repr (0.1, not 0.1000...)
+            value = Decimal(str(value))
     except (ValueError, InvalidOperation, TypeError):
         # If conversion fails, return zero
-        return 'R$ 0,00'
+        return ZERO
 
-    # Setup locale for Brazilian format
-    setup_locale()
+    if not value.is_finite():
+        return ZERO
 
-    # Format as currency
     try:
-        # Format with 2 decimal places and grouping
-        formatted = locale.currency(decimal_value, grouping=True, symbol=False)
-        return f'R$ {formatted}'
-    except (ValueError, locale.Error):
-        # Manual formatting fallback
-        # Convert to float and format manually
-        try:
-            float_value = float(decimal_value)
-            # Format with Brazilian pattern: thousands separator (.)
-            # and decimal comma (,)
-            if float_value >= 0:
-                integer_part = int(float_value)
-                decimal_part = int(round((float_value - integer_part) * 100))
-            else:
-                integer_part = int(float_value)
-                decimal_part = int(
-                    round((abs(float_value) - abs(integer_part)) * 100)
-                )
-
-            # Format integer part with thousands separator
-            integer_str = f'{abs(integer_part):,}'.replace(',', '.')
-            if float_value < 0:
-                integer_str = f'-{integer_str}'
-
-            return f'R$ {integer_str},{decimal_part:02d}'
-        except (ValueError, TypeError):
-            return 'R$ 0,00'
+        return format_brl(value)
+    except InvalidOperation:
+        # More digits than the decimal context precision
+        return ZERO
@@ -0,0 +1,62 @@
+import locale
+from decimal import Decimal
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from users.templatetags.currency_filters import currency, format_brl
+
+
+class CurrencyFilterTests(SimpleTestCase):
+    """Tests for the locale-free `currency` template filter."""
+
+    def test_formats_brazilian_separators(self):
+        """Thousands use dots and cents use a comma."""
+        self.assertEqual(currency(Decimal('1234.56')), 'R$ 1.234,56')
+        self.assertEqual(currency(Decimal('1234567.8')), 'R$ 1.234.567,80')
+        self.assertEqual(currency(0), 'R$ 0,00')
+        self.assertEqual(currency(1000), 'R$ 1.000,00')
+        self.assertEqual(currency(Decimal('-820.1')), 'R$ -820,10')
+
+    def test_rounds_half_up_without_float(self):
+        """Decimals round half up; floats keep their shortest repr."""
+        self.assertEqual(currency(Decimal('2.675')), 'R$ 2,68')
+        self.assertEqual(currency(2.675), 'R$ 2,68')
+        self.assertEqual(currency(Decimal('-0.004')), 'R$ 0,00')
+        self.assertEqual(
+            currency(Decimal('9999999999.995')),
+            'R$ 10.000.000.000,00',
+        )
+
+    def test_invalid_values_return_zero(self):
+        """None, garbage, NaN and infinities render as zero."""
+        for value in (None, '', 'abc', 'NaN', Decimal('Infinity'),
+                      float('inf'), Decimal('1e40'), object()):
+            self.assertEqual(currency(value), 'R$ 0,00')
+
+    def test_accepts_strings(self):
+        """Currency symbols and decimal commas are accepted."""
+        self.assertEqual(currency('R$ 10,5'), 'R$ 10,50')
+        self.assertEqual(currency('99.90'), 'R$ 99,90')
+
+    def test_does_not_touch_process_locale(self):
+        """Formatting never calls setlocale (not thread-safe)."""
+        before = locale.setlocale(locale.LC_ALL)
+        currency(Decimal('1234.56'))
+        self.assertEqual(locale.setlocale(locale.LC_ALL), before)
+
+    def test_repeated_values_hit_the_cache(self):
+        """Equal Decimals share one cache entry."""
+        format_brl.cache_clear()
+        currency(Decimal('1.5'))
+        currency(Decimal('1.50'))
+        info = format_brl.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_filter_in_template(self):
+        """The filter is registered under `currency`."""
+        template = Template('{% load currency_filters %}{{ value|currency }}')
+        self.assertEqual(
+            template.render(Context({'value': Decimal('42')})),
+            'R$ 42,00',
+        )